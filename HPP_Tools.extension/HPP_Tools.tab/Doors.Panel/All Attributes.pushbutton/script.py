@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+__title__ = "All\nAttributes"
+__author__ = "olga.poletkina@hpp.com"
+__doc__ = """
+Author: olga.poletkina@hpp.com
+Date: 19.10.2026
+___________________________________________________________
+Description:
+The script fills all HPP door attributes in one run:
+Flügelanzahl, Türform, Wandart, Maulweite, Aussentür,
+DIN-rl and Nassraum. Every door is read once and only
+changed values are written, in a single transaction.
+___________________________________________________________
+How-to:
+Press the button.
+___________________________________________________________
+Prerequisite:
+The door families and wall materials must be named in
+accordance with the HPP naming convention!
+The corresponding parameters should be applied!
+___________________________________________________________
+"""
+from Snippets._bootstrap import bootstrap
+bootstrap()
+from Autodesk.Revit import DB
+
+from Snippets._doors import fill_door_attributes
+from Snippets._trace import logged_run
+
+# uiapp = __revit__
+doc = __revit__.ActiveUIDocument.Document
+# uidoc = __revit__.ActiveUIDocument
+app = __revit__.Application
+with logged_run(__title__):
+    fill_door_attributes(doc, transaction_name='Door attributes application')
\ No newline at end of file
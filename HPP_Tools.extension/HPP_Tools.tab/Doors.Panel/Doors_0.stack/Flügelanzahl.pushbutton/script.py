@@ -19,41 +19,18 @@ The corresponding parameter should be applied!
 ___________________________________________________________
 """
 import sys
-import clr
-clr.AddReference('ProtoGeometry')
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
-clr.AddReference('RevitAPI')
+from Snippets._bootstrap import bootstrap
+bootstrap()
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from System.Collections.Generic import List
 
+from Snippets._doors import fill_door_attributes, WINGS
+from Snippets._trace import logged_run
+
 # uiapp = __revit__
 doc = __revit__.ActiveUIDocument.Document
 # uidoc = __revit__.ActiveUIDocument
 app = __revit__.Application
-
-doors = [door for door in FEC(doc).OfCategory(
-    DB.BuiltInCategory.OST_Doors).WhereElementIsNotElementType().ToElements() if door.Parameter[
-    DB.BuiltInParameter.PHASE_DEMOLISHED].AsDouble() == 0]
-
-with DB.Transaction(doc, 'Number of wings application') as t:
-    t.Start()
-    function = []
-    for door in doors:
-        wings_parameter = door.LookupParameter('H_TÜ_Flügelanzahl')
-        if wings_parameter == None:
-            print('Please apply "H_TÜ_Flügelanzahl" parameter!')
-            break
-        elif wings_parameter != None:
-            fam_name = door.Symbol.Family.Name
-            fam_name_list = fam_name.split('_')
-            wings_parameter.Set(str(fam_name_list[4][0]))
-    t.Commit()
-
-if door.LookupParameter('H_TÜ_Flügelanzahl') != None:
-    print("The door 'H_TÜ_Flügelanzahl' parameter is filled!")
\ No newline at end of file
+with logged_run(__title__):
+    fill_door_attributes(doc, [WINGS], 'Number of wings application')
\ No newline at end of file
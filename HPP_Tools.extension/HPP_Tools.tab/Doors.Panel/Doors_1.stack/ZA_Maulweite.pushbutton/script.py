@@ -7,7 +7,8 @@ Date: 18.07.2023
 ___________________________________________________________
 Description:
 The script retrieves the host wall width and assigns 
-it to the door parameter.
+it to the door parameter. For curtain walls the 
+thickest mullion is used.
 ___________________________________________________________
 How-to:
 Press the button.
@@ -17,42 +18,18 @@ The corresponding parameter should be applied!
 ___________________________________________________________
 """
 import sys
-import clr
-clr.AddReference('ProtoGeometry')
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
-clr.AddReference('RevitAPI')
+from Snippets._bootstrap import bootstrap
+bootstrap()
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from System.Collections.Generic import List
 
-from Snippets._functions import unit_converter
+from Snippets._doors import fill_door_attributes, OPENING_WIDTH
+from Snippets._trace import logged_run
 
 # uiapp = __revit__
 doc = __revit__.ActiveUIDocument.Document
 # uidoc = __revit__.ActiveUIDocument
 app = __revit__.Application
-
-doors = [door for door in FEC(doc).OfCategory(
-    DB.BuiltInCategory.OST_Doors).WhereElementIsNotElementType().ToElements() if door.Parameter[
-    DB.BuiltInParameter.PHASE_DEMOLISHED].AsDouble() == 0]
-
-with DB.Transaction(doc, 'Wall thickness parameter application') as t:
-    t.Start()
-    width = []
-    for door in doors:
-        thickness_parameter = door.LookupParameter('H_TÜ_ZA_Maulweite')
-        if thickness_parameter == None:
-            print('Please apply "H_TÜ_ZA_Maulweite" parameter!')
-            break
-        elif thickness_parameter != None:
-            thickness_parameter.Set(str(unit_converter(doc, door.Host.Width)))
-            width.append(unit_converter(doc, door.Host.Width))
-    t.Commit()
-
-print("""The 'H_TÜ_ZA_Maulweite' parameter is applied.""")
-
+with logged_run(__title__):
+    fill_door_attributes(doc, [OPENING_WIDTH], 'Wall thickness parameter application')
\ No newline at end of file
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+__title__ = "Live\nAttributes"
+__author__ = "olga.poletkina@hpp.com"
+__doc__ = """
+Author: olga.poletkina@hpp.com
+Date: 19.10.2026
+___________________________________________________________
+Description:
+Switches the live update of the HPP door attributes on 
+or off. While it is on, placed, flipped or retyped doors, 
+doors in walls that changed their type and doors of 
+renamed rooms get their attributes recomputed in the 
+same transaction. A full run of the door buttons is 
+not needed anymore.
+The setting is kept for the next Revit sessions.
+___________________________________________________________
+How-to:
+Press the button to switch the live update on or off.
+___________________________________________________________
+Prerequisite:
+The door families and wall materials must be named in
+accordance with the HPP naming convention!
+The corresponding parameters should be applied!
+___________________________________________________________
+"""
+from pyrevit import script
+
+from Snippets._config import get_option, set_option
+from Snippets._trace import logged_run
+from Snippets._updater import is_door_updater_registered, \
+    register_door_updater, unregister_door_updater
+
+CONFIG_OPTION = 'live_door_attributes'
+
+
+def __selfinit__(script_cmp, ui_button_cmp, __rvt__):
+    enabled = get_option(CONFIG_OPTION, False)
+    if enabled:
+        register_door_updater(__rvt__.ActiveAddInId)
+    ui_button_cmp.set_icon(
+        script_cmp.get_bundle_file('on.png' if enabled else 'off.png'))
+
+
+if __name__ == '__main__':
+    with logged_run(__title__):
+        addin_id = __revit__.ActiveAddInId
+        enabled = not is_door_updater_registered(addin_id)
+        if enabled:
+            register_door_updater(addin_id)
+            print('Door attributes are updated live.')
+        else:
+            unregister_door_updater(addin_id)
+            print('Live update of door attributes is switched off.')
+        set_option(CONFIG_OPTION, enabled)
+        script.toggle_icon(enabled)
\ No newline at end of file
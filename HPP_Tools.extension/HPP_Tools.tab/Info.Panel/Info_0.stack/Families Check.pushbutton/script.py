@@ -19,43 +19,38 @@ None.
 ___________________________________________________________
 """
 import sys
-import clr
-clr.AddReference('ProtoGeometry')
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
-clr.AddReference('RevitAPI')
+from Snippets._bootstrap import bootstrap
+bootstrap()
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 
+from Snippets._trace import logged_run
+
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
+with logged_run(__title__):
+    windows = FEC(doc).OfCategory(DB.BuiltInCategory.OST_Windows).WhereElementIsNotElementType().ToElements()
+    doors = FEC(doc).OfCategory(DB.BuiltInCategory.OST_Doors).WhereElementIsNotElementType().ToElements()
 
-windows = FEC(doc).OfCategory(DB.BuiltInCategory.OST_Windows).WhereElementIsNotElementType().ToElements()
-doors = FEC(doc).OfCategory(DB.BuiltInCategory.OST_Doors).WhereElementIsNotElementType().ToElements()
+    check_list = []
 
-check_list = []
+    for window in windows:
+        if 'HA' in window.Symbol.Family.Name or 'HI' in window.Symbol.Family.Name:
+            pass
+        else:
+            if window.Symbol.Family.Name not in check_list:
+                check_list.append(window.Symbol.Family.Name)
 
-for window in windows:
-    if 'HA' in window.Symbol.Family.Name or 'HI' in window.Symbol.Family.Name:
-        pass
-    else:
-        if window.Symbol.Family.Name not in check_list:
-            check_list.append(window.Symbol.Family.Name)
+    for door in doors:
+        if 'HA' in door.Symbol.Family.Name or 'HI' in door.Symbol.Family.Name:
+            pass
+        else:
+            if door.Symbol.Family.Name not in check_list:
+                check_list.append(door.Symbol.Family.Name)
 
-for door in doors:
-    if 'HA' in door.Symbol.Family.Name or 'HI' in door.Symbol.Family.Name:
-        pass
+    if len(check_list) > 0:
+        print('The following families doesn`t comply with the HPP naming convention:')
+        for el in check_list:
+            print(el)
     else:
-        if door.Symbol.Family.Name not in check_list:
-            check_list.append(door.Symbol.Family.Name)
-
-if len(check_list) > 0:
-    print('The following families doesn`t comply with the HPP naming convention:')
-    for el in check_list:
-        print(el)
-else:
-    print('No conflict with the HPP naming convention was detected.')
\ No newline at end of file
+        print('No conflict with the HPP naming convention was detected.')
\ No newline at end of file
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+__title__ = "Trace"
+__author__ = "olga.poletkina@hpp.com"
+__doc__ = """
+Author: olga.poletkina@hpp.com
+Date: 19.10.2026
+___________________________________________________________
+Description:
+Switches the tracing of the HPP tools on or off. While it
+is on, every run of a HPP button writes a trace file with
+the time spent in collection, room boundaries,
+transactions, commits and printing. The file opens in
+chrome://tracing or on ui.perfetto.dev.
+The files are written to the 'trace_folder' option of
+the HPP_Tools section in the pyRevit config, by default
+to the HPP_Tools\\traces folder in the temp folder.
+Shift+click switches the counting of Revit API calls on
+or off. While it is on, calls of the HPP helpers working
+with the Revit API (element queries, parameter reads and
+writes, room boundaries, unit conversions and others) are
+counted and timed, and every run ends with a table of the
+hottest calls. The API members listed in the
+'api_call_members' option, e.g. LookupParameter, GetElement,
+Symbol, are counted on proxies of the document, elements
+and parameters, see the README.
+The settings are kept for the next Revit sessions.
+___________________________________________________________
+How-to:
+Press the button to switch the tracing on or off.
+Shift+click to switch the counting of API calls on or off,
+it takes effect from the next run of a HPP tool.
+___________________________________________________________
+Prerequisite:
+Not applicable.
+___________________________________________________________
+"""
+from pyrevit import script
+
+from Snippets._apicalls import API_CALLS_OPTION
+from Snippets._apicalls import is_enabled as is_counting_enabled
+from Snippets._config import get_option, set_option
+from Snippets._trace import DEFAULT_TRACE_FOLDER, TRACE_FOLDER_OPTION, \
+    TRACING_OPTION, is_enabled
+
+
+def __selfinit__(script_cmp, ui_button_cmp, __rvt__):
+    ui_button_cmp.set_icon(
+        script_cmp.get_bundle_file('on.png' if is_enabled() else 'off.png'))
+
+
+if __name__ == '__main__' and __shiftclick__:
+    counting = not is_counting_enabled()
+    set_option(API_CALLS_OPTION, counting)
+    if counting:
+        print('Revit API calls are counted from the next run.')
+    else:
+        print('Counting of API calls is switched off.')
+elif __name__ == '__main__':
+    enabled = not is_enabled()
+    set_option(TRACING_OPTION, enabled)
+    if enabled:
+        print('Runs of the HPP tools are traced to {}'.format(
+            get_option(TRACE_FOLDER_OPTION, DEFAULT_TRACE_FOLDER)))
+    else:
+        print('Tracing is switched off.')
+    script.toggle_icon(enabled)
\ No newline at end of file
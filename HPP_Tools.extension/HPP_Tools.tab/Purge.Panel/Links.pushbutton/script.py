@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+__title__ = "Links"
+__author__ = "olga.poletkina@hpp.com"
+__doc__ = """
+Author: olga.poletkina@hpp.com
+Date: 19.10.2026
+___________________________________________________________
+Description:
+This script lists all CAD (DWG), IFC and RVT links of the 
+project with their instance count, path and loaded state. 
+The selected link kinds are removed in one batch if the 
+document is not workshared. It then outputs a message 
+listing the names of the deleted links.
+___________________________________________________________
+How-to:
+- Press the button.
+- Pick the link kinds to remove.
+___________________________________________________________
+Prerequisite:
+Detatch the file from the central.
+___________________________________________________________
+"""
+
+from Snippets._bootstrap import bootstrap
+bootstrap()
+
+from pyrevit import forms
+
+from Snippets._purge import LinkInventory, LINK_KINDS
+from Snippets._transaction import BatchTransaction
+from Snippets._trace import logged_run
+
+doc = __revit__.ActiveUIDocument.Document
+uidoc = __revit__.ActiveUIDocument
+with logged_run(__title__):
+    link_inventory = LinkInventory(doc)
+
+    if doc.IsWorkshared == True:
+        print('you need to detach file first')
+    elif len(link_inventory.records()) == 0:
+        print('No links were detected!')
+    else:
+        options = {}
+        for kind in LINK_KINDS:
+            records = link_inventory.records([kind])
+            if records:
+                option = '{} ({} file(s), {} instance(s))'.format(
+                    kind, len(records), sum(record.instance_count for record in records))
+                options[option] = kind
+        selected = forms.SelectFromList.show(
+            sorted(options.keys()),
+            title='Links to remove',
+            button_name='Remove',
+            multiselect=True
+        )
+        if selected:
+            with BatchTransaction(doc, 'Delete links') as t:
+                links_removed, deleted = link_inventory.purge([options[option] for option in selected])
+            if t.is_committed:
+                print('The following links were removed:')
+                for link in links_removed:
+                    print('{}: {}'.format(link.kind, link.name))
+                    if link.path:
+                        print('    {}'.format(link.path))
+                print('{} elements were deleted.'.format(len(deleted)))
+            t.report.print_report()
+        else:
+            print('No links were removed.')
\ No newline at end of file
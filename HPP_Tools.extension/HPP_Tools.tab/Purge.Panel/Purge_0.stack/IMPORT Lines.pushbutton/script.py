@@ -19,46 +19,45 @@ None
 ___________________________________________________________
 """
 import sys
-import clr
 
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
+from Snippets._bootstrap import bootstrap
+bootstrap()
 
-clr.AddReference('RevitAPI')
-clr.AddReference('RevitAPIUI')
 from Autodesk.Revit.DB import *
-from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from Autodesk.Revit.UI import Selection
 
 from System import *
 
+from Snippets._purge import UsageIndex, LINE_PATTERN
+from Snippets._trace import logged_run
+from Snippets._transaction import BatchTransaction
+
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
+with logged_run(__title__):
+    usage_index = UsageIndex(doc)
 
-lines_to_remove = []
-lines_to_remove_names = []
-line_patterns = FEC(doc).OfClass(DB.LinePatternElement).ToElements()
-for line_pattern in line_patterns:
-    if 'IMPORT' in line_pattern.Name:
-        lines_to_remove.append(line_pattern)
-        lines_to_remove_names.append(line_pattern.Name)
+    lines_to_remove = []
+    lines_to_remove_names = []
+    for line_pattern in usage_index.elements(LINE_PATTERN):
+        if 'IMPORT' in line_pattern.Name:
+            lines_to_remove.append(line_pattern)
+            references = len(usage_index.referrers(LINE_PATTERN, line_pattern.Id))
+            if references > 0:
+                lines_to_remove_names.append('{} (used by {} views/categories)'.format(
+                    line_pattern.Name, references))
+            else:
+                lines_to_remove_names.append(line_pattern.Name)
 
-if len(lines_to_remove) > 0:
-    with DB.Transaction(doc, 'Delete Import lines') as t:
-        t.Start()
-        for item in lines_to_remove:
-            try:
-                doc.Delete(item.Id)
-            except:
-                pass
-        t.Commit()
-    print('The following line types were removed:')
-    for name in lines_to_remove_names:
-        print(name)
-else:
-    print('No IMPORTED lines were detected!')
\ No newline at end of file
+    if len(lines_to_remove) > 0:
+        with BatchTransaction(doc, 'Delete Import lines') as t:
+            for item in lines_to_remove:
+                t.attempt(doc.Delete, item.Id)
+        if t.is_committed:
+            print('The following line types were removed:')
+            for name in lines_to_remove_names:
+                print(name)
+        t.report.print_report()
+    else:
+        print('No IMPORTED lines were detected!')
\ No newline at end of file
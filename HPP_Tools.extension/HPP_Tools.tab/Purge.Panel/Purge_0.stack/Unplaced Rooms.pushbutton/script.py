@@ -10,7 +10,8 @@ This script removes rooms from the Revit project that have
 an area of 0. It collects rooms using the 
 BuiltInCategory.OST_Rooms category, identifies the rooms 
 with an area of 0, deletes them from the project, 
-and provides a list of removed room Ids.
+and provides a list of removed room Ids grouped into 
+not placed, not enclosed and redundant rooms.
 ___________________________________________________________
 How-to:
 Press the button.
@@ -20,35 +21,38 @@ None
 ___________________________________________________________
 """
 import sys
-import clr
-clr.AddReference('ProtoGeometry')
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
-clr.AddReference('RevitAPI')
-from Autodesk.Revit import DB
+from Snippets._bootstrap import bootstrap
+bootstrap()
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from System.Collections.Generic import List
 
+from Snippets._purge import get_zero_area_room_ids, classify_zero_area_rooms, \
+    delete_elements, ROOM_STATES
+from Snippets._trace import logged_run
+from Snippets._transaction import BatchTransaction
+
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
+with logged_run(__title__):
+    room_ids = get_zero_area_room_ids(doc)
+    room_states = classify_zero_area_rooms(doc, room_ids)
 
-rooms = FEC(doc).OfCategory(DB.BuiltInCategory.OST_Rooms).WhereElementIsNotElementType().ToElements()
-
-removed_rooms = []
-with DB.Transaction(doc, 'Remove Not_Placed and Redundant Rooms') as t:
-    t.Start()
-    for room in rooms:
-        if room.Parameter[DB.BuiltInParameter.ROOM_AREA].AsDouble() == 0:
-            removed_rooms.append(room.Id)
-            doc.Delete(room.Id)
-    t.Commit()
+    removed_rooms = []
+    report = None
+    if len(room_ids) > 0:
+        with BatchTransaction(doc, 'Remove Not_Placed and Redundant Rooms') as t:
+            delete_elements(doc, room_ids)
+        if t.is_committed:
+            removed_rooms = room_ids
+        report = t.report
 
-if len(removed_rooms) > 0:
-    print('Rooms with following Ids were removed:')
-    print(removed_rooms)
-else:
-    print('No Not_Placed or Redundant rooms were detected!')
\ No newline at end of file
+    if len(removed_rooms) > 0:
+        print('Rooms with following Ids were removed:')
+        for state in ROOM_STATES:
+            if room_states[state]:
+                print('{} ({}):'.format(state, len(room_states[state])))
+                print(room_states[state])
+    elif report is None:
+        print('No Not_Placed or Redundant rooms were detected!')
+    if report is not None:
+        report.print_report()
\ No newline at end of file
@@ -10,7 +10,10 @@ The script allows the user to select specific 3D views
 from the current Revit project. It then deletes all other 
 views, excluding the selected 3D views, provided that the 
 project is not workshared and at least 
-one 3D view is selected.
+one 3D view is selected. View templates of the kept 
+views and the active view are kept as well. Views are 
+deleted in a few batches; the run time and the number 
+of removed elements are reported.
 ___________________________________________________________
 How-to:
 - Pick the 3D view
@@ -21,17 +24,10 @@ Detatch the file from the central.
 ___________________________________________________________
 """
 import sys
-import clr
 
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
+from Snippets._bootstrap import bootstrap
+bootstrap()
 
-clr.AddReference('RevitAPI')
-clr.AddReference('RevitAPIUI')
 from Autodesk.Revit.DB import *
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
@@ -39,36 +35,35 @@ from Autodesk.Revit.UI import Selection
 from System.Collections.Generic import List
 from System import *
 
+import time
+
+from Snippets._purge import plan_view_purge, delete_in_order
+from Snippets._trace import logged_run
+from Snippets._transaction import BatchTransaction
+
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
+with logged_run(__title__):
+    view_selected = uidoc.Selection.GetElementIds()
 
-view_selected = uidoc.Selection.GetElementIds()
+    keep = []
+    for view_id in view_selected:
+        view = doc.GetElement(view_id)
+        if isinstance(view, DB.View3D) and not view.IsTemplate:
+            keep.append(view_id)
 
-views = FEC(doc).OfClass(DB.View).ToElements()
-delete = []
-keep = []
-for view in views:
-    if view.ViewType != ViewType.ThreeD:
-        delete.append(view.Id)
-    elif view.Id not in view_selected:
-        delete.append(view.Id)
+    if doc.IsWorkshared == True:
+        print('you need to detach file first')
+    elif len(keep) == 0:
+        print('pick 3D view(s)')
     else:
-        keep.append(view)
-
-if doc.IsWorkshared == True:
-    print('you need to detach file first')
-elif view_selected == None:
-    print('pick 3D view(s)')
-elif len(keep) >= 1:
-    with DB.Transaction(doc, 'Delete Views') as t:
-        t.Start()
-        for view_id in delete:
-            try:
-                doc.Delete(view_id)
-            except:
-                pass
-        t.Commit()
-    print('views are removed')
-else:
-    Exception
-    print('pick 3D view(s)')
\ No newline at end of file
+        start = time.time()
+        kept_ids, batches = plan_view_purge(doc, keep)
+        with BatchTransaction(doc, 'Delete Views') as t:
+            deleted = delete_in_order(doc, batches)
+        if t.is_committed:
+            print('views are removed')
+            print('{} views kept (selected 3D views, their templates and the active view)'.format(len(kept_ids)))
+            print('{} views planned for deletion, {} elements removed in {:.1f} s'.format(
+                sum(len(batch) for batch in batches), len(deleted), time.time() - start))
+        t.report.print_report()
\ No newline at end of file
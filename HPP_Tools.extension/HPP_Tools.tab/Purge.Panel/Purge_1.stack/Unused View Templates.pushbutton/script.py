@@ -19,50 +19,37 @@ Detatch the file from the central.
 ___________________________________________________________
 """
 import sys
-import clr
 
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
+from Snippets._bootstrap import bootstrap
+bootstrap()
 
-clr.AddReference('RevitAPI')
-clr.AddReference('RevitAPIUI')
 from Autodesk.Revit.DB import *
-from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from Autodesk.Revit.UI import Selection
 from System.Collections.Generic import List
 
+from Snippets._purge import UsageIndex, TEMPLATE
+from Snippets._trace import logged_run
+from Snippets._transaction import BatchTransaction
+
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
+with logged_run(__title__):
+    usage_index = UsageIndex(doc)
+    unused_templates = usage_index.unused(TEMPLATE)
+    templates_to_delete = [template.Id for template in unused_templates]
+    templates_to_delete_names = [template.Name for template in unused_templates]
 
-views = FEC(doc).OfClass(DB.View)
-applied_templates_id = [view.ViewTemplateId for view in views]
-templates_id = [view.Id for view in views if view.IsTemplate == True]
-
-templates_to_delete = []
-templates_to_delete_names = []
-for template_id in templates_id:
-    if template_id not in applied_templates_id:
-        templates_to_delete.append(template_id)
-        templates_to_delete_names.append(doc.GetElement(template_id).Name)
-
-if doc.IsWorkshared == True:
-    print('you need to detach file first')
-elif len(templates_to_delete) > 0:
-    with DB.Transaction(doc, 'Delete Title Blocks') as t:
-        t.Start()
-        for item_id in templates_to_delete:
-            try:
-                doc.Delete(item_id)
-            except:
-                pass
-        t.Commit()
-    print('The following templates were deleted:')
-    for name in templates_to_delete_names:
-        print(name)
-else:
-    print('No unused View Templates were detected!')
+    if doc.IsWorkshared == True:
+        print('you need to detach file first')
+    elif len(templates_to_delete) > 0:
+        with BatchTransaction(doc, 'Delete View Templates') as t:
+            for item_id in templates_to_delete:
+                t.attempt(doc.Delete, item_id)
+        if t.is_committed:
+            print('The following templates were deleted:')
+            for name in templates_to_delete_names:
+                print(name)
+        t.report.print_report()
+    else:
+        print('No unused View Templates were detected!')
\ No newline at end of file
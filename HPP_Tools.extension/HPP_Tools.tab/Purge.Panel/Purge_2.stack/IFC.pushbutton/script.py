@@ -19,48 +19,34 @@ Detatch the file from the central.
 ___________________________________________________________
 """
 import sys
-import clr
 
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
+from Snippets._bootstrap import bootstrap
+bootstrap()
 
-clr.AddReference('RevitAPI')
-clr.AddReference('RevitAPIUI')
 from Autodesk.Revit.DB import *
-from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from Autodesk.Revit.UI import Selection
 
 from System import *
 
+from Snippets._purge import LinkInventory, IFC
+from Snippets._transaction import BatchTransaction
+from Snippets._trace import logged_run
+
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
+with logged_run(__title__):
+    link_inventory = LinkInventory(doc)
 
-links = FEC(doc).OfClass(DB.RevitLinkType).ToElements()
-links_to_remove = []
-links_to_remove_names = []
-for link in links:
-    if '.ifc' in link.Parameter[DB.BuiltInParameter.ALL_MODEL_TYPE_NAME].AsString():
-        links_to_remove.append(link)
-        links_to_remove_names.append(link.Parameter[DB.BuiltInParameter.ALL_MODEL_TYPE_NAME].AsString())
-
-if doc.IsWorkshared == True:
-    print('you need to detach file first')
-elif len(links_to_remove) > 0:
-    print('The following IFC files were removed:')
-    for link in links_to_remove_names:
-        print(link)
-    with DB.Transaction(doc, 'Delete all IFC') as t:
-        t.Start()
-        for item in links_to_remove:
-            try:
-                doc.Delete(item.Id)
-            except:
-                pass
-        t.Commit()
-else:
-    print('No IFC were detected!')
\ No newline at end of file
+    if doc.IsWorkshared == True:
+        print('you need to detach file first')
+    elif link_inventory.count(IFC) > 0:
+        with BatchTransaction(doc, 'Delete all IFC') as t:
+            links_removed, _ = link_inventory.purge([IFC])
+        if t.is_committed:
+            print('The following IFC files were removed:')
+            for link in links_removed:
+                print(link.name)
+        t.report.print_report()
+    else:
+        print('No IFC were detected!')
\ No newline at end of file
@@ -24,167 +24,91 @@ cause performance issues!
 ___________________________________________________________
 """
 import sys
-import clr
-clr.AddReference('ProtoGeometry')
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
-clr.AddReference('RevitAPI')
+from Snippets._bootstrap import bootstrap
+bootstrap()
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from System.Collections.Generic import List
 
-import pyrevit
-from pyrevit.forms import ProgressBar
-
-from Snippets._functions import flatten, to_list
+from Snippets._query import ElementQuery
+from Snippets._progress import ProgressReporter
+from Snippets._transaction import BatchTransaction
+from Snippets._trace import logged_run
 
 # uiapp = __revit__
 doc = __revit__.ActiveUIDocument.Document
 # uidoc = __revit__.ActiveUIDocument
 app = __revit__.Application
-
-categories_filter = List[DB.BuiltInCategory]()
-
-# add categoties to the list
-categories_filter.Add(DB.BuiltInCategory.OST_Stairs)
-categories_filter.Add(DB.BuiltInCategory.OST_StructuralColumns)
-categories_filter.Add(DB.BuiltInCategory.OST_StructuralFoundation)
-categories_filter.Add(DB.BuiltInCategory.OST_StructuralFraming)
-categories_filter.Add(DB.BuiltInCategory.OST_Walls)
-
-# create multi category filter
-multi_category_filter = DB.ElementMulticategoryFilter(categories_filter)
-
-# filter for floors
-# string contains rule
-gfb_contains_rule = DB.ParameterFilterRuleFactory.CreateContainsRule(
-    DB.ElementId(DB.BuiltInParameter.ELEM_TYPE_PARAM),
-    'GFB',
-    True
-)
-gda_contains_rule = DB.ParameterFilterRuleFactory.CreateContainsRule(
-    DB.ElementId(DB.BuiltInParameter.ELEM_TYPE_PARAM),
-    'GDA',
-    True
-)
-dad_contains_rule = DB.ParameterFilterRuleFactory.CreateContainsRule(
-    DB.ElementId(DB.BuiltInParameter.ELEM_TYPE_PARAM),
-    'DAD',
-    True
-)
-floor_category_rule = DB.FilterCategoryRule(
-    to_list(
-        DB.ElementId(DB.BuiltInCategory.OST_Floors),
-        DB.ElementId
-    )
-)
-
-# parameter or filter
-parameter_contains_filter = DB.LogicalOrFilter(
-    to_list(
-        [
-            DB.ElementParameterFilter(gfb_contains_rule),
-            DB.ElementParameterFilter(gda_contains_rule),
-            DB.ElementParameterFilter(dad_contains_rule)
-        ],
-        DB.ElementFilter
-    )
-)
-
-# floors filter
-and_rule_floors = DB.LogicalAndFilter(
-    to_list(
-        [
-            parameter_contains_filter,
-            DB.ElementParameterFilter(floor_category_rule)
-        ],
-        DB.ElementFilter
-    )
-)
-
-# final LogicalOr filter
-or_filter = DB.LogicalOrFilter(
-    to_list(
-        [
-            multi_category_filter,
-            and_rule_floors
-        ],
-        DB.ElementFilter
-    )
-)
-
-elements = FEC(doc, doc.ActiveView.Id).WherePasses(multi_category_filter).WhereElementIsNotElementType().ToElements()
-floors = FEC(doc, doc.ActiveView.Id).WherePasses(and_rule_floors).WhereElementIsNotElementType().ToElements()
-
-if len(floors) == 0:
-    print('No finishing floors following the HPP naming convention are loaded into the project')
-else:
-
-    cancelled = False
-    intersected = []
-
-    # get intersected elements and initiate progress bar
-    with ProgressBar(cancellable=True) as pb:
-        elements_from_filter = []
-        intersected_list = []
-        for floor, counter in zip(floors, range(len(floors))):
-            intersect_filter = DB.ElementIntersectsElementFilter(floor)
-            elements_from_filter = FEC(doc, doc.ActiveView.Id).WherePasses(multi_category_filter).WherePasses(intersect_filter)
-            intersected_list.append(elements_from_filter)
-            intersected_Ids = []
-            for el in flatten(intersected_list):
-                intersected_Ids.append(doc.GetElement(el.Id))
-            if intersected_Ids:
-                intersected.append([floor, intersected_Ids])
-            if pb.cancelled:
-                cancelled = True
-                break
-            else:
-                pb.update_progress(counter, len(elements))
-
-    if cancelled:
-        print('Operation is cancelled!')
-
-    # join elements
-    with DB.Transaction(doc, 'Join elements') as t:
-        t.Start()
-        for element in intersected:
-            try:
+with logged_run(__title__):
+    # structural categories joined with finishing floors
+    elements_query = ElementQuery(doc).in_view(doc.ActiveView).of_categories(
+        DB.BuiltInCategory.OST_Stairs,
+        DB.BuiltInCategory.OST_StructuralColumns,
+        DB.BuiltInCategory.OST_StructuralFoundation,
+        DB.BuiltInCategory.OST_StructuralFraming,
+        DB.BuiltInCategory.OST_Walls
+    ).instances()
+    multi_category_filter = elements_query.filter()
+
+    # finishing floors following the HPP naming convention
+    floors_query = ElementQuery(doc).in_view(doc.ActiveView).of_categories(
+        DB.BuiltInCategory.OST_Floors).instances().type_name_contains('GFB', 'GDA', 'DAD')
+
+    floors = floors_query.elements()
+
+    if len(floors) == 0:
+        print('No finishing floors following the HPP naming convention are loaded into the project')
+    else:
+
+        cancelled = False
+        intersected = []
+
+        # get intersected elements and initiate progress bar
+        with ProgressReporter(len(floors)) as progress:
+            for floor, counter in zip(floors, range(len(floors))):
+                intersect_filter = DB.ElementIntersectsElementFilter(floor)
+                elements_from_filter = FEC(doc, doc.ActiveView.Id).WherePasses(multi_category_filter).WherePasses(intersect_filter)
+                # only the elements intersecting this floor, the collectors of
+                # the previous floors are not run again
+                intersected_Ids = list(elements_from_filter.ToElements())
+                if intersected_Ids:
+                    intersected.append([floor, intersected_Ids])
+                progress.update(counter + 1)
+                if progress.cancelled:
+                    cancelled = True
+                    break
+
+        if cancelled:
+            print('Operation is cancelled!')
+
+        # join elements
+        with BatchTransaction(doc, 'Join elements') as t:
+            for element in intersected:
                 for el in element[1]:
-                    DB.JoinGeometryUtils.JoinGeometry(
+                    t.attempt(
+                        DB.JoinGeometryUtils.JoinGeometry,
                         doc,
                         element[0],
                         el
                     )
-            except:
-                pass
-        t.Commit()
 
-    # switch joining order
-    with DB.Transaction(doc, 'Switch join order for finished floor') as t:
-        t.Start()
-        for element in intersected:
-            joined_elements = DB.JoinGeometryUtils.GetJoinedElements(doc, element[0])
-            for el_id in joined_elements:
-                el = doc.GetElement(el_id)
-                if DB.JoinGeometryUtils.IsCuttingElementInJoin(doc, element[0], el):
-                    try:
-                        DB.JoinGeometryUtils.SwitchJoinOrder(
+        # switch joining order
+        with BatchTransaction(doc, 'Switch join order for finished floor', t.report) as t:
+            for element in intersected:
+                joined_elements = DB.JoinGeometryUtils.GetJoinedElements(doc, element[0])
+                for el_id in joined_elements:
+                    el = doc.GetElement(el_id)
+                    if DB.JoinGeometryUtils.IsCuttingElementInJoin(doc, element[0], el):
+                        t.attempt(
+                            DB.JoinGeometryUtils.SwitchJoinOrder,
                             doc,
                             el,
                             element[0]
-                    )
-                    except:
-                        pass
-        t.Commit()
-
-    if not cancelled:
-        if len(intersected) > 0:
-            print('Elements were joined!')
-        else:
-            print('No intersections were detected!')
+                        )
 
+        if not cancelled:
+            if len(intersected) > 0:
+                print('Elements were joined!')
+            else:
+                print('No intersections were detected!')
+        t.report.print_report()
\ No newline at end of file
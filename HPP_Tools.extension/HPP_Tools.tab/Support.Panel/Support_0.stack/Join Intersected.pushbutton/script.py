@@ -16,6 +16,11 @@ were detected.
 ___________________________________________________________
 How-to:
 Press the button.
+The elements are joined in chunks. If the run is 
+cancelled, the joined chunks are kept and the next run 
+offers to resume from there. The chunk size is the 
+'chunk_size' option of the HPP_Tools section in the 
+pyRevit config.
 ___________________________________________________________
 Prerequisite:
 Please limit the visibility or selection of elements to a 
@@ -25,89 +30,66 @@ cause performance issues!
 ___________________________________________________________
 """
 import sys
-import clr
-clr.AddReference('ProtoGeometry')
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
-clr.AddReference('RevitAPI')
+from Snippets._bootstrap import bootstrap
+bootstrap()
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from System.Collections.Generic import List
 
 import pyrevit
-from pyrevit.forms import ProgressBar
 
 from Snippets._functions import get_all_solids
+from Snippets._query import ElementQuery
+from Snippets._phases import get_phase_resolver
+from Snippets._chunked import ChunkedRun, ask_resume
+from Snippets._transaction import BatchTransaction
+from Snippets._trace import logged_run
 
 # uiapp = __revit__
 doc = __revit__.ActiveUIDocument.Document
 # uidoc = __revit__.ActiveUIDocument
 app = __revit__.Application
+phases = get_phase_resolver(doc)
+with logged_run(__title__):
+    g_options = DB.Options()
 
-g_options = DB.Options()
+    categories = [
+        DB.BuiltInCategory.OST_Stairs,
+        DB.BuiltInCategory.OST_StructuralColumns,
+        DB.BuiltInCategory.OST_StructuralFoundation,
+        DB.BuiltInCategory.OST_StructuralFraming,
+        DB.BuiltInCategory.OST_Walls,
+        DB.BuiltInCategory.OST_Floors,
+        DB.BuiltInCategory.OST_Ceilings
+    ]
 
-categories_filter = List[DB.BuiltInCategory]()
-# add categoties to the list
-categories_filter.Add(DB.BuiltInCategory.OST_Stairs)
-categories_filter.Add(DB.BuiltInCategory.OST_StructuralColumns)
-categories_filter.Add(DB.BuiltInCategory.OST_StructuralFoundation)
-categories_filter.Add(DB.BuiltInCategory.OST_StructuralFraming)
-categories_filter.Add(DB.BuiltInCategory.OST_Walls)
-categories_filter.Add(DB.BuiltInCategory.OST_Floors)
-categories_filter.Add(DB.BuiltInCategory.OST_Ceilings)
+    # create multi category filter
+    multi_category_filter = ElementQuery(doc).of_categories(*categories).filter()
 
-# create multi category filter
-multi_category_filter = DB.ElementMulticategoryFilter(categories_filter)
+    elements = ElementQuery(doc).in_view(doc.ActiveView).of_categories(
+        *categories).instances().created_in_phase(phases.new_phase_id).elements()
 
-elements = [el for el in FEC(doc, doc.ActiveView.Id).WherePasses(
-    multi_category_filter).WhereElementIsNotElementType().ToElements() if el.Parameter[
-    DB.BuiltInParameter.PHASE_CREATED].AsValueString() == 'Neu']
+    run = ChunkedRun(doc, 'Join Intersected')
+    ask_resume(run)
+    joined = []
 
-cancelled = False
-intersected = []
 
-# get intersected elements and initiate progress bar
-with ProgressBar(cancellable=True) as pb:
-    for element, counter in zip(elements, range(0, len(elements))):
-        intersected_elements = set()
+    def join_intersected(transaction, element):
         intersect_filter = DB.ElementIntersectsElementFilter(element)
-        intersected_elements.update(FEC(doc).WherePasses(multi_category_filter).WherePasses(intersect_filter))
-        intersected_Ids = [doc.GetElement(el.Id) for el in intersected_elements]
-        
-        if intersected_Ids:
-            intersected.append([element, intersected_Ids])
-        
-        pb.update_progress(counter, len(elements))
-        
-        if pb.cancelled:
-            cancelled = True
-            break
-
-if cancelled:
-    print('Operation is cancelled!')
-
-#  join elements
-with DB.Transaction(doc, 'Join elements') as t:
-    t.Start()
-    for element in intersected:
-        for el in element[1]:
-            try:
-                DB.JoinGeometryUtils.JoinGeometry(
-                    doc,
-                    element[0],
-                    el
-                )
-            except:
-                pass
-    t.Commit()
-if intersected:
-    print('Elements were joined!')
-else:
-    print('No intersections were detected!')
+        for el in FEC(doc).WherePasses(multi_category_filter).WherePasses(intersect_filter):
+            if DB.JoinGeometryUtils.AreElementsJoined(doc, element, el):
+                continue
+            transaction.attempt(DB.JoinGeometryUtils.JoinGeometry, doc, element, el)
+            joined.append(element.Id)
 
 
+    #  join elements chunk by chunk
+    if run.run(elements, join_intersected, name='Join elements'):
+        with BatchTransaction(doc, 'Join elements', run.report):
+            run.clear()
 
+    run.print_status()
+    if joined:
+        print('Elements were joined!')
+    elif run.is_complete:
+        print('No intersections were detected!')
\ No newline at end of file
@@ -15,7 +15,11 @@ The script provides an output message indicating
 that the elements have been successfully joined.
 ___________________________________________________________
 How-to:
-Press the button.
+Press the button. The check runs in the background while 
+you keep working, a status panel shows the progress and 
+allows to cancel. The elements are joined at the end in 
+one short transaction.
+Shift+Click to run the check in the foreground.
 ___________________________________________________________
 Prerequisite:
 Please limit the visibility or selection of elements to a 
@@ -24,98 +28,92 @@ Running the script on the entire file may
 cause performance issues!
 ___________________________________________________________
 """
+__persistentengine__ = True
+
 import sys
-import clr
-clr.AddReference('ProtoGeometry')
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
-clr.AddReference('RevitAPI')
+from Snippets._bootstrap import bootstrap
+bootstrap()
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from System.Collections.Generic import List
 
 import pyrevit
-from pyrevit.forms import ProgressBar
 
 from Snippets._functions import get_all_solids, flatten
+from Snippets._transaction import BatchTransaction
+from Snippets._scheduler import IdleJob, run_in_foreground, start_in_background
+from Snippets._trace import logged_run
 
 uiapp = __revit__
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
 app = __revit__.Application
+with logged_run(__title__):
+    g_options = DB.Options()
+
+    categories_filter = List[DB.BuiltInCategory]()
+    # add categoties to the list
+    categories_filter.Add(DB.BuiltInCategory.OST_Stairs)
+    categories_filter.Add(DB.BuiltInCategory.OST_StructuralColumns)
+    categories_filter.Add(DB.BuiltInCategory.OST_StructuralFoundation)
+    categories_filter.Add(DB.BuiltInCategory.OST_StructuralFraming)
+    categories_filter.Add(DB.BuiltInCategory.OST_Walls)
+    categories_filter.Add(DB.BuiltInCategory.OST_Floors)
+    categories_filter.Add(DB.BuiltInCategory.OST_Ceilings)
 
-g_options = DB.Options()
+    # create multi category filter
+    multi_category_filter = DB.ElementMulticategoryFilter(categories_filter)
 
-categories_filter = List[DB.BuiltInCategory]()
-# add categoties to the list
-categories_filter.Add(DB.BuiltInCategory.OST_Stairs)
-categories_filter.Add(DB.BuiltInCategory.OST_StructuralColumns)
-categories_filter.Add(DB.BuiltInCategory.OST_StructuralFoundation)
-categories_filter.Add(DB.BuiltInCategory.OST_StructuralFraming)
-categories_filter.Add(DB.BuiltInCategory.OST_Walls)
-categories_filter.Add(DB.BuiltInCategory.OST_Floors)
-categories_filter.Add(DB.BuiltInCategory.OST_Ceilings)
+    elements = FEC(doc, doc.ActiveView.Id).WherePasses(multi_category_filter).WhereElementIsNotElementType().ToElements()
 
-# create multi category filter
-multi_category_filter = DB.ElementMulticategoryFilter(categories_filter)
 
-elements = FEC(doc, doc.ActiveView.Id).WherePasses(multi_category_filter).WhereElementIsNotElementType().ToElements()
+    class JoinJob(IdleJob):
+        """Join elements with intersecting bounding boxes"""
+        title = 'Join All'
 
-cancelled = False
-# create a dictionary to store intersecting elements
-intersections = {}
-with ProgressBar(cancellable=True) as pb:
-    # iterate through the elements and check for intersecting bounding boxes
-    for [i, el1], counter in zip(enumerate(elements), range(0, len(elements))):
-        # get the element's bounding box
-        bbox1 = el1.get_BoundingBox(None)
-        for j in range(i + 1, len(elements)):
-            el2 = elements[j]
-            # get the other element's bounding box
-            bbox2 = el2.get_BoundingBox(None)
-            # check if the two bounding boxes intersect
-            if bbox1 != None:
-                outline1 = DB.Outline(bbox1.Min, bbox1.Max)
-            if bbox2 != None:
-                outline2 = DB.Outline(bbox2.Min, bbox2.Max)
-            if outline1.Intersects(outline2, 10):
-                if el1.Id not in intersections:
-                    intersections[el1.Id] = []
-                intersections[el1.Id].append(el2.Id)
-                if el2.Id not in intersections:
-                    intersections[el2.Id] = []
-                intersections[el2.Id].append(el1.Id)
-            if pb.cancelled:
-                cancelled = True
-                break
-            else:
-                pb.update_progress(counter, len(elements))
+        def __init__(self, doc, elements, view_id, element_filter):
+            IdleJob.__init__(self, doc)
+            self.element_ids = [el.Id for el in elements]
+            self.view_id = view_id
+            self.element_filter = element_filter
+            # outlines are read once, pairs are checked by index
+            self.total = 2 * len(self.element_ids)
+            self.pairs = []
 
-if cancelled:
-    print('Operation is cancelled!')
+        def steps(self):
+            outlines = []
+            for el_id in self.element_ids:
+                element = self.get_element(el_id)
+                bbox = element.get_BoundingBox(None) if element else None
+                outlines.append(DB.Outline(bbox.Min, bbox.Max) if bbox else None)
+                self.done += 1
+                yield
+            # check for intersecting bounding boxes, the candidates are
+            # found by the spatial index of Revit instead of testing all pairs
+            indexes = dict((el_id.IntegerValue, i)
+                           for i, el_id in enumerate(self.element_ids))
+            for i, outline1 in enumerate(outlines):
+                if outline1 is not None:
+                    intersecting = FEC(self.doc, self.view_id).WherePasses(self.element_filter).WhereElementIsNotElementType().WherePasses(
+                        DB.BoundingBoxIntersectsFilter(outline1, 10)).ToElementIds()
+                    for j in sorted(indexes.get(el_id.IntegerValue, -1) for el_id in intersecting):
+                        if j > i and outlines[j] is not None:
+                            self.pairs.append((self.element_ids[i], self.element_ids[j]))
+                self.done += 1
+                yield
 
-# list of elements to join
-inter = []
-for el_id, intersecting_ids in intersections.items():
-    inter.append([el_id, intersecting_ids])
+        def apply(self):
+            with BatchTransaction(self.doc, 'Join Elements', self.report) as t:
+                for el_id1, el_id2 in self.pairs:
+                    el1 = self.get_element(el_id1)
+                    el2 = self.get_element(el_id2)
+                    if el1 is not None and el2 is not None:
+                        t.attempt(DB.JoinGeometryUtils.JoinGeometry, self.doc, el1, el2)
+            self.log('Elements are joined!')
 
-with DB.Transaction(doc, 'Join Elements') as t:
-    t.Start()
-    for i, el in enumerate(inter):
-        for j, el_l in enumerate(inter[i][1]):
-            try:
-                DB.JoinGeometryUtils.JoinGeometry(
-                    doc,
-                    doc.GetElement(el[0]),
-                    doc.GetElement(el_l)
-                )
-            except:
-                pass
-    t.Commit()
 
-if not cancelled:
-    print('Elements are joined!')
\ No newline at end of file
+    job = JoinJob(doc, elements, doc.ActiveView.Id, multi_category_filter)
+    if __shiftclick__:
+        run_in_foreground(job)
+    else:
+        start_in_background(uiapp, job)
\ No newline at end of file
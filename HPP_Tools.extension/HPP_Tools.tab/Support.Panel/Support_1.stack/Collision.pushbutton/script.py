@@ -12,7 +12,16 @@ project. Based on that, a schedule containing the
 intersected elements is created or modified.
 ___________________________________________________________
 How-to:
-Press the button.
+Press the button. The check runs in the background while 
+you keep working, a status panel shows the progress and 
+allows to cancel. The parameters and the schedule are 
+applied at the end in one short transaction.
+Shift+Click to run the check in the foreground. The 
+elements are then checked in chunks. If the run is 
+cancelled, the checked chunks are kept and the next run 
+offers to resume from there. The chunk size is the 
+'chunk_size' option of the HPP_Tools section in the 
+pyRevit config.
 ___________________________________________________________
 Prerequisite:
 The corresponding parameters 'H_TÜ_Kollisionskörper 
@@ -23,203 +32,225 @@ Running script on the entire file may cause performance
 issues!
 ___________________________________________________________
 """
+__persistentengine__ = True
+
 import sys
-import clr
-clr.AddReference('ProtoGeometry')
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
-clr.AddReference('RevitAPI')
+from Snippets._bootstrap import bootstrap
+bootstrap()
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from System.Collections.Generic import List
 
 import pyrevit
-from pyrevit.forms import ProgressBar
 
 from Snippets._functions import flatten, to_list
+from Snippets._query import ElementQuery
+from Snippets._chunked import ChunkedRun, ask_resume
+from Snippets._transaction import BatchTransaction
+from Snippets._scheduler import IdleJob, start_in_background
+from Snippets._trace import logged_run, traced
 
 # uiapp = __revit__
 doc = __revit__.ActiveUIDocument.Document
 # uidoc = __revit__.ActiveUIDocument
 app = __revit__.Application
+with logged_run(__title__):
+    # categories filter list
+    categories_to_check = List[DB.BuiltInCategory]()
+    categories_to_check.Add(DB.BuiltInCategory.OST_Walls)
+    categories_to_check.Add(DB.BuiltInCategory.OST_Floors)
+    categories_to_check.Add(DB.BuiltInCategory.OST_Ceilings)
+    categories_to_check.Add(DB.BuiltInCategory.OST_Furniture)
+    categories_to_check.Add(DB.BuiltInCategory.OST_FurnitureSystems)
+    categories_to_check.Add(DB.BuiltInCategory.OST_Lights)
+    categories_to_check.Add(DB.BuiltInCategory.OST_Stairs)
+
+    # create multifilter
+    multi_category_filter = DB.ElementMulticategoryFilter(categories_to_check)
+
+    # door and window filter
+    door_window_category = List[DB.BuiltInCategory]()
+    door_window_category.Add(DB.BuiltInCategory.OST_Doors)
+    door_window_category.Add(DB.BuiltInCategory.OST_Windows)
+    door_window_filter = DB.ElementMulticategoryFilter(door_window_category)
+
+    # collecting doors and windows elements
+    elements = FEC(doc).WherePasses(door_window_filter).WhereElementIsNotElementType().ToElements()
+
+    # check if 'H_TÜ_Kollisionskörper einschalten' is in the project
+    shared_parameter_name = 'H_TÜ_Kollisionskörper einschalten'
+
+    param_element_id = None
+    for element in elements:
+        for param in element.Parameters:
+            if param.Definition is not None and param.Definition.Name == shared_parameter_name:
+                param_element_id = param.Id
+                break
+
+    door_window_category_ids = [
+        DB.Category.GetCategory(doc, DB.BuiltInCategory.OST_Doors).Id.IntegerValue,
+        DB.Category.GetCategory(doc, DB.BuiltInCategory.OST_Windows).Id.IntegerValue
+    ]
+
 
-# categories filter list
-categories_to_check = List[DB.BuiltInCategory]()
-categories_to_check.Add(DB.BuiltInCategory.OST_Walls)
-categories_to_check.Add(DB.BuiltInCategory.OST_Floors)
-categories_to_check.Add(DB.BuiltInCategory.OST_Ceilings)
-categories_to_check.Add(DB.BuiltInCategory.OST_Furniture)
-categories_to_check.Add(DB.BuiltInCategory.OST_FurnitureSystems)
-categories_to_check.Add(DB.BuiltInCategory.OST_Lights)
-categories_to_check.Add(DB.BuiltInCategory.OST_Stairs)
-
-# create multifilter
-multi_category_filter = DB.ElementMulticategoryFilter(categories_to_check)
-
-# door and window filter
-door_window_category = List[DB.BuiltInCategory]()
-door_window_category.Add(DB.BuiltInCategory.OST_Doors)
-door_window_category.Add(DB.BuiltInCategory.OST_Windows)
-door_window_filter = DB.ElementMulticategoryFilter(door_window_category)
-
-# collecting doors and windows elements
-elements = FEC(doc).WherePasses(door_window_filter).WhereElementIsNotElementType().ToElements()
-
-# check if 'H_TÜ_Kollisionskörper einschalten' is in the project
-shared_parameter_name = 'H_TÜ_Kollisionskörper einschalten'
-
-param_element_id = None
-for element in elements:
-    for param in element.Parameters:
-        if param.Definition is not None and param.Definition.Name == shared_parameter_name:
-            param_element_id = param.Id
-            break
-
-cancelled = False
-
-clashed_elements = []
-
-if param_element_id == None:
-    print("Please apply parameter 'H_TÜ_Kollisionskörper einschalten' to the families.")
-
-else:
-
-    # rule, that checks if family has parameter 'H_TÜ_Kollisionskörper einschalten'
-    window_door_contains_rule = DB.ParameterFilterRuleFactory.CreateHasValueParameterRule(
-        param_element_id
-    )
-
-    # filter collects only windows and doors containing parameter above
-    and_rule_filter = DB.LogicalAndFilter(
-        to_list(
-            [
-                door_window_filter,
-                DB.ElementParameterFilter(window_door_contains_rule)
-            ],
-            DB.ElementFilter
-        ))
-
-    # filter for categories, dors and windows with 'H_TÜ_Kollisionskörper einschalten'
-    or_rule_filter = DB.LogicalOrFilter(
-        to_list(
-            [
-                multi_category_filter,
-                and_rule_filter
-            ],
-            DB.ElementFilter
-        ))
-
-    # collect elements from active view
-    elements_check_list = FEC(doc, doc.ActiveView.Id).WherePasses(or_rule_filter).WhereElementIsNotElementType().ToElements()
-
-    # get filters
-    filters_list = [DB.ElementIntersectsElementFilter(el) for el in elements_check_list]
-
-    # get collisions and initiate the progress bar
-    total_result = []
-    with ProgressBar(cancellable=True) as pb:
-        for filter, counter in zip(filters_list, range(0, len(filters_list))):
-            result = [
-                doc.GetElement(el_id) for el_id in FEC(doc).WherePasses(or_rule_filter).WherePasses(filter).ToElementIds()
-                ]
-            if pb.cancelled:
-                cancelled = True
+    @traced('find clashes')
+    def find_clashes(element):
+        """Get ids of the doors and windows intersecting the element"""
+        filter = DB.ElementIntersectsElementFilter(element)
+        return [el_id.IntegerValue for el_id in FEC(doc).WherePasses(or_rule_filter).WherePasses(filter).ToElementIds()
+                if doc.GetElement(el_id).Category.Id.IntegerValue in door_window_category_ids]
+
+
+    def set_collision_parameter(transaction, element, value):
+        parameter = element.LookupParameter('H_OQ_Kollisionsprüfung')
+        if parameter is not None:
+            transaction.attempt(parameter.Set, value)
+
+
+    def unmark_not_clashed(transaction, clashed_elements_ids):
+        for item in FEC(doc).WherePasses(door_window_filter).WhereElementIsNotElementType().ToElements():
+            if item.Id.IntegerValue not in clashed_elements_ids:
+                set_collision_parameter(transaction, item, False)
+
+
+    @traced('schedule')
+    def create_schedule(clashed_elements_ids, messages):
+        # get clashed elements
+        clashed_elements = [doc.GetElement(DB.ElementId(el_id)) for el_id in sorted(clashed_elements_ids)]
+        clashed_elements = [el for el in clashed_elements if el is not None]
+
+        for item in clashed_elements:
+            if item.LookupParameter('H_OQ_Kollisionsprüfung') == None:
+                messages.append('Please add "H_OQ_Kollisionsprüfung" parameter to the project!')
                 break
-            else:
-                pb.update_progress(counter, len(filters_list))
-            total_result.append(result)
-
-    # unique clash elements by id
-    clashed_elements_ids = []
-    for element in flatten(total_result):
-        if element.Category.Id == DB.Category.GetCategory(
-            doc, DB.BuiltInCategory.OST_Doors).Id or element.Category.Id == DB.Category.GetCategory(
-            doc, DB.BuiltInCategory.OST_Windows).Id:
-            if element.Id not in clashed_elements_ids:
-                clashed_elements_ids.append(element.Id)
-
-    # get clashed elements
-    clashed_elements = flatten([doc.GetElement(el_id) for el_id in clashed_elements_ids])
-
-    # get not clashed elements ids
-    not_clashed_elements_ids = [el.Id for el in FEC(doc).WherePasses(
-        door_window_filter).WhereElementIsNotElementType().ToElements(
-        ) if el.Id not in clashed_elements_ids]
-
-    # get clashed elements
-    not_clashed_elements = flatten([doc.GetElement(el_id) for el_id in not_clashed_elements_ids])
-    for item in clashed_elements:
-        if item.LookupParameter('H_OQ_Kollisionsprüfung') == None:
-            print('Please add "H_OQ_Kollisionsprüfung" parameter to the project!')
-            break
-
-    # apply parameters
-    try:
-        with DB.Transaction(doc, 'Assign Collision Check Parameter') as t:
-            t.Start()
-            for item in clashed_elements:
-                parameter = item.LookupParameter('H_OQ_Kollisionsprüfung')
-                parameter.Set(True)
-            for item in not_clashed_elements:
-                parameter = item.LookupParameter('H_OQ_Kollisionsprüfung')
-                parameter.Set(False)
-            t.Commit()
-    except:
-        Exception
-
-
-if cancelled:
-    print('Operation is cancelled!')
-else:
-    # schedule creation
-    if len(clashed_elements) > 0:
-        try:
-            with DB.Transaction(doc, 'Create or Modify Schedule') as t:
-                t.Start()
-                if len([item for item in FEC(doc).OfClass(DB.ViewSchedule).ToElements() if item.Name == 'Collision Check']) > 0:
-                    print('Existing schedule "Collision Check" is modified')
-                else:
-                    multi_schedule = DB.ViewSchedule.CreateSchedule(
-                        doc,
-                        DB.ElementId(DB.BuiltInCategory.INVALID)
+
+        # schedule creation
+        if len(clashed_elements) > 0:
+            try:
+                with DB.Transaction(doc, 'Create or Modify Schedule') as t:
+                    t.Start()
+                    if len([item for item in FEC(doc).OfClass(DB.ViewSchedule).ToElements() if item.Name == 'Collision Check']) > 0:
+                        messages.append('Existing schedule "Collision Check" is modified')
+                    else:
+                        multi_schedule = DB.ViewSchedule.CreateSchedule(
+                            doc,
+                            DB.ElementId(DB.BuiltInCategory.INVALID)
+                        )
+                        multi_schedule.Name = 'Collision Check'
+                    s_definition = multi_schedule.Definition
+
+                    # add schedule fields
+                    family_field = s_definition.AddField(
+                    DB.ScheduleFieldType.Instance,
+                        DB.ElementId(
+                            DB.BuiltInParameter.ELEM_FAMILY_AND_TYPE_PARAM
+                        )
                     )
-                    multi_schedule.Name = 'Collision Check'
-                s_definition = multi_schedule.Definition
-
-                # add schedule fields
-                family_field = s_definition.AddField(
-                DB.ScheduleFieldType.Instance,
-                    DB.ElementId(
-                        DB.BuiltInParameter.ELEM_FAMILY_AND_TYPE_PARAM
+                    collision_param_id = clashed_elements[0].LookupParameter('H_OQ_Kollisionsprüfung').Id
+                    collision_field = s_definition.AddField(
+                    DB.ScheduleFieldType.Instance,
+                        collision_param_id
                     )
-                )
-                collision_param_id = clashed_elements[0].LookupParameter('H_OQ_Kollisionsprüfung').Id
-                collision_field = s_definition.AddField(
-                DB.ScheduleFieldType.Instance,
-                    collision_param_id
-                )
-
-                # add schedule filter
-                collision_filter = s_definition.AddFilter(
-                    DB.ScheduleFilter(
-                        collision_field.FieldId, 
-                        DB.ScheduleFilterType.HasValue
+
+                    # add schedule filter
+                    collision_filter = s_definition.AddFilter(
+                        DB.ScheduleFilter(
+                            collision_field.FieldId, 
+                            DB.ScheduleFilterType.HasValue
+                        )
                     )
-                )
-                collision_filter_yes = s_definition.AddFilter(
-                    DB.ScheduleFilter(
-                        collision_field.FieldId, 
-                        DB.ScheduleFilterType.Equal,
-                        True
+                    collision_filter_yes = s_definition.AddFilter(
+                        DB.ScheduleFilter(
+                            collision_field.FieldId, 
+                            DB.ScheduleFilterType.Equal,
+                            True
+                        )
                     )
-                )
-                t.Commit()
-            print('Check the schedule named "Collision Check"!')
-        except:
-            Exception
-    elif param_element_id != None:
-        print('No clashed doors or windows were detected on active view!')
\ No newline at end of file
+                    t.Commit()
+                messages.append('Check the schedule named "Collision Check"!')
+            except:
+                Exception
+        else:
+            messages.append('No clashed doors or windows were detected on active view!')
+
+
+    class CollisionJob(IdleJob):
+        """Check the doors and windows for collisions in the background"""
+        title = 'Collision'
+
+        def __init__(self, doc, elements):
+            IdleJob.__init__(self, doc)
+            self.element_ids = [el.Id for el in elements]
+            self.total = len(self.element_ids)
+            self.clashed_elements_ids = set()
+
+        def steps(self):
+            for el_id in self.element_ids:
+                element = self.get_element(el_id)
+                if element is not None:
+                    self.clashed_elements_ids.update(find_clashes(element))
+                self.done += 1
+                yield
+
+        def apply(self):
+            with BatchTransaction(self.doc, 'Assign Collision Check Parameter', self.report) as t:
+                for el_id in self.clashed_elements_ids:
+                    element = self.get_element(DB.ElementId(el_id))
+                    if element is not None:
+                        set_collision_parameter(t, element, True)
+                unmark_not_clashed(t, self.clashed_elements_ids)
+            create_schedule(self.clashed_elements_ids, self.messages)
+
+
+    if param_element_id == None:
+        print("Please apply parameter 'H_TÜ_Kollisionskörper einschalten' to the families.")
+
+    else:
+
+        # categories, doors and windows with 'H_TÜ_Kollisionskörper einschalten'
+        check_query = ElementQuery(doc).where(multi_category_filter).union(
+            ElementQuery(doc).where(door_window_filter).has_parameter_value(param_element_id)
+        )
+        or_rule_filter = check_query.filter()
+
+        # collect elements from active view
+        elements_check_list = FEC(doc, doc.ActiveView.Id).WherePasses(or_rule_filter).WhereElementIsNotElementType().ToElements()
+
+        if __shiftclick__:
+            # door and window ids clashed in the chunks done so far
+            run = ChunkedRun(doc, 'Collision')
+            ask_resume(run)
+            clashed_elements_ids = set(run.data.setdefault('clashed', []))
+
+            def read_clashed(chunk):
+                # a rolled back chunk left its clashes in the set
+                clashed_elements_ids.clear()
+                clashed_elements_ids.update(run.data['clashed'])
+
+            def check_collisions(transaction, element):
+                for el_id in find_clashes(element):
+                    if el_id not in clashed_elements_ids:
+                        clashed_elements_ids.add(el_id)
+                        set_collision_parameter(transaction, doc.GetElement(DB.ElementId(el_id)), True)
+
+            def save_clashed(chunk):
+                run.data['clashed'] = sorted(clashed_elements_ids)
+
+            # get collisions chunk by chunk and mark the clashed elements
+            run.run(elements_check_list, check_collisions, prepare_chunk=read_clashed,
+                    finish_chunk=save_clashed, name='Assign Collision Check Parameter')
+
+            # unmark the not clashed elements once all elements are checked
+            if run.is_complete:
+                with BatchTransaction(doc, 'Assign Collision Check Parameter', run.report) as t:
+                    unmark_not_clashed(t, clashed_elements_ids)
+                    run.clear()
+            run.print_status()
+
+            if run.is_complete:
+                messages = []
+                create_schedule(clashed_elements_ids, messages)
+                for message in messages:
+                    print(message)
+        else:
+            start_in_background(__revit__, CollisionJob(doc, elements_check_list))
\ No newline at end of file
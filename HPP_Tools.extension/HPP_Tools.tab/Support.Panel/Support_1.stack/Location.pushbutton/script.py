@@ -15,7 +15,11 @@ to these elements, highlighting them with a specified
 background pattern and color.
 ___________________________________________________________
 How-to:
-Press the button.
+Press the button. The check runs in the background while 
+you keep working, a status panel shows the progress and 
+allows to cancel. The filter is created at the end in 
+one short transaction.
+Shift+Click to run the check in the foreground.
 ___________________________________________________________
 Prerequisite:
 A proper level types and heights should be applied. 
@@ -27,105 +31,98 @@ Running the script on the entire file may
 cause performance issues!
 ___________________________________________________________
 """
+__persistentengine__ = True
+
 import sys
-import clr
-clr.AddReference('ProtoGeometry')
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
-clr.AddReference('RevitAPI')
+from Snippets._bootstrap import bootstrap
+bootstrap()
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from System.Collections.Generic import List
 
 import pyrevit
-from pyrevit.forms import ProgressBar
 
 from Snippets._functions import get_3d_view_type_id, view_exists, \
     get_parameter_value_v2, unit_converter, check_intersection, merge_bounding_boxes
+from Snippets._transaction import BatchTransaction
+from Snippets._scheduler import IdleJob, run_in_foreground, start_in_background
+from Snippets._trace import logged_run
 
 uiapp = __revit__
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
 app = __revit__.Application
+with logged_run(__title__):
+    # doc = DocumentManager.Instance.CurrentDBDocument
+    # uiapp = DocumentManager.Instance.CurrentUIApplication
+    # app = uiapp.Application
+    # uidoc = uiapp.ActiveUIDocument
+
+    # filter list
+    categories_filter = List[DB.BuiltInCategory]()
+    categories_filter.Add(DB.BuiltInCategory.OST_Doors)
+    categories_filter.Add(DB.BuiltInCategory.OST_Walls)
+    categories_filter.Add(DB.BuiltInCategory.OST_Ceilings)
+    categories_filter.Add(DB.BuiltInCategory.OST_Windows)
+    categories_filter.Add(DB.BuiltInCategory.OST_Furniture)
+    categories_filter.Add(DB.BuiltInCategory.OST_FurnitureSystems)
+    categories_filter.Add(DB.BuiltInCategory.OST_Stairs)
+    categories_filter.Add(DB.BuiltInCategory.OST_StructuralColumns)
+    # categories_filter.Add(DB.BuiltInCategory.OST_StructuralFoundation)
+    categories_filter.Add(DB.BuiltInCategory.OST_StructuralFraming)
+    # categories_filter.Add(DB.BuiltInCategory.OST_Floors)
+    categories_filter.Add(DB.BuiltInCategory.OST_Railings)
+    categories_filter.Add(DB.BuiltInCategory.OST_CurtainWallPanels)
+    categories_filter.Add(DB.BuiltInCategory.OST_CurtainWallMullions)
+
+    # create multifilter
+    multi_category_filter = DB.ElementMulticategoryFilter(categories_filter)
+
+    # elements from Active View
+    elements_list = FEC(doc, doc.ActiveView.Id).WherePasses(multi_category_filter) \
+        .WhereElementIsNotElementType().ToElements()
+
+    # level parameters
+    level_parameter_list = [
+        DB.BuiltInParameter.FAMILY_LEVEL_PARAM,
+        DB.BuiltInParameter.WALL_BASE_CONSTRAINT,
+        DB.BuiltInParameter.LEVEL_PARAM,
+        DB.BuiltInParameter.SCHEDULE_LEVEL_PARAM,
+        DB.BuiltInParameter.STAIRS_BASE_LEVEL_PARAM,
+        DB.BuiltInParameter.FAMILY_BASE_LEVEL_PARAM,
+        DB.BuiltInParameter.STAIRS_RAILING_BASE_LEVEL_PARAM
+    ]
+
+    # create 3d view for bboxes application
+    view_family_type_id = get_3d_view_type_id(doc)
+
+    if view_family_type_id:
+        if not view_exists(doc, "Bounding Box View"):
+            with DB.Transaction(doc, "Create 3D View") as t:
+                t.Start()
+                view_3d = DB.View3D.CreateIsometric(doc, view_family_type_id)
+                view_3d.Name = "Bounding Box View"
+                view_3d.IsSectionBoxActive = False
+                levels_cat = doc.Settings.Categories.get_Item(DB.BuiltInCategory.OST_Levels)
+                # make the levels visible in the view
+                view_3d.SetCategoryHidden(levels_cat.Id, False)
+                t.Commit()
+        else:
+            pass
 
-# doc = DocumentManager.Instance.CurrentDBDocument
-# uiapp = DocumentManager.Instance.CurrentUIApplication
-# app = uiapp.Application
-# uidoc = uiapp.ActiveUIDocument
-
-# filter list
-categories_filter = List[DB.BuiltInCategory]()
-categories_filter.Add(DB.BuiltInCategory.OST_Doors)
-categories_filter.Add(DB.BuiltInCategory.OST_Walls)
-categories_filter.Add(DB.BuiltInCategory.OST_Ceilings)
-categories_filter.Add(DB.BuiltInCategory.OST_Windows)
-categories_filter.Add(DB.BuiltInCategory.OST_Furniture)
-categories_filter.Add(DB.BuiltInCategory.OST_FurnitureSystems)
-categories_filter.Add(DB.BuiltInCategory.OST_Stairs)
-categories_filter.Add(DB.BuiltInCategory.OST_StructuralColumns)
-# categories_filter.Add(DB.BuiltInCategory.OST_StructuralFoundation)
-categories_filter.Add(DB.BuiltInCategory.OST_StructuralFraming)
-# categories_filter.Add(DB.BuiltInCategory.OST_Floors)
-categories_filter.Add(DB.BuiltInCategory.OST_Railings)
-categories_filter.Add(DB.BuiltInCategory.OST_CurtainWallPanels)
-categories_filter.Add(DB.BuiltInCategory.OST_CurtainWallMullions)
-
-# create multifilter
-multi_category_filter = DB.ElementMulticategoryFilter(categories_filter)
-
-# elements from Active View
-elements_list = FEC(doc, doc.ActiveView.Id).WherePasses(multi_category_filter) \
-    .WhereElementIsNotElementType().ToElements()
-
-# level parameters
-level_parameter_list = [
-    DB.BuiltInParameter.FAMILY_LEVEL_PARAM,
-    DB.BuiltInParameter.WALL_BASE_CONSTRAINT,
-    DB.BuiltInParameter.LEVEL_PARAM,
-    DB.BuiltInParameter.SCHEDULE_LEVEL_PARAM,
-    DB.BuiltInParameter.STAIRS_BASE_LEVEL_PARAM,
-    DB.BuiltInParameter.FAMILY_BASE_LEVEL_PARAM,
-    DB.BuiltInParameter.STAIRS_RAILING_BASE_LEVEL_PARAM
-]
-
-# create 3d view for bboxes application
-view_family_type_id = get_3d_view_type_id(doc)
-
-if view_family_type_id:
-    if not view_exists(doc, "Bounding Box View"):
-        with DB.Transaction(doc, "Create 3D View") as t:
-            t.Start()
-            view_3d = DB.View3D.CreateIsometric(doc, view_family_type_id)
-            view_3d.Name = "Bounding Box View"
-            view_3d.IsSectionBoxActive = False
-            levels_cat = doc.Settings.Categories.get_Item(DB.BuiltInCategory.OST_Levels)
-            # make the levels visible in the view
-            view_3d.SetCategoryHidden(levels_cat.Id, False)
-            t.Commit()
-    else:
-        pass
-
-# get the view
-view_3d = [view for view in FEC(doc).OfClass(DB.View).ToElements() if view.Name == "Bounding Box View"].pop()
-
-# pick all levels from project, that are marked as 'Building Story'
-levels = [level for level in FEC(doc).OfClass(DB.Level).WhereElementIsNotElementType().ToElements() \
-          if level.Parameter[DB.BuiltInParameter.LEVEL_IS_BUILDING_STORY].AsInteger() == 1]
+    # get the view
+    view_3d = [view for view in FEC(doc).OfClass(DB.View).ToElements() if view.Name == "Bounding Box View"].pop()
 
-# sort 'Building Story' floors by elevation
-levels_sorted = sorted(levels, key=lambda level: level.Elevation)
+    # pick all levels from project, that are marked as 'Building Story'
+    levels = [level for level in FEC(doc).OfClass(DB.Level).WhereElementIsNotElementType().ToElements() \
+              if level.Parameter[DB.BuiltInParameter.LEVEL_IS_BUILDING_STORY].AsInteger() == 1]
 
-# get Bounding boxes by each level
-bounding_boxes_by_level = []
+    # sort 'Building Story' floors by elevation
+    levels_sorted = sorted(levels, key=lambda level: level.Elevation)
 
-# collect elements that are not intersecting the bbox of referenced level
-location_check = []
-with ProgressBar(cancellable=True) as pb:
-    for [index, level], counter in zip(enumerate(levels_sorted), range(len(levels_sorted))):
+    # get Bounding boxes by each level
+    bounding_boxes_by_level = {}
+    for index, level in enumerate(levels_sorted):
         if index < len(levels_sorted) - 1:
             bbox = merge_bounding_boxes([level.get_BoundingBox(view_3d), \
                                         levels_sorted[index+1].get_BoundingBox(view_3d)])
@@ -133,52 +130,74 @@ with ProgressBar(cancellable=True) as pb:
             distance = unit_converter(doc, 5)
             bbox = level.get_BoundingBox(view_3d)
             bbox.Max = DB.XYZ(bbox.Max.X, bbox.Max.Y, bbox.Max.Z + distance)
-        for element in elements_list:
-            for level_parameter in level_parameter_list:
-                if element.Parameter[level_parameter] is not None:
-                    level_param = element.Parameter[level_parameter]
-                    if get_parameter_value_v2(level_param) == level.Id:
-
-                        # check if bbox intersects the element
-                        if check_intersection(bbox, element) == False:
-                            location_check.append(element)
-        if pb.cancelled:
-            break
-        else:
-            pb.update_progress(counter, len(levels_sorted))
-            bounding_boxes_by_level.append(bbox)
-
-i_collection = List[DB.ElementId]()
-
-for element in location_check:
-    i_collection.Add(element.Id)
-
-# create filter
-active_view = doc.ActiveView
-graphic_settings = DB.OverrideGraphicSettings()
-graphic_settings.SetSurfaceBackgroundPatternVisible(True)
-patterns = FEC(doc).OfClass(DB.FillPatternElement).ToElements()
-solid_pattern = [pattern for pattern in patterns if pattern.GetFillPattern().IsSolidFill]
-graphic_settings.SetSurfaceBackgroundPatternId(solid_pattern[0].Id)
-graphic_settings.SetSurfaceBackgroundPatternColor(DB.Color(255, 0, 0))
-graphic_settings.SetSurfaceForegroundPatternColor(DB.Color(255, 0, 0))
-
-with DB.Transaction(doc, 'New filter') as t:
-    t.Start()
-    for filter in FEC(doc).OfClass(DB.SelectionFilterElement).ToElements():
-        if doc.GetElement(filter.Id).Name == 'Location check':
-            doc.Delete(filter.Id)
-        else:
-            pass
-    filter = DB.SelectionFilterElement.Create(
-        doc,
-        'Location check'
-    )
-    filter.AddSet(
-        i_collection
-    )
-    active_view.AddFilter(filter.Id)
-    active_view.SetFilterOverrides(filter.Id, graphic_settings)
-    t.Commit()
-
-print('Filter "Location check" is created')
+        bounding_boxes_by_level[level.Id.IntegerValue] = bbox
+
+    # create filter
+    active_view = doc.ActiveView
+    graphic_settings = DB.OverrideGraphicSettings()
+    graphic_settings.SetSurfaceBackgroundPatternVisible(True)
+    patterns = FEC(doc).OfClass(DB.FillPatternElement).ToElements()
+    solid_pattern = [pattern for pattern in patterns if pattern.GetFillPattern().IsSolidFill]
+    graphic_settings.SetSurfaceBackgroundPatternId(solid_pattern[0].Id)
+    graphic_settings.SetSurfaceBackgroundPatternColor(DB.Color(255, 0, 0))
+    graphic_settings.SetSurfaceForegroundPatternColor(DB.Color(255, 0, 0))
+
+
+    class LocationJob(IdleJob):
+        """Collect elements that are not intersecting the bbox of referenced level"""
+        title = 'Location'
+
+        def __init__(self, doc, elements):
+            IdleJob.__init__(self, doc)
+            self.element_ids = [element.Id for element in elements]
+            self.total = len(self.element_ids)
+            self.location_check = []
+
+        def steps(self):
+            for el_id in self.element_ids:
+                element = self.get_element(el_id)
+                if element is not None:
+                    for level_parameter in level_parameter_list:
+                        level_param = element.Parameter[level_parameter]
+                        if level_param is None:
+                            continue
+                        level_id = get_parameter_value_v2(level_param)
+                        if isinstance(level_id, DB.ElementId) and \
+                                level_id.IntegerValue in bounding_boxes_by_level:
+
+                            # check if bbox intersects the element
+                            bbox = bounding_boxes_by_level[level_id.IntegerValue]
+                            if check_intersection(bbox, element) == False:
+                                self.location_check.append(el_id)
+                                break
+                self.done += 1
+                yield
+
+        def apply(self):
+            i_collection = List[DB.ElementId]()
+            for el_id in self.location_check:
+                if self.get_element(el_id) is not None:
+                    i_collection.Add(el_id)
+
+            with BatchTransaction(self.doc, 'New filter', self.report):
+                for filter in FEC(self.doc).OfClass(DB.SelectionFilterElement).ToElements():
+                    if filter.Name == 'Location check':
+                        self.doc.Delete(filter.Id)
+                filter = DB.SelectionFilterElement.Create(
+                    self.doc,
+                    'Location check'
+                )
+                filter.AddSet(
+                    i_collection
+                )
+                active_view.AddFilter(filter.Id)
+                active_view.SetFilterOverrides(filter.Id, graphic_settings)
+
+            self.log('Filter "Location check" is created')
+
+
+    job = LocationJob(doc, elements_list)
+    if __shiftclick__:
+        run_in_foreground(job)
+    else:
+        start_in_background(uiapp, job)
\ No newline at end of file
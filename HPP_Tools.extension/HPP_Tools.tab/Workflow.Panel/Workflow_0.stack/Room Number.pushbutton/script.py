@@ -11,6 +11,9 @@ the room name and existing number parameter.
 It also checks for rooms that do not have the 
 "H_RA_Raumnummer" parameter or have an empty value, 
 and prompts to review the "Raumliste".
+The last numbers are stored in the project: a rerun keeps 
+the numbers of unchanged rooms and numbers only new 
+and changed rooms.
 ___________________________________________________________
 How-to:
 Press the button.
@@ -22,79 +25,67 @@ ___________________________________________________________
 """
 
 import sys
-import clr
 
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
+from Snippets._bootstrap import bootstrap
+bootstrap()
 
-clr.AddReference('RevitAPI')
 from Autodesk.Revit.DB import *
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 
 from System import *
 
+from Snippets._query import ElementQuery
+from Snippets._phases import get_phase_resolver
+from Snippets._numbering import StableNumbering
+from Snippets._transaction import BatchTransaction
+from Snippets._trace import logged_run
+
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
+phases = get_phase_resolver(doc)
+with logged_run(__title__):
+    rooms = ElementQuery(doc).of_categories(
+        DB.BuiltInCategory.OST_Rooms).instances().room_phase(phases.new_phase_id).parameter_greater(
+        DB.BuiltInParameter.ROOM_AREA, 0).elements()
 
-rooms = [room for room in FEC(doc).OfCategory(
-        BuiltInCategory.OST_Rooms).WhereElementIsNotElementType().ToElements() if room.Parameter[
-        DB.BuiltInParameter.ROOM_PHASE].AsValueString() == 'Neu' and room.Parameter[
-        DB.BuiltInParameter.ROOM_AREA].AsDouble() != 0]
-
-# for room in rooms:
-#     if room.LookupParameter('H_RA_Raumnummer') == None:
-#         raise Exception ('Please apply parameter "H_RA_Raumnummer" to rooms!')
+    # for room in rooms:
+    #     if room.LookupParameter('H_RA_Raumnummer') == None:
+    #         raise Exception ('Please apply parameter "H_RA_Raumnummer" to rooms!')
 
-for room in rooms:
-    if room.LookupParameter('H_RA_Raumnummer') == None:
-        print('Please apply parameter "H_RA_Raumnummer" to room!')
-        break
+    for room in rooms:
+        if room.LookupParameter('H_RA_Raumnummer') == None:
+            print('Please apply parameter "H_RA_Raumnummer" to room!')
+            break
 
-numbers_generated = []
-temp_numbers = []
-temp_room = []
-with DB.Transaction(doc, 'Assign Room Number') as t:
-    t.Start()
+    numbering = StableNumbering(doc, 'room_number', '{base}{index}')
+    items = []
     for room in rooms:
-        number_param = room.Parameter[DB.BuiltInParameter.ROOM_NUMBER].AsString()
-        name_param = room.Parameter[DB.BuiltInParameter.ROOM_NAME].AsString()
+        number_param = room.Parameter[DB.BuiltInParameter.ROOM_NUMBER].AsString() or ''
+        name_param = room.Parameter[DB.BuiltInParameter.ROOM_NAME].AsString() or ''
         room_number = number_param + '.' + name_param[:1].upper()
-        if room_number in numbers_generated:
-            temp_numbers.append(room_number)
-            temp_room.append(room)
-        else:
-            numbers_generated.append(room_number)
-            paumnummer_param = room.LookupParameter('H_RA_Raumnummer')
-            paumnummer_param.Set(room_number)
-    for room, [i, value] in zip(temp_room, enumerate(temp_numbers)):
-        totalcount = temp_numbers.count(value)
-        count = temp_numbers[:i].count(value)
-        room_number = value + str(count + 1) if totalcount > 0 else value
-        paumnummer_param = room.LookupParameter('H_RA_Raumnummer')
-        paumnummer_param.Set(room_number)
-        numbers_generated.append(room_number)
-    t.Commit()
-    
-print('The following room numbers were generated and applied:')
-for number in numbers_generated:
-    print(number)
+        items.append((room, room_number, [number_param, name_param]))
+    numbering.assign(items)
+
+    with BatchTransaction(doc, 'Assign Room Number') as t:
+        writer = numbering.write(rooms, 'H_RA_Raumnummer')
 
-all_rooms = [room for room in FEC(doc).OfCategory(
-        BuiltInCategory.OST_Rooms).WhereElementIsNotElementType().ToElements() if room.Parameter[
-        DB.BuiltInParameter.ROOM_PHASE].AsValueString() == 'Neu']
-if len(all_rooms) < 0:
-    print('***')
-    print('The following rooms got no "H_RA_Raumnummer" parameter:')
-    for room in all_rooms:
-        if room.LookupParameter(
-            'H_RA_Raumnummer').AsString() == None or room.LookupParameter(
-            'H_RA_Raumnummer').AsString() == '' or room.Parameter[
-            DB.BuiltInParameter.ROOM_AREA].AsDouble() == 0:
-            print(room.Id)
-    print('Check "Raumliste"!')
+    print('The following room numbers were generated and applied:')
+    for room in numbering.changed:
+        print(numbering.numbers[room.Id.IntegerValue])
+    print('{} room number(s) kept, {} written.'.format(
+        len(numbering.kept), writer.written_count))
+    t.report.print_report()
 
+    all_rooms = ElementQuery(doc).of_categories(
+        DB.BuiltInCategory.OST_Rooms).instances().room_phase(phases.new_phase_id).elements()
+    if len(all_rooms) < 0:
+        print('***')
+        print('The following rooms got no "H_RA_Raumnummer" parameter:')
+        for room in all_rooms:
+            if room.LookupParameter(
+                'H_RA_Raumnummer').AsString() == None or room.LookupParameter(
+                'H_RA_Raumnummer').AsString() == '' or room.Parameter[
+                DB.BuiltInParameter.ROOM_AREA].AsDouble() == 0:
+                print(room.Id)
+        print('Check "Raumliste"!')
\ No newline at end of file
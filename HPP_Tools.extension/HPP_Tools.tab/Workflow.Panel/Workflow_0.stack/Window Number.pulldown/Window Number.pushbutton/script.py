@@ -27,69 +27,45 @@ ___________________________________________________________
 """
 
 import clr
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
+from Snippets._bootstrap import bootstrap
+bootstrap()
 clr.AddReference('System.Drawing')
 from System.Drawing import Color, ColorTranslator
 
-clr.AddReference('RevitAPI')
-clr.AddReference('RevitAPIUI')
 from Autodesk.Revit import DB, UI
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from Autodesk.Revit.DB import Architecture as AR
 from Autodesk.Revit.UI import Selection as SEL
 from System import *
 
-from Snippets._functions import unit_converter
+from Snippets._query import ElementQuery
+from Snippets._phases import get_phase_resolver
+from Snippets._windows import WindowSizeNumbering
+from Snippets._transaction import BatchTransaction
+from Snippets._writer import ParameterWriter
+from Snippets._trace import logged_run
 
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
+phases = get_phase_resolver(doc)
+with logged_run(__title__):
+    windows = ElementQuery(doc).of_categories(
+        DB.BuiltInCategory.OST_Windows).instances().created_in_phase(phases.new_phase_id).elements()
 
-windows = [window for window in FEC(doc).OfCategory(
-    DB.BuiltInCategory.OST_Windows).WhereElementIsNotElementType() if window.Parameter[
-    DB.BuiltInParameter.PHASE_CREATED].AsValueString() == 'Neu']
+    numbering = WindowSizeNumbering(doc)
+    window_numbers = numbering.assign(windows)
 
-window_numbers = []
+    with BatchTransaction(doc, 'Assign Window Number') as t:
+        writer = ParameterWriter()
+        for window_number, numbered_windows in window_numbers.items():
+            for window in numbered_windows:
+                writer.set(window, 'H_FE_Fensternummer', window_number)
 
-with DB.Transaction(doc, 'Assign Window Number') as t:
-    t.Start()
-    for window in windows:
-        if window.Symbol.Parameter[DB.BuiltInParameter.WINDOW_WIDTH] != None and \
-            window.Parameter[DB.BuiltInParameter.INSTANCE_SILL_HEIGHT_PARAM] != None and \
-            window.Parameter[DB.BuiltInParameter.WINDOW_WIDTH] != None:
-            
-            parameter = window.LookupParameter('H_FE_Fensternummer')
-            sill_height = round(unit_converter(
-                doc,
-                window.Parameter[DB.BuiltInParameter.INSTANCE_SILL_HEIGHT_PARAM].AsDouble()
-            ) * 100)
-            if window.Symbol.get_Parameter(DB.BuiltInParameter.WINDOW_WIDTH).AsDouble() > 0:
-                width = round(unit_converter(
-                    doc,
-                    window.Symbol.Parameter[DB.BuiltInParameter.WINDOW_WIDTH].AsDouble()
-                ) * 100)
-            else:
-                width = round(unit_converter(
-                    doc,
-                    window.Parameter[DB.BuiltInParameter.WINDOW_WIDTH].AsDouble()
-                ) * 100)
-            mirrored = window.Mirrored
-            if window.Mirrored == True:
-                window_number = 'F.' + str(width)[:-2] + '.' + str(sill_height)[:-2] + '.M'
-                parameter.Set(window_number)
-            else:
-                window_number = 'F.' + str(width)[:-2] + '.' + str(sill_height)[:-2]
-                parameter.Set(window_number)
-            window_numbers.append(window_number)
-    t.Commit()
-
-if len(window_numbers) > 0:
-    print('Following window numbers were generated:')
-    for number in window_numbers:
-        print(number)
-else:
-    print('No numbers were generated')
\ No newline at end of file
+    if len(window_numbers) > 0:
+        print('Following window numbers were generated:')
+        for number in sorted(window_numbers):
+            print('{} ({} window(s))'.format(number, len(window_numbers[number])))
+        writer.print_report()
+    else:
+        print('No numbers were generated')
+    t.report.print_report()
\ No newline at end of file
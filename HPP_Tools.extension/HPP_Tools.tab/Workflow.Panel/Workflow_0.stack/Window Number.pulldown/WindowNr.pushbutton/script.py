@@ -16,6 +16,8 @@ dimensions and sill height. It checks if the required
 parameters are available and calculates the window number 
 accordingly. The generated window numbers 
 are printed as output.
+The windows of a room are counted clockwise along the 
+room boundary, starting at its north-west corner.
 ___________________________________________________________
 How-to:
 Press the button.
@@ -26,67 +28,63 @@ ___________________________________________________________
 """
 
 import clr
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
+from Snippets._bootstrap import bootstrap
+bootstrap()
 clr.AddReference('System.Drawing')
 from System.Drawing import Color, ColorTranslator
 
-clr.AddReference('RevitAPI')
-clr.AddReference('RevitAPIUI')
 from Autodesk.Revit import DB, UI
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from Autodesk.Revit.DB import Architecture as AR
 from Autodesk.Revit.UI import Selection as SEL
 from System import *
 
-from Snippets._functions import unit_converter
+from Snippets._query import ElementQuery
+from Snippets._phases import get_phase_resolver
+from Snippets._windows import order_along_boundary
+from Snippets._transaction import BatchTransaction
+from Snippets._writer import ParameterWriter
+from Snippets._trace import logged_run
 
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
+phases = get_phase_resolver(doc)
+with logged_run(__title__):
+    windows = ElementQuery(doc).of_categories(
+        DB.BuiltInCategory.OST_Windows).instances().created_in_phase(phases.new_phase_id).elements()
 
-windows = [window for window in FEC(doc).OfCategory(
-    DB.BuiltInCategory.OST_Windows).WhereElementIsNotElementType() if window.Parameter[
-    DB.BuiltInParameter.PHASE_CREATED].AsValueString() == 'Neu']
+    new_phase = phases.new_phase
+    if len(windows) == 0:
+        print('There are no New Phase window families in the project')
 
-if len(windows) > 0:
-    phase_created = [window.Parameter[DB.BuiltInParameter.PHASE_CREATED].AsElementId() for window in windows]
-    new_phase = doc.GetElement(phase_created[0])
-else:
-    print('There are no New Phase window families in the project')
-
-# print(new_phase)
-
-room_window_count = {}
-
-with DB.Transaction(doc, 'Assign Window Number') as t:
-    t.Start()
+    # windows are numbered per room in the room they open to
+    room_windows = {}
+    rooms = {}
+    unassigned_windows = []
     for window in windows:
-        parameter = window.LookupParameter('H_FE_Fensternummer')
-        
-        if window.ToRoom[new_phase] is not None:
-            room_window = window.ToRoom[new_phase].LookupParameter('H_RA_Raumnummer').AsString()
-            
-            # Check if the room number is already in the dictionary
-            if room_window in room_window_count:
-                # Increment the count and update window number
-                room_window_count[room_window] += 1
-                window_number = '{}.F{:02d}'.format(room_window, room_window_count[room_window])
-            else:
-                # Initialize count and set window number
-                room_window_count[room_window] = 0
-                window_number = room_window + '.F'
-
-            parameter.Set(window_number)
-        else:
-            parameter.Set('')
-            # options = DB.ExternalDefinitionCreationOptions('H_RA_Raumnummer', DB.ParameterType.Text)
-            # options.HideWhenNoValue = True
-            # parameter.ClearValue()
+        room = window.ToRoom[new_phase]
+        if room is None:
+            unassigned_windows.append(window)
+            continue
+        rooms[room.Id.IntegerValue] = room
+        room_windows.setdefault(room.Id.IntegerValue, []).append(window)
 
-            # options.HideWhenNoValue = False
-    print('Numbers are generated')
-    t.Commit()
\ No newline at end of file
+    writer = ParameterWriter()
+    with BatchTransaction(doc, 'Assign Window Number') as t:
+        for room_id, windows_in_room in room_windows.items():
+            room = rooms[room_id]
+            room_window = room.LookupParameter('H_RA_Raumnummer').AsString()
+            if not room_window:
+                unassigned_windows.extend(windows_in_room)
+                continue
+            # clockwise along the room boundary, so numbers are reproducible
+            ordered_windows = order_along_boundary(room, windows_in_room)
+            for index, window in enumerate(ordered_windows):
+                window_number = room_window + '.F' if index == 0 \
+                    else '{}.F{:02d}'.format(room_window, index)
+                writer.set(window, 'H_FE_Fensternummer', window_number)
+        for window in unassigned_windows:
+            writer.set(window, 'H_FE_Fensternummer', '')
+        print('Numbers are generated')
+    writer.print_report()
+    t.report.print_report()
\ No newline at end of file
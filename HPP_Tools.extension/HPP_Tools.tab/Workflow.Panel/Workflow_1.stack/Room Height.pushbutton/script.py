@@ -16,23 +16,27 @@ the heights in the generated schedule
 named "Raumhöhe Check.".
 ___________________________________________________________
 How-to:
-Press the button.
+Press the button. The heights are computed in the 
+background while you keep working, a status panel shows 
+the progress and allows to cancel. The heights are 
+applied at the end in one short transaction.
+Shift+Click to run in the foreground. The rooms are 
+then processed in chunks. If the run is cancelled, the processed chunks are kept and the next run 
+offers to resume from there. The chunk size is the 
+'chunk_size' option of the HPP_Tools section in the 
+pyRevit config.
 ___________________________________________________________
 Prerequisite:
 Not applicable to the rooms with a complex ceiling geometry.
 ___________________________________________________________
 """
+__persistentengine__ = True
+
 import sys
-import clr
 
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
+from Snippets._bootstrap import bootstrap
+bootstrap()
 
-clr.AddReference('RevitAPI')
 from Autodesk.Revit.DB import *
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
@@ -40,235 +44,260 @@ from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from System import *
 
 import pyrevit
-from pyrevit.forms import ProgressBar
 
 from Snippets._functions import unit_converter, get_room_boundary
+from Snippets._query import ElementQuery
+from Snippets._phases import get_phase_resolver
+from Snippets._chunked import ChunkedRun, ask_resume
+from Snippets._transaction import BatchTransaction
+from Snippets._scheduler import IdleJob, start_in_background
+from Snippets._trace import logged_run, traced
 
 # uiapp = __revit__
 doc = __revit__.ActiveUIDocument.Document
 # uidoc = __revit__.ActiveUIDocument
 app = __revit__.Application
+phases = get_phase_resolver(doc)
+with logged_run(__title__):
+    # excluding staircases from the room list
+    rooms = ElementQuery(doc).of_categories(
+        DB.BuiltInCategory.OST_Rooms).instances().room_phase(phases.new_phase_id).parameter_not_contains(
+        DB.BuiltInParameter.ROOM_NAME, 'Treppenhaus', 'Treppe', 'TH', 'TRH', 'chacht').elements()
 
-# excluding staircases from the room list
-rooms = []
-for room in FEC(doc).OfCategory(DB.BuiltInCategory.OST_Rooms).ToElements():
-    if room.Parameter[DB.BuiltInParameter.ROOM_PHASE].AsValueString() == 'Neu':
-        if 'Treppenhaus' not in room.Parameter[DB.BuiltInParameter.ROOM_NAME].AsString() and \
-            'Treppe' not in room.Parameter[DB.BuiltInParameter.ROOM_NAME].AsString() and \
-            'TH' not in room.Parameter[DB.BuiltInParameter.ROOM_NAME].AsString() and \
-            'TRH' not in room.Parameter[DB.BuiltInParameter.ROOM_NAME].AsString() and \
-            'chacht' not in room.Parameter[DB.BuiltInParameter.ROOM_NAME].AsString():
-            rooms.append(room)
-
-# for room in rooms:
-#     print(room.Parameter[DB.BuiltInParameter.ROOM_NAME].AsString())
-
-# switch on the volume calculation in rooms
-with DB.Transaction(doc, 'Set area and volume calculation to True') as t:
-    t.Start()
-    settings = AreaVolumeSettings.GetAreaVolumeSettings(doc)
-    settings.ComputeVolumes = True
-    settings.SetSpatialElementBoundaryLocation(SpatialElementBoundaryLocation.Finish, SpatialElementType.Room)  
-    t.Commit()
-
-# apply the height to room, so it will cross the upper border
-with DB.Transaction(doc, 'Change room height') as t:
-    t.Start()
-    for room in rooms:
-        height_parameter = room.Parameter[DB.BuiltInParameter.ROOM_UPPER_OFFSET]
-        height_parameter.Set(unit_conventer(doc, 7, to_internal=True))
-    t.Commit()
-
-options = SpatialElementBoundaryOptions()
-boundloc = AreaVolumeSettings.GetAreaVolumeSettings(doc).GetSpatialElementBoundaryLocation(SpatialElementType.Room)
-options.SpatialElementBoundaryLocation = boundloc
-
-# get all bounding room geometries
-element_list = []
-curve_list = []
-room_element_list = []
-with ProgressBar(cancellable=True) as pb:
-    try:
-        error_report = None
-        if isinstance(rooms, list):
-            for room, counter in zip(rooms, range(len(rooms))):
-                element_list.append(get_room_boundary(doc, room, options)[0])
-                curve_list.append(get_room_boundary(doc, room, options)[1])
-                room_element_list.append([room, get_room_boundary(doc, room, options)[0]])
-                pb.update_progress(counter, len(rooms))
-                
-                if pb.cancelled:
-                    cancelled = True
-                    break
-        else:
-            element_list = get_room_boundary(doc, rooms, options)[0]
-            curve_list = get_room_boundary(doc, rooms, options)[1]
-            room_element_list.append([room, element_list])
-    except:
-    # if error accurs anywhere in the process catch it
-        import traceback
-        error_report = traceback.format_exc()
-
-# sort only floors and ceilings
-floors_ceilings = []
-
-for room in rooms:
-    if room.LookupParameter('H_RA_lichte_Höhe') == None:
-        print('Please apply parameter "H_RA_lichte_Höhe" to room!')
-        break
-
-# for room in rooms:
-#     if room.LookupParameter('H_RA_lichte_Höhe') == None:
-#         raise Exception ('Please apply parameter "H_RA_lichte_Höhe" to rooms!')
-
-cancelled = False
-
-with DB.Transaction(doc, 'Apply heights') as t:
-    t.Start()
-
-    with ProgressBar(cancellable=True) as pb:
-    # for element, counter in zip(elements, range(0, len(elements))):
-        for i in range(len(room_element_list)):
-            # get room parameters
-            if room_element_list[i][0].LookupParameter('H_RA_lichte_Höhe') != None:
-                l_H_parameter = room_element_list[i][0].LookupParameter('H_RA_lichte_Höhe')
-                room_height_parameter = room_element_list[i][0].Parameter[DB.BuiltInParameter.ROOM_UPPER_OFFSET]
-                
-                # variable for collecting ceilings and floors only
-                f_c = []
-                cat_name = []
-                for elem in room_element_list[i][1]:
-                    if elem != None:
-                        cat_name.append(elem.Category.Name)
-                if 'Roofs' not in cat_name:
-                    for el in room_element_list[i][1]:
-                        if el != None:
-                            if el.Category.Name == 'Floors' or el.Category.Name == 'Ceilings':
-                                f_c.append(el)
-                # take only rooms that have more then one ceiling/floor element
-                    if len(f_c)>1:
-                # list contains room Id and upper/lower border
-                        floors_ceilings.append([room_element_list[i][0].Id, f_c])
-                        # print(floors_ceilings)
-                        height_sum = 0
-                        count = 0
-                        upper_border = []
-                        lower_border = []
-                        room_h_to_apply = []
-                        room_h_number = []
-                # calculate the heights
-                        for element in f_c:
-                            count += 1
-                # rules to calculate height for floor type. if floor belongs to room level
-                            if element.Category.Name == 'Floors':
-                                if room_element_list[i][0].Parameter[
-                                    DB.BuiltInParameter.ROOM_LEVEL_ID].AsElementId() == element.Parameter[
-                                    DB.BuiltInParameter.LEVEL_PARAM].AsElementId():
-                                    par_height = element.Parameter[DB.BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM].AsDouble()
-                # and if floor doesn`t belong to room level
-                                else:
-                                    par_height = element.Parameter[
-                                        DB.BuiltInParameter.STRUCTURAL_ELEVATION_AT_TOP].AsDouble() - doc.GetElement(
-                                        room_element_list[i][0].Parameter[
-                                        DB.BuiltInParameter.ROOM_LEVEL_ID].AsElementId()).Parameter[
-                                        DB.BuiltInParameter.LEVEL_ELEV].AsDouble()
-                # height from ceiling
-                            elif element.Category.Name == 'Ceilings':
-                                if element.Parameter[DB.BuiltInParameter.CEILING_HEIGHTABOVELEVEL_PARAM] != None:
-                                    par_height = element.Parameter[DB.BuiltInParameter.CEILING_HEIGHTABOVELEVEL_PARAM].AsDouble()
-                # separate floors and ceilings for upper and lower border by camparing with a mean height
-                            height_sum += par_height
-                            middle = height_sum / count
-                            # print(middle)
-                            if par_height > middle:
-                                if element.Category.Name == 'Floors':
-                                    upper_border.append(par_height - element.Parameter[
-                                        DB.BuiltInParameter.FLOOR_ATTR_THICKNESS_PARAM].AsDouble())
-                                    # print(upper_border)
-                                else:
-                                    upper_border.append(par_height)
-                            else:
-                                lower_border.append(par_height)
-                        # print(room_element_list[i][0].Id)
-                        # print(upper_border, lower_border)
-                # variable max_height to apply to room limit border
-                        max_height = None
-                # applying parameters only for rooms with one lower border element
-                        if len(lower_border) == 1:
-                            for up_element in upper_border:
-                                room_height = unit_conventer(doc,(up_element - lower_border[0]))
-                                if str(room_height) not in room_h_to_apply:
-                                    room_h_to_apply.append(str(room_height))
-                                room_h_number.append(up_element - lower_border[0])
-                                max_height = max(room_h_number)
-                # re-apply room height param
-                                """
-                                Script needs changes in case several level combination on one floor to be used!
-                                Parameter Limit Offset, room_height_parameter.Set(max_height) should be set to Zero!
-                                """
-                                room_height_parameter.Set(max_height)
-                # apply room heights in text param
-                        if l_H_parameter != None:
-                            string_param = ', '.join(room_h_to_apply)
-                            l_H_parameter.Set(string_param)
-            pb.update_progress(i, len(room_element_list))
-        
-            if pb.cancelled:
-                cancelled = True
-                break
-
-    if cancelled:
-        print('Operation is cancelled!')
-    t.Commit()
-
-rooms_no_parameter_applied = []
-
-for room in rooms:
-    if room.LookupParameter('H_RA_lichte_Höhe') != None:
-        if room.LookupParameter('H_RA_lichte_Höhe').AsString() == '' or room.LookupParameter('H_RA_lichte_Höhe').AsString() == None:
-            rooms_no_parameter_applied.append(room)
-
-# create schedule
-if len(rooms_no_parameter_applied) > 0:
-    with DB.Transaction(doc, 'Create list "Raumhöhe Check"') as t:
+    # for room in rooms:
+    #     print(room.Parameter[DB.BuiltInParameter.ROOM_NAME].AsString())
+
+    # switch on the volume calculation in rooms
+    with DB.Transaction(doc, 'Set area and volume calculation to True') as t:
         t.Start()
-        if len([item for item in FEC(doc).OfClass(DB.ViewSchedule).ToElements() if item.Name == 'Raumhöhe Check']) > 0:
-            print('Existing schedule "Raumhöhe Check" is modified')
-        else:
-            room_schedule = DB.ViewSchedule.CreateSchedule(
-                            doc,
-                            DB.ElementId(DB.BuiltInCategory.OST_Rooms)
-                        )
-            room_schedule.Name = 'Raumhöhe Check'
-            s_definition = room_schedule.Definition
-            # add schedule fields
-            room_field = s_definition.AddField(
-               DB.ScheduleFieldType.Instance,
-                DB.ElementId(
-                    DB.BuiltInParameter.ROOM_NAME
-                )
-            )
-            room_param_id = []
+        settings = AreaVolumeSettings.GetAreaVolumeSettings(doc)
+        settings.ComputeVolumes = True
+        settings.SetSpatialElementBoundaryLocation(SpatialElementBoundaryLocation.Finish, SpatialElementType.Room)  
+        t.Commit()
+
+    for room in rooms:
+        if room.LookupParameter('H_RA_lichte_Höhe') == None:
+            print('Please apply parameter "H_RA_lichte_Höhe" to room!')
+            break
+
+    options = SpatialElementBoundaryOptions()
+    boundloc = AreaVolumeSettings.GetAreaVolumeSettings(doc).GetSpatialElementBoundaryLocation(SpatialElementType.Room)
+    options.SpatialElementBoundaryLocation = boundloc
+
+
+    @traced('read boundaries')
+    def read_boundaries(rooms, report):
+        # raise the rooms, so they cross the upper border, read the bounding
+        # elements and roll the raise back, the model is not changed
+        boundaries = {}
+        raised_offset = unit_converter(doc, 7, to_internal=True)
+        with BatchTransaction(doc, 'Read room boundaries', report, roll_back=True):
+            for room in rooms:
+                room.Parameter[DB.BuiltInParameter.ROOM_UPPER_OFFSET].Set(raised_offset)
+            doc.Regenerate()
             for room in rooms:
-                if room.LookupParameter('H_RA_lichte_Höhe') != None:
-                    room_param_id.append(room.LookupParameter('H_RA_lichte_Höhe').Id)
+                boundaries[room.Id.IntegerValue] = get_room_boundary(doc, room, options)[0]
+        return boundaries
+
+
+    @traced('compute height')
+    def compute_height(room, boundary):
+        """
+        Get the limit offset and the 'H_RA_lichte_Höhe' text of the room
+        from its bounding floors and ceilings, None where nothing is set
+        """
+        if room.LookupParameter('H_RA_lichte_Höhe') == None:
+            return None, None
+
+        # variable for collecting ceilings and floors only
+        f_c = []
+        cat_name = []
+        for elem in boundary:
+            if elem != None:
+                cat_name.append(elem.Category.Name)
+        if 'Roofs' in cat_name:
+            return None, None
+        for el in boundary:
+            if el != None:
+                if el.Category.Name == 'Floors' or el.Category.Name == 'Ceilings':
+                    f_c.append(el)
+        # take only rooms that have more then one ceiling/floor element
+        if len(f_c) <= 1:
+            return None, None
+
+        height_sum = 0
+        count = 0
+        upper_border = []
+        lower_border = []
+        room_h_to_apply = []
+        room_h_number = []
+        # calculate the heights
+        for element in f_c:
+            count += 1
+            # rules to calculate height for floor type. if floor belongs to room level
+            if element.Category.Name == 'Floors':
+                if room.Parameter[
+                    DB.BuiltInParameter.ROOM_LEVEL_ID].AsElementId() == element.Parameter[
+                    DB.BuiltInParameter.LEVEL_PARAM].AsElementId():
+                    par_height = element.Parameter[DB.BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM].AsDouble()
+                # and if floor doesn`t belong to room level
+                else:
+                    par_height = element.Parameter[
+                        DB.BuiltInParameter.STRUCTURAL_ELEVATION_AT_TOP].AsDouble() - doc.GetElement(
+                        room.Parameter[
+                        DB.BuiltInParameter.ROOM_LEVEL_ID].AsElementId()).Parameter[
+                        DB.BuiltInParameter.LEVEL_ELEV].AsDouble()
+            # height from ceiling
+            elif element.Category.Name == 'Ceilings':
+                if element.Parameter[DB.BuiltInParameter.CEILING_HEIGHTABOVELEVEL_PARAM] != None:
+                    par_height = element.Parameter[DB.BuiltInParameter.CEILING_HEIGHTABOVELEVEL_PARAM].AsDouble()
+            # separate floors and ceilings for upper and lower border by camparing with a mean height
+            height_sum += par_height
+            middle = height_sum / count
+            if par_height > middle:
+                if element.Category.Name == 'Floors':
+                    upper_border.append(par_height - element.Parameter[
+                        DB.BuiltInParameter.FLOOR_ATTR_THICKNESS_PARAM].AsDouble())
                 else:
-                    pass
-            fussboden_field = s_definition.AddField(
-               DB.ScheduleFieldType.Instance,
-                room_param_id[0]
-            )
+                    upper_border.append(par_height)
+            else:
+                lower_border.append(par_height)
 
-        t.Commit()
-else:
-    if room.LookupParameter('H_RA_lichte_Höhe') != None:
-        print('Parameter Raumhöhe is applied.')
-if room.LookupParameter('H_RA_lichte_Höhe') != None:
-    print('Please check room heights in schedule "Raumhöhe Check"!')
+        # variable max_height to apply to room limit border
+        max_height = None
+        # applying parameters only for rooms with one lower border element
+        if len(lower_border) == 1:
+            for up_element in upper_border:
+                room_height = unit_converter(doc, (up_element - lower_border[0]))
+                if str(room_height) not in room_h_to_apply:
+                    room_h_to_apply.append(str(room_height))
+                room_h_number.append(up_element - lower_border[0])
+                """
+                Script needs changes in case several level combination on one floor to be used!
+                Parameter Limit Offset, room_height_parameter.Set(max_height) should be set to Zero!
+                """
+                max_height = max(room_h_number)
+        return max_height, ', '.join(room_h_to_apply)
 
-"""
-Script needs changes in case several level combination on one floor to be used!
-Parameter Limit Offset, room_height_parameter.Set(max_height) should be set to Zero!
-"""
 
+    def set_height(room, max_height, room_heights):
+        # re-apply room height param
+        if max_height is not None:
+            room.Parameter[DB.BuiltInParameter.ROOM_UPPER_OFFSET].Set(max_height)
+        # apply room heights in text param
+        if room_heights is not None:
+            room.LookupParameter('H_RA_lichte_Höhe').Set(room_heights)
+
+
+    @traced('schedule')
+    def create_schedule(messages):
+        # has to be called inside a transaction
+        rooms_left = [room for room in rooms if room.IsValidObject]
+        has_parameter = any(room.LookupParameter('H_RA_lichte_Höhe') != None for room in rooms_left)
+        rooms_no_parameter_applied = []
+
+        for room in rooms_left:
+            if room.LookupParameter('H_RA_lichte_Höhe') != None:
+                if room.LookupParameter('H_RA_lichte_Höhe').AsString() == '' or room.LookupParameter('H_RA_lichte_Höhe').AsString() == None:
+                    rooms_no_parameter_applied.append(room)
+
+        # create schedule
+        if len(rooms_no_parameter_applied) > 0:
+            if len([item for item in FEC(doc).OfClass(DB.ViewSchedule).ToElements() if item.Name == 'Raumhöhe Check']) > 0:
+                messages.append('Existing schedule "Raumhöhe Check" is modified')
+            else:
+                room_schedule = DB.ViewSchedule.CreateSchedule(
+                                doc,
+                                DB.ElementId(DB.BuiltInCategory.OST_Rooms)
+                            )
+                room_schedule.Name = 'Raumhöhe Check'
+                s_definition = room_schedule.Definition
+                # add schedule fields
+                room_field = s_definition.AddField(
+                   DB.ScheduleFieldType.Instance,
+                    DB.ElementId(
+                        DB.BuiltInParameter.ROOM_NAME
+                    )
+                )
+                room_param_id = []
+                for room in rooms_left:
+                    if room.LookupParameter('H_RA_lichte_Höhe') != None:
+                        room_param_id.append(room.LookupParameter('H_RA_lichte_Höhe').Id)
+                fussboden_field = s_definition.AddField(
+                   DB.ScheduleFieldType.Instance,
+                    room_param_id[0]
+                )
+
+        elif has_parameter:
+            messages.append('Parameter Raumhöhe is applied.')
+        if has_parameter:
+            messages.append('Please check room heights in schedule "Raumhöhe Check"!')
+
+
+    class RoomHeightJob(IdleJob):
+        """Compute the room heights in the background"""
+        title = 'Room Height'
+        # rooms raised and read in one rolled back transaction
+        batch_size = 20
+
+        def __init__(self, doc, rooms):
+            IdleJob.__init__(self, doc)
+            self.room_ids = [room.Id for room in rooms]
+            self.total = len(self.room_ids)
+            self.heights = {}
+
+        def steps(self):
+            for start in range(0, self.total, self.batch_size):
+                batch = self.room_ids[start:start + self.batch_size]
+                rooms = [room for room in (self.get_element(room_id) for room_id in batch)
+                         if room is not None]
+                # get all bounding room geometries
+                boundaries = read_boundaries(rooms, self.report)
+                for room in rooms:
+                    self.heights[room.Id.IntegerValue] = compute_height(
+                        room, boundaries[room.Id.IntegerValue])
+                self.done += len(batch)
+                yield
+
+        def apply(self):
+            # heights and schedule in one transaction
+            with BatchTransaction(self.doc, 'Apply heights', self.report) as t:
+                for room_id in self.room_ids:
+                    room = self.get_element(room_id)
+                    if room is not None and room_id.IntegerValue in self.heights:
+                        t.attempt(set_height, room, *self.heights[room_id.IntegerValue])
+                create_schedule(self.messages)
+
+
+    if __shiftclick__:
+        run = ChunkedRun(doc, 'Room Height')
+        ask_resume(run)
+
+        # bounding elements of the rooms of the current chunk
+        room_boundaries = {}
+
+        def prepare_rooms(chunk):
+            # get all bounding room geometries
+            room_boundaries.clear()
+            room_boundaries.update(read_boundaries(chunk, run.report))
+
+        def apply_height(transaction, room):
+            set_height(room, *compute_height(room, room_boundaries[room.Id.IntegerValue]))
+
+        run.run(rooms, apply_height, prepare_chunk=prepare_rooms, name='Apply heights')
+
+        messages = []
+        if run.is_complete:
+            with BatchTransaction(doc, 'Apply heights', run.report):
+                run.clear()
+                create_schedule(messages)
+        run.print_status()
+        for message in messages:
+            print(message)
+    else:
+        start_in_background(__revit__, RoomHeightJob(doc, rooms))
 
+    """
+    Script needs changes in case several level combination on one floor to be used!
+    Parameter Limit Offset, room_height_parameter.Set(max_height) should be set to Zero!
+    """
\ No newline at end of file
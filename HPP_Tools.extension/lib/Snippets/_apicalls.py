@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+try:
+    import __builtin__ as builtins
+except ImportError:
+    import builtins
+
+import clr
+clr.AddReference('RevitAPI')
+clr.AddReference('RevitAPIUI')
+from Autodesk.Revit import DB, UI
+
+from Snippets._config import get_option
+
+API_CALLS_OPTION = 'count_api_calls'
+# comma separated API members counted on proxies, e.g. 'GetElement, Symbol'
+MEMBERS_OPTION = 'api_call_members'
+# members read with an index, e.g. door.ToRoom[phase]
+INDEXED_MEMBERS = ('Parameter', 'ToRoom', 'FromRoom', 'Room', 'Space',
+                   'BoundingBox')
+# objects handed out as proxies while members are counted
+PROXIED_TYPES = (DB.Document, DB.Element, DB.Parameter, UI.UIDocument)
+
+_clock = getattr(time, 'perf_counter', None) or time.clock
+
+
+def is_enabled():
+    return bool(get_option(API_CALLS_OPTION, False))
+
+
+def get_members():
+    """Get the API members counted on proxies, empty if none are set"""
+    members = get_option(MEMBERS_OPTION, None) or ()
+    if not isinstance(members, (list, tuple)):
+        members = members.split(',')
+    return frozenset(member.strip() for member in members if member.strip())
+
+
+class ApiCallCounter(object):
+    """
+    Count and time the calls of the Snippets helpers working with the
+    Revit API, e.g. ElementQuery.elements or ParameterWriter.set, and
+    the reads of the API members set by the 'api_call_members' option,
+    e.g. FamilyInstance.LookupParameter. Helpers calling other helpers
+    are timed including them.
+    """
+    def __init__(self, members=()):
+        self.members = frozenset(members)
+        self.stats = {}
+
+    def add(self, key, seconds):
+        stat = self.stats.get(key)
+        if stat is None:
+            self.stats[key] = [1, seconds]
+        else:
+            stat[0] += 1
+            stat[1] += seconds
+
+    @property
+    def calls(self):
+        return sum(count for count, _ in self.stats.values())
+
+    def hot_calls(self):
+        """Get (call, calls, seconds) sorted by the time spent"""
+        return sorted(((key, count, seconds)
+                       for key, (count, seconds) in self.stats.items()),
+                      key=lambda stat: (-stat[2], -stat[1], stat[0]))
+
+    def print_report(self, limit=25):
+        hot_calls = self.hot_calls()
+        if not hot_calls:
+            return
+        print('***')
+        print('Revit API calls:')
+        print('{:<44} {:>10} {:>11} {:>10}'.format(
+            'call', 'calls', 'total ms', 'mean us'))
+        for key, count, seconds in hot_calls[:limit]:
+            print('{:<44} {:>10} {:>11.1f} {:>10.1f}'.format(
+                key, count, seconds * 1e3, seconds * 1e6 / count))
+        if len(hot_calls) > limit:
+            print('... {} more calls'.format(len(hot_calls) - limit))
+
+
+# working with the run of the current script
+
+_counter = None
+
+
+def get_counter():
+    """Get the counter of the current run or None if counting is off"""
+    return _counter
+
+
+def start_counting():
+    """
+    Count the API calls of the run starting now, if switched on. While
+    API members are counted __revit__ is a proxy, so the document a
+    script gets from it counts them, until stop_counting().
+    """
+    global _counter
+    _counter = ApiCallCounter(get_members()) if is_enabled() else None
+    revit = getattr(builtins, '__revit__', None)
+    if _counter is not None and _counter.members and revit is not None:
+        builtins.__revit__ = CountedObject(unwrap(revit))
+    return _counter
+
+
+def stop_counting():
+    """Unwrap __revit__ again, the counter keeps the calls of the run"""
+    revit = getattr(builtins, '__revit__', None)
+    if type(revit) is CountedObject:
+        builtins.__revit__ = unwrap(revit)
+
+
+def counted(name=None):
+    """
+    Decorator counting and timing every call of an API helper while
+    API calls are counted. Without counting it only checks the counter.
+    """
+    def decorator(function):
+        key = name or function.__name__
+
+        def wrapper(*args, **kwargs):
+            if _counter is None:
+                return function(*args, **kwargs)
+            start = _clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _counter.add(key, _clock() - start)
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+    return decorator
+
+
+# working with the proxies of API objects
+
+def _add(key, start):
+    if _counter is not None:
+        _counter.add(key, _clock() - start)
+
+
+def _is_counted(name):
+    return _counter is not None and name in _counter.members
+
+
+class _CountedCall(object):
+    """Method of a proxied object, counted if its member is"""
+    def __init__(self, key, method):
+        self._key = key
+        self._method = method
+
+    def __call__(self, *args, **kwargs):
+        args = [unwrap(arg) for arg in args]
+        start = _clock()
+        try:
+            return count_members(self._method(*args, **kwargs))
+        finally:
+            if self._key is not None:
+                _add(self._key, start)
+
+    def __getitem__(self, index):
+        # indexed properties the API has as callable indexers
+        return count_members(self._method[unwrap(index)])
+
+
+class _CountedIndexer(object):
+    """Indexed property of a proxied object, counted when indexed"""
+    def __init__(self, key, indexer):
+        self._key = key
+        self._indexer = indexer
+
+    def __getitem__(self, index):
+        start = _clock()
+        try:
+            return count_members(self._indexer[unwrap(index)])
+        finally:
+            _add(self._key, start)
+
+    def __setitem__(self, index, value):
+        self._indexer[unwrap(index)] = unwrap(value)
+
+    def __getattr__(self, name):
+        # the member was read without an index
+        return getattr(self._indexer, name)
+
+
+class CountedObject(object):
+    """
+    Proxy of a document, element or parameter counting and timing the
+    reads of the API members set by the 'api_call_members' option.
+    Methods are timed when they are called, indexed properties when
+    they are indexed. Documents, elements and parameters got through the
+    proxy are proxies as well, arguments are unwrapped for the API.
+    isinstance() and comparisons see the proxied object.
+    """
+    __slots__ = ('_target',)
+
+    def __init__(self, target):
+        object.__setattr__(self, '_target', target)
+
+    @property
+    def __class__(self):
+        return type(self._target)
+
+    def __getattr__(self, name):
+        target = object.__getattribute__(self, '_target')
+        key = '{}.{}'.format(type(target).__name__, name) \
+            if _is_counted(name) else None
+        start = _clock()
+        value = getattr(target, name)
+        if key is not None and name in INDEXED_MEMBERS:
+            return _CountedIndexer(key, value)
+        # events are left alone, handlers are added with +=
+        if callable(value) and not hasattr(value, '__iadd__') and \
+                not isinstance(value, type):
+            return _CountedCall(key, value)
+        if key is not None:
+            _add(key, start)
+        return count_members(value)
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, unwrap(value))
+
+    def __eq__(self, other):
+        return self._target == unwrap(other)
+
+    def __ne__(self, other):
+        return self._target != unwrap(other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self):
+        return repr(self._target)
+
+    def __str__(self):
+        return str(self._target)
+
+
+def count_members(value):
+    """
+    Get a proxy of the document, element or parameter counting the
+    reads of API members while they are counted, else the value itself.
+    """
+    if _counter is None or not _counter.members or \
+            type(value) is CountedObject or \
+            not isinstance(value, PROXIED_TYPES):
+        return value
+    return CountedObject(value)
+
+
+def unwrap(value):
+    """Get the object behind a proxy, any other value as it is"""
+    if type(value) is CountedObject:
+        return object.__getattribute__(value, '_target')
+    return value
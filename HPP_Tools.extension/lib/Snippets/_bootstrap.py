@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import clr
+
+# high resolution clock, time.clock on IronPython 2.7
+_clock = getattr(time, 'perf_counter', None) or time.clock
+
+_started = None
+_dynamo = None
+
+
+def bootstrap():
+    """
+    Load the Revit API assemblies of a button and start the clock of its
+    startup, which ends with logged_run. Called first in the script, it
+    also starts counting API calls before the script reads __revit__.
+    The Dynamo assemblies take seconds on a cold Revit session, they are
+    loaded by load_dynamo() when a tool really converts geometry.
+    """
+    global _started
+    _started = _clock()
+    clr.AddReference('RevitAPI')
+    clr.AddReference('RevitAPIUI')
+    from Snippets._apicalls import start_counting
+    start_counting()
+
+
+def pop_started():
+    """Get the clock value of the last bootstrap() once, else None"""
+    global _started
+    started, _started = _started, None
+    return started
+
+
+def load_dynamo():
+    """
+    Load ProtoGeometry, RevitNodes and RevitServices on first use and
+    get the Revit namespace of RevitNodes. Extension methods are imported
+    per module, so the caller imports the ones it uses, e.g.
+        clr.ImportExtensions(load_dynamo().GeometryConversion)
+    """
+    global _dynamo
+    if _dynamo is None:
+        from Snippets._trace import span
+        with span('load dynamo'):
+            clr.AddReference('ProtoGeometry')
+            clr.AddReference('RevitServices')
+            clr.AddReference('RevitNodes')
+            import Revit
+        _dynamo = Revit
+    return _dynamo
\ No newline at end of file
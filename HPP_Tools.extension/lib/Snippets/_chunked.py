@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+import copy
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+
+from pyrevit import forms
+
+from Snippets._config import get_option
+from Snippets._progress import ProgressReporter
+from Snippets._storage import JsonStorage
+from Snippets._telemetry import count
+from Snippets._trace import span
+from Snippets._transaction import BatchTransaction, FailureReport, SKIPPED
+
+CHECKPOINT_STORAGE = JsonStorage(
+    'b7a41d2e-5c83-4f6a-9e1b-0d2c7f8a3e54', 'HPP_Checkpoint',
+    'Checkpoints of interrupted HPP batch runs')
+
+CHUNK_SIZE_OPTION = 'chunk_size'
+DEFAULT_CHUNK_SIZE = 200
+
+
+def get_chunk_size():
+    """Get the chunk size from the user config"""
+    try:
+        return max(1, int(get_option(CHUNK_SIZE_OPTION, DEFAULT_CHUNK_SIZE)))
+    except (TypeError, ValueError):
+        return DEFAULT_CHUNK_SIZE
+
+
+# working with the stored checkpoints
+
+def load_checkpoints(doc):
+    """Get the stored checkpoints of all tools"""
+    return CHECKPOINT_STORAGE.load(doc)
+
+
+def save_checkpoints(doc, checkpoints):
+    """Store the checkpoints, has to be called inside a transaction"""
+    CHECKPOINT_STORAGE.save(doc, checkpoints)
+
+
+# working with chunked runs
+
+class ChunkedRun(object):
+    """
+    Run a batch operation in chunks of elements.
+
+    Every chunk is committed in its own BatchTransaction inside one
+    TransactionGroup, so the run is still undone in one step and the
+    undo stack of a transaction stays bounded by the chunk size.
+    Elements are processed in the order of their ids, so the checkpoint
+    is the id of the last processed element (and optional data of the
+    tool). It is stored in the project with each chunk, in the same
+    transaction, so it always matches the model and costs the same for
+    every chunk. A cancelled run keeps its committed chunks and the next
+    run resumes from the checkpoint. A chunk rolled back by an error that
+    cannot be resolved is split in halves and run again, an element that
+    is still rolled back on its own is skipped and listed in the report.
+
+    Example:
+        run = ChunkedRun(doc, 'Join Intersected')
+        ask_resume(run)
+        if run.run(elements, process):
+            with BatchTransaction(doc, 'Join Intersected') as t:
+                run.clear()
+    """
+    def __init__(self, doc, tool, chunk_size=None, report=None):
+        self.doc = doc
+        self.tool = tool
+        self.chunk_size = chunk_size or get_chunk_size()
+        self.report = report or FailureReport()
+        checkpoint = load_checkpoints(doc).get(tool, {})
+        self.last_id = checkpoint.get('last_id')
+        self.done = checkpoint.get('done', 0)
+        self.data = checkpoint.get('data', {})
+        self.has_checkpoint = bool(checkpoint)
+        self.skipped = []
+        self.cancelled = False
+        self.is_complete = False
+
+    def restart(self):
+        """Forget the checkpoint, the run starts from zero"""
+        self.last_id = None
+        self.done = 0
+        self.data = {}
+
+    def pending(self, elements):
+        """Get the elements not processed yet, ordered by their ids"""
+        pending = sorted(elements, key=lambda element: element.Id.IntegerValue)
+        if self.last_id is None:
+            return pending
+        return [element for element in pending
+                if element.Id.IntegerValue > self.last_id]
+
+    def _save(self, last_id, done):
+        checkpoints = load_checkpoints(self.doc)
+        if last_id is None:
+            checkpoints.pop(self.tool, None)
+        else:
+            checkpoints[self.tool] = {
+                'last_id': last_id, 'done': done, 'data': self.data}
+        save_checkpoints(self.doc, checkpoints)
+
+    def _run_chunk(self, chunk, process, finish_chunk, name, progress):
+        done = 0
+        progress_done = progress.done
+        # the data of a rolled back chunk is dropped
+        data = copy.deepcopy(self.data)
+        with BatchTransaction(self.doc, name, self.report) as t:
+            for element in chunk:
+                process(t, element)
+                done += 1
+                progress.update()
+                if progress.cancelled:
+                    self.cancelled = True
+                    break
+            if done:
+                if finish_chunk is not None:
+                    finish_chunk(chunk[:done])
+                self._save(chunk[done - 1].Id.IntegerValue, self.done + done)
+        if not t.is_committed:
+            self.data = data
+            progress.update(progress_done)
+        elif done:
+            self.last_id = chunk[done - 1].Id.IntegerValue
+            self.done += done
+            count('processed', done)
+        return t.is_committed
+
+    def _skip(self, element, progress):
+        """Step over an element that is rolled back on its own"""
+        self.skipped.append(element.Id.IntegerValue)
+        self.report.add('Error', 'The element could not be processed',
+                        SKIPPED, [element.Id])
+        # saved with the next committed chunk
+        self.last_id = element.Id.IntegerValue
+        progress.update(progress.done + 1)
+
+    def run(self, elements, process, prepare_chunk=None, finish_chunk=None,
+            name=None):
+        """
+        Process the pending elements chunk by chunk.
+        process - called with the BatchTransaction and each element
+        prepare_chunk - optional, called with each chunk before its
+        transaction starts, e.g. to read data the chunk needs
+        finish_chunk - optional, called with the processed elements of
+        each chunk in its transaction, before the checkpoint is saved,
+        e.g. to put the results of the chunk into data
+        Returns True if all elements are processed or skipped.
+        """
+        name = name or self.tool
+        pending = self.pending(elements)
+        chunks = [pending[start:start + self.chunk_size]
+                  for start in range(0, len(pending), self.chunk_size)]
+        # chunks still to run with their number, the next one last
+        stack = [(index, chunk) for index, chunk in enumerate(chunks)]
+        stack.reverse()
+        group = DB.TransactionGroup(self.doc, name)
+        group.Start()
+        try:
+            with ProgressReporter(len(pending), name) as progress:
+                while stack:
+                    index, chunk = stack.pop()
+                    with span('chunk', index=index, size=len(chunk)):
+                        if prepare_chunk is not None:
+                            with span('prepare chunk'):
+                                prepare_chunk(chunk)
+                        committed = self._run_chunk(
+                            chunk, process, finish_chunk,
+                            '{} ({}/{})'.format(name, index + 1, len(chunks)),
+                            progress)
+                    if self.cancelled:
+                        break
+                    if committed:
+                        continue
+                    # narrow the rolled back chunk down to its failing elements
+                    if len(chunk) > 1:
+                        half = (len(chunk) + 1) // 2
+                        stack.append((index, chunk[half:]))
+                        stack.append((index, chunk[:half]))
+                    else:
+                        self._skip(chunk[0], progress)
+            self.is_complete = not self.pending(elements)
+        finally:
+            # committed chunks are kept, the checkpoint matches them
+            group.Assimilate()
+        return self.is_complete
+
+    def clear(self):
+        """
+        Remove the checkpoint of a complete run.
+        Has to be called inside a transaction.
+        """
+        self._save(None, 0)
+        self.has_checkpoint = False
+
+    def print_status(self):
+        if self.cancelled:
+            print('Operation is cancelled! {} elements are done, the next '
+                  'run resumes from here.'.format(self.done))
+        if self.skipped:
+            print('{} elements could not be processed and were skipped, '
+                  'see the report.'.format(len(self.skipped)))
+        self.report.print_report()
+
+
+def ask_resume(run):
+    """Ask whether an interrupted run is resumed, restart it otherwise"""
+    if not run.has_checkpoint:
+        return False
+    resume = forms.alert(
+        'The last run of "{}" was interrupted after {} elements.\n'
+        'Resume from there?'.format(run.tool, run.done),
+        yes=True, no=True)
+    if not resume:
+        run.restart()
+    return bool(resume)
\ No newline at end of file
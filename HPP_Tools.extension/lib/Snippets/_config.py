@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+from pyrevit.userconfig import user_config
+
+CONFIG_SECTION = 'HPP_Tools'
+
+
+def get_config_section():
+    """Get the HPP_Tools section of the pyRevit user config"""
+    if user_config.has_section(CONFIG_SECTION):
+        return user_config.get_section(CONFIG_SECTION)
+    return user_config.add_section(CONFIG_SECTION)
+
+
+def get_option(option, default=None):
+    return get_config_section().get_option(option, default)
+
+
+def set_option(option, value):
+    """Set the option and save the user config"""
+    get_config_section().set_option(option, value)
+    user_config.save_changes()
\ No newline at end of file
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+
+from Snippets._families import FamilyNameIndex
+from Snippets._phases import get_phase_resolver
+from Snippets._query import ElementQuery
+from Snippets._rules import load_rules
+from Snippets._transaction import BatchTransaction, FailureReport
+from Snippets._writer import ParameterWriter
+
+WINGS = 'Flügelanzahl'
+DOOR_FORM = 'Türform'
+WALL_TYPE = 'Wandart'
+OPENING_WIDTH = 'Maulweite'
+OUTSIDE_DOOR = 'Aussentür'
+OPENING_SIDE = 'DIN-rl'
+WET_ROOM = 'Nassraum'
+
+
+class DoorRecord(object):
+    """
+    Snapshot of a door. Every value is read from the model once, on
+    first access, and shared by all attributes computed for the door.
+    """
+    def __init__(self, door, context):
+        self.door = door
+        self._context = context
+        self._cache = {}
+
+    def _get(self, key, reader):
+        if key not in self._cache:
+            self._cache[key] = reader()
+        return self._cache[key]
+
+    @property
+    def id(self):
+        return self.door.Id
+
+    @property
+    def family_name(self):
+        return self._context.family_names.get(self.door).name
+
+    @property
+    def is_demolished(self):
+        def read():
+            parameter = self.door.Parameter[
+                DB.BuiltInParameter.PHASE_DEMOLISHED]
+            return parameter is not None and \
+                parameter.AsElementId() != DB.ElementId.InvalidElementId
+        return self._get('is_demolished', read)
+
+    @property
+    def host(self):
+        def read():
+            host = self.door.Host
+            return host if isinstance(host, DB.Wall) else None
+        return self._get('host', read)
+
+    @property
+    def from_room(self):
+        return self._get(
+            'from_room', lambda: self.door.FromRoom[self._context.phase])
+
+    @property
+    def to_room(self):
+        return self._get(
+            'to_room', lambda: self.door.ToRoom[self._context.phase])
+
+    @property
+    def room_names(self):
+        def read():
+            return [room.Parameter[DB.BuiltInParameter.ROOM_NAME].AsString()
+                    or '' for room in (self.from_room, self.to_room)
+                    if room is not None]
+        return self._get('room_names', read)
+
+    @property
+    def symbol_function(self):
+        return self._get('symbol_function', lambda: self.door.Symbol.Parameter[
+            DB.BuiltInParameter.FUNCTION_PARAM].AsInteger())
+
+
+class DoorContext(object):
+    """Document wide values shared by all door records of a run"""
+    def __init__(self, doc, phase=None, family_names=None):
+        self.doc = doc
+        self.phase = phase or get_phase_resolver(doc).new_phase
+        self.family_names = family_names or FamilyNameIndex(doc)
+        self._indexes = {}
+
+    def index(self, key, create_index):
+        """Get a document index shared by all doors of the run"""
+        if key not in self._indexes:
+            self._indexes[key] = create_index(self.doc)
+        return self._indexes[key]
+
+
+ATTRIBUTE_NAMES = (
+    WINGS, DOOR_FORM, WALL_TYPE, OPENING_WIDTH,
+    OUTSIDE_DOOR, OPENING_SIDE, WET_ROOM
+)
+
+
+def collect_doors(doc, include_demolished=False):
+    """Get all door instances"""
+    query = ElementQuery(doc).of_categories(
+        DB.BuiltInCategory.OST_Doors).instances()
+    if not include_demolished:
+        query.not_demolished()
+    return query.elements()
+
+
+class DoorAttributePipeline(object):
+    """
+    Compute HPP door attributes for all doors in one pass.
+
+    Every door is read once into a DoorRecord shared by all requested
+    attributes, the values are computed by the evaluator compiled from
+    the rule file and written through a diff-aware writer, so a run that
+    changes nothing writes nothing.
+    """
+    def __init__(self, doc, attributes=ATTRIBUTE_NAMES, phase=None,
+                 rules=None):
+        rules = rules or load_rules()
+        unknown = set(attributes) - set(rules.groups)
+        if unknown:
+            raise ValueError('Unknown door attributes: {}'.format(
+                ', '.join(sorted(unknown))))
+        self.doc = doc
+        self.context = DoorContext(
+            doc, phase, rules.family_name_index(doc))
+        self.evaluator = rules.evaluator(attributes)
+        self.writer = ParameterWriter()
+        self.report = FailureReport()
+
+    def compute(self, doors):
+        """Get a list of (door, parameter, value) for the doors"""
+        values = []
+        for door in doors:
+            record = DoorRecord(door, self.context)
+            for parameter_name, value in self.evaluator.evaluate(
+                    record, self.context):
+                values.append((door, parameter_name, value))
+        return values
+
+    def write(self, values):
+        """Write computed values, has to be called inside a transaction"""
+        for door, parameter_name, value in values:
+            self.writer.set(door, parameter_name, value)
+        return self.writer
+
+    def run(self, doors=None, transaction_name='Door attributes application'):
+        if doors is None:
+            doors = collect_doors(
+                self.doc, self.evaluator.include_demolished)
+        values = self.compute(doors)
+        with BatchTransaction(self.doc, transaction_name, self.report):
+            self.write(values)
+        return self.writer
+
+
+def fill_door_attributes(doc, attributes=ATTRIBUTE_NAMES,
+                         transaction_name='Door attributes application'):
+    """Fill door attributes in one transaction and print a report"""
+    pipeline = DoorAttributePipeline(doc, attributes)
+    writer = pipeline.run(transaction_name=transaction_name)
+    writer.print_report()
+    pipeline.context.family_names.print_report()
+    pipeline.report.print_report()
+    return writer
\ No newline at end of file
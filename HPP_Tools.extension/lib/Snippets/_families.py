@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# HPP family names: <office>_<category>_..._<code>_..., the code token
+# holds the number of wings followed by the door form, e.g. '1FL'
+SEPARATOR = '_'
+CODE_TOKEN = 4
+CODE_FIELDS = {
+    'wings': (0, 1),
+    'door_form': (1, None),
+}
+
+
+class FamilyName(object):
+    """HPP family name decoded into its tokens and code fields"""
+    def __init__(self, name, separator=SEPARATOR, code_token=CODE_TOKEN,
+                 code_fields=CODE_FIELDS):
+        self.name = name or ''
+        self.tokens = tuple(self.name.split(separator))
+        self.code = self.tokens[code_token] \
+            if len(self.tokens) > code_token else ''
+        self.fields = dict(
+            (field, self.code[start:stop])
+            for field, (start, stop) in code_fields.items()
+        ) if self.code else {}
+        if not self.code:
+            self.error = 'code expected as part {} separated by "{}"'.format(
+                code_token + 1, separator)
+        else:
+            self.error = None
+
+    @property
+    def is_valid(self):
+        return self.error is None
+
+    @property
+    def wings(self):
+        return self.fields.get('wings')
+
+    @property
+    def door_form(self):
+        return self.fields.get('door_form')
+
+
+class FamilyNameIndex(object):
+    """
+    Family names decoded once per Family.
+
+    Instances reach their decoded name through the symbol -> family map,
+    so a model with thousands of doors decodes only as many names as
+    there are door families. Instances of malformed names are collected
+    for the report instead of failing the run.
+    """
+    def __init__(self, doc, separator=SEPARATOR, code_token=CODE_TOKEN,
+                 code_fields=CODE_FIELDS):
+        self._doc = doc
+        self._separator = separator
+        self._code_token = code_token
+        self._code_fields = code_fields
+        self._by_symbol = {}
+        self._by_family = {}
+        self.malformed = {}
+
+    def get(self, instance):
+        """Get the decoded FamilyName of a family instance"""
+        type_id = instance.GetTypeId().IntegerValue
+        family_name = self._by_symbol.get(type_id)
+        if family_name is None:
+            family = self._doc.GetElement(instance.GetTypeId()).Family
+            family_name = self._by_family.get(family.Id.IntegerValue)
+            if family_name is None:
+                family_name = self._by_family[family.Id.IntegerValue] = \
+                    FamilyName(family.Name, self._separator,
+                               self._code_token, self._code_fields)
+            self._by_symbol[type_id] = family_name
+        return family_name
+
+    def field(self, instance, field):
+        """Get a code field of the instance family name or None"""
+        family_name = self.get(instance)
+        if not family_name.is_valid:
+            self.malformed.setdefault(family_name, set()).add(
+                instance.Id.IntegerValue)
+            return None
+        return family_name.fields.get(field)
+
+    def print_report(self):
+        if not self.malformed:
+            return
+        print('***')
+        print('Family names not following the HPP naming convention:')
+        for family_name in sorted(self.malformed, key=lambda f: f.name):
+            print('{} ({} instance(s), {})'.format(
+                family_name.name, len(self.malformed[family_name]),
+                family_name.error))
\ No newline at end of file
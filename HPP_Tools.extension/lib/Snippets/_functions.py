@@ -1,20 +1,17 @@
 # -*- coding: utf-8 -*-
 
-import sys
 import clr
-clr.AddReference('ProtoGeometry')
-clr.AddReference('RevitServices')
-from RevitServices.Persistence import DocumentManager
-clr.AddReference('RevitNodes')
-import Revit
-clr.ImportExtensions(Revit.Elements)
-clr.ImportExtensions(Revit.GeometryConversion)
 clr.AddReference('RevitAPI')
 from Autodesk.Revit import DB
 from Autodesk.Revit.DB import FilteredElementCollector as FEC
 from System.Collections.Generic import List
 from Autodesk.Revit.UI import Selection as SEL
 
+from Snippets._apicalls import counted
+from Snippets._bootstrap import load_dynamo
+from Snippets._trace import traced
+from Snippets._walls import get_wall_width
+
 uiapp = __revit__
 doc = __revit__.ActiveUIDocument.Document
 uidoc = __revit__.ActiveUIDocument
@@ -22,6 +19,7 @@ app = __revit__.Application
 
 # working with units
 
+@counted()
 def unit_converter(
         doc,
         value,
@@ -110,12 +108,12 @@ def get_external_definition(app, group_name, definition_name):
         .Groups[group_name] \
         .Definitions[definition_name]
 
+@counted()
 def get_parameter_value_v2(parameter):
     if isinstance(parameter, DB.Parameter):
         storage_type = parameter.StorageType
         if storage_type:
-            exec 'parameter_value = parameter.As{}()'.format(storage_type)
-            return parameter_value
+            return getattr(parameter, 'As{}'.format(storage_type))()
 
 # working with bounding boxes
 
@@ -135,6 +133,7 @@ def merge_bounding_boxes(bboxes):
     )
     return merged_bb
 
+@counted()
 def check_intersection(bbox, element):
     """Check if an element's bounding box intersects with the given bounding box."""
     outline = DB.Outline(bbox.Min, bbox.Max)
@@ -145,6 +144,7 @@ def check_intersection(bbox, element):
 
 # working with solids
 
+@counted()
 def get_all_solids(element, g_options, solids=None):
     '''retrieve all solids from elements'''
     if solids is None:
@@ -163,7 +163,20 @@ def get_all_solids(element, g_options, solids=None):
             get_all_solids(family_instance, g_options, solids)
     return solids
 
+# working with Dynamo geometry
+
+_geometry_conversion = False
+
+def import_geometry_conversion():
+    """Import the Dynamo conversions, e.g. ToProtoType, on first use"""
+    global _geometry_conversion
+    if not _geometry_conversion:
+        clr.ImportExtensions(load_dynamo().GeometryConversion)
+        _geometry_conversion = True
+
+@counted()
 def to_proto_type(elements, of_type=None):
+    import_geometry_conversion()
     elements = flatten(elements) if of_type is None \
         else [item for item in flatten(elements) if isinstance(item, of_type)]
     proto_geometry = []
@@ -176,6 +189,7 @@ def to_proto_type(elements, of_type=None):
 
 # working with elements
 
+@counted()
 def view_exists(doc, view_name):
     views = FEC(doc).OfClass(DB.View).ToElements()
     for view in views:
@@ -183,6 +197,7 @@ def view_exists(doc, view_name):
             return True
     return False
 
+@counted()
 def get_3d_view_type_id(doc):
     collector = FEC(doc).OfClass(DB.ViewFamilyType)
     for view_type in collector:
@@ -190,14 +205,21 @@ def get_3d_view_type_id(doc):
             return view_type.Id
     return None
 
-def get_room_boundary(doc, item, options):
+@counted()
+@traced('room boundary')
+def get_room_boundary(doc, item, options, with_curves=False):
+    # the curves are converted to Dynamo geometry only on request,
+    # loading Dynamo takes seconds on its first use
+    if with_curves:
+        import_geometry_conversion()
     e_list = []
     c_list = []
     try:
         for i in item.GetBoundarySegments(options):
             for j in i:
                 e_list.append(doc.GetElement(j.ElementId))
-                c_list.append(j.Curve.ToProtoType())
+                if with_curves:
+                    c_list.append(j.Curve.ToProtoType())
     except:
         calculator = DB.SpatialElementGeometryCalculator(doc)
         try:
@@ -209,6 +231,7 @@ def get_room_boundary(doc, item, options):
             pass
     return [e_list, c_list]
 
+@counted()
 def get_mat_vol_area(doc, element):
     output_list = []
     no_mat_applied = []
@@ -224,6 +247,7 @@ def get_mat_vol_area(doc, element):
             output_list.append([material, volume, area])
     return list(set(no_mat_applied)) or output_list or None
 
+@counted()
 def get_element_by_name(
         doc,
         name,
@@ -348,28 +372,7 @@ class RoomAntiRutinaField(object):
         Для витража - получает толщину (диаметр) каждого прямоугольного
         или круглого импоста и возвращает максимальное значение.
         """
-        doc = self.doc
-        wall_kind = wall.WallType.Kind
-        if wall_kind == DB.WallKind.Basic:
-            return wall.Width
-        if wall_kind == DB.WallKind.Curtain:
-            mullion_type_ids = set(
-                [doc.GetElement(mullion_id).GetTypeId()
-                 for mullion_id in wall.CurtainGrid.GetMullionIds()]
-            )
-            values = []
-            for mullion_type_id in mullion_type_ids:
-                mullion_type = doc.GetElement(mullion_type_id)
-                width_parameter = mullion_type.Parameter[
-                    DB.BuiltInParameter.RECT_MULLION_THICK]
-                if width_parameter:
-                    values.append(width_parameter.AsDouble())
-                    continue
-                radius_parameter = mullion_type.Parameter[
-                    DB.BuiltInParameter.CIRC_MULLION_RADIUS]
-                if radius_parameter:
-                    values.append(radius_parameter.AsDouble() * 2)
-            return max(values)
+        return get_wall_width(self.doc, wall)
 
     def _create_curveloop(self,
                           boundary_segments,
@@ -520,6 +523,7 @@ class RoomAntiRutinaField(object):
         return self._add_door_outlines_via_solid_union(room_boundaries, doors_to_include, door_depth, door_depth_ratio)
 
 
+@counted()
 def create_direct_shape(doc, geometry_objects, category_id = DB.ElementId(DB.BuiltInCategory.OST_GenericModel)):
     direct_shape = DB.DirectShape.CreateElement(doc, category_id)
     direct_shape.SetShape(to_list(geometry_objects, DB.GeometryObject))
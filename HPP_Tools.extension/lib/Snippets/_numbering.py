@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import clr
+clr.AddReference('RevitAPI')
+
+from Snippets._storage import JsonStorage
+from Snippets._writer import ParameterWriter
+
+NUMBERING_STORAGE = JsonStorage(
+    '3d8e5b1a-6c2f-4e97-b0a4-71c9e2d5f836', 'HPP_Numbering',
+    'Last numbers assigned by HPP numbering tools')
+
+
+# working with the stored state
+
+def load_numbering_state(doc):
+    """Get the stored numbering state of all engines"""
+    return NUMBERING_STORAGE.load(doc)
+
+
+def save_numbering_state(doc, state):
+    """Store the numbering state, has to be called inside a transaction"""
+    NUMBERING_STORAGE.save(doc, state)
+
+
+# working with numbers
+
+class StableNumbering(object):
+    """
+    Numbering that keeps the numbers of unchanged elements.
+
+    Each element gets a base number derived from its inputs; elements
+    sharing a base get a sequential suffix. The last assignment
+    (element id -> inputs, number) is stored in the project, so a rerun
+    keeps the numbers and suffixes of elements whose inputs did not
+    change and numbers only new and changed elements, taking the first
+    free suffix of their base.
+
+    suffix_format - format of a repeated base number, e.g. '{base}.{index}'
+    """
+    def __init__(self, doc, engine, suffix_format):
+        self._doc = doc
+        self._engine = engine
+        self._suffix_format = suffix_format
+        self._state = load_numbering_state(doc)
+        self.numbers = {}
+        self.kept = []
+        self.changed = []
+
+    def _number(self, base, used):
+        if base not in used:
+            return base
+        index = 1
+        while self._suffix_format.format(base=base, index=index) in used:
+            index += 1
+        return self._suffix_format.format(base=base, index=index)
+
+    def _is_number_of(self, number, base):
+        if number == base:
+            return True
+        prefix, _, suffix = self._suffix_format.partition('{index}')
+        prefix = prefix.format(base=base)
+        return number.startswith(prefix) and \
+            number[len(prefix):len(number) - len(suffix)].isdigit()
+
+    def assign(self, items):
+        """
+        Assign numbers to the elements.
+        items - (element, base number, inputs) with inputs a list of
+        strings the base number was derived from
+        Returns a dict of element id integer value -> number.
+        """
+        previous = self._state.get(self._engine, {})
+        items = sorted(items, key=lambda item: item[0].Id.IntegerValue)
+        used = set()
+        pending = []
+        assignment = {}
+        for element, base, inputs in items:
+            key = str(element.Id.IntegerValue)
+            inputs = [base] + list(inputs)
+            stored = previous.get(key)
+            if stored is not None and stored[0] == inputs and \
+                    stored[1] not in used and self._is_number_of(stored[1], base):
+                used.add(stored[1])
+                assignment[key] = stored
+                self.kept.append(element)
+            else:
+                pending.append((element, base, inputs))
+        for element, base, inputs in pending:
+            number = self._number(base, used)
+            used.add(number)
+            assignment[str(element.Id.IntegerValue)] = [inputs, number]
+            self.changed.append(element)
+        self._state[self._engine] = assignment
+        self.numbers = dict(
+            (int(key), number) for key, (_, number) in assignment.items())
+        return self.numbers
+
+    def write(self, elements, parameter_name, writer=None):
+        """
+        Write the assigned numbers and store the state.
+        Has to be called inside a transaction.
+        """
+        writer = writer or ParameterWriter()
+        for element in elements:
+            number = self.numbers.get(element.Id.IntegerValue)
+            if number is not None:
+                writer.set(element, parameter_name, number)
+        save_numbering_state(self._doc, self._state)
+        return writer
\ No newline at end of file
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+from System.Collections.Generic import List
+
+# phase names as used in German, English and other localized templates
+NEW_PHASE_NAMES = (
+    'neu', 'neubau', 'new', 'new construction',
+    'nouveau', 'nouvelle construction', 'nuovo', 'nuova costruzione',
+    'nuevo', 'nueva construcción', 'nowy', 'nieuw', 'nová'
+)
+EXISTING_PHASE_NAMES = (
+    'bestand', 'existing', 'existant', 'esistente', 'existente',
+    'istniejący', 'bestaand', 'stávající'
+)
+
+
+def _normalize(name):
+    return (name or '').strip().lower()
+
+
+def _signature(phases):
+    """Ids and names of the phases in sequence order"""
+    return tuple((phase.Id.IntegerValue, phase.Name) for phase in phases)
+
+
+class PhaseResolver(object):
+    """
+    Index of document phases by id, by sequence and by name.
+
+    Phases are read once per document. Names are matched case
+    insensitively; the working ("new") and existing phases are found by
+    their name in any of the known locales and fall back to the last
+    and the first phase of the sequence.
+    """
+    def __init__(self, doc):
+        self._doc = doc
+        self.refresh()
+
+    @property
+    def doc(self):
+        return self._doc
+
+    def refresh(self):
+        """Re-read the phases of the document"""
+        self._phases = list(self._doc.Phases)
+        self.signature = _signature(self._phases)
+        self._sequence = dict(
+            (phase.Id.IntegerValue, index)
+            for index, phase in enumerate(self._phases))
+        self._by_name = dict(
+            (_normalize(phase.Name), phase) for phase in self._phases)
+        self._new_phase = self._find(NEW_PHASE_NAMES) or \
+            (self._phases[-1] if self._phases else None)
+        self._existing_phase = self._find(EXISTING_PHASE_NAMES) or \
+            (self._phases[0] if self._phases else None)
+
+    def _find(self, names):
+        for name in names:
+            if name in self._by_name:
+                return self._by_name[name]
+
+    @property
+    def phases(self):
+        return list(self._phases)
+
+    @property
+    def new_phase(self):
+        return self._new_phase
+
+    @property
+    def new_phase_id(self):
+        return self._new_phase.Id
+
+    @property
+    def existing_phase(self):
+        return self._existing_phase
+
+    @property
+    def existing_phase_id(self):
+        return self._existing_phase.Id
+
+    def get(self, phase):
+        """Get a Phase from a Phase, an ElementId or a phase name"""
+        if isinstance(phase, DB.Phase):
+            return phase
+        if isinstance(phase, DB.ElementId):
+            index = self._sequence.get(phase.IntegerValue)
+            return self._phases[index] if index is not None else None
+        name = _normalize(phase)
+        if name in self._by_name:
+            return self._by_name[name]
+        if name in NEW_PHASE_NAMES:
+            return self._new_phase
+        if name in EXISTING_PHASE_NAMES:
+            return self._existing_phase
+
+    def get_id(self, phase):
+        resolved = self.get(phase)
+        if resolved is None:
+            raise ValueError(
+                'Phase "{}" is not found in the project'.format(phase))
+        return resolved.Id
+
+    def sequence(self, phase):
+        """Get the position of the phase in the phase sequence"""
+        return self._sequence.get(self.get_id(phase).IntegerValue)
+
+    def is_created_in(self, element, phase):
+        created = element.get_Parameter(DB.BuiltInParameter.PHASE_CREATED)
+        return created is not None and \
+            created.AsElementId().IntegerValue == \
+            self.get_id(phase).IntegerValue
+
+    def status_filter(self, phase, statuses, inverted=False):
+        """
+        Get a native ElementPhaseStatusFilter for the phase.
+        statuses - ElementOnPhaseStatus values to accept
+        """
+        return DB.ElementPhaseStatusFilter(
+            self.get_id(phase),
+            List[DB.ElementOnPhaseStatus](statuses),
+            inverted
+        )
+
+
+_resolvers = {}
+
+
+def get_phase_resolver(doc):
+    """
+    Get the cached phase resolver of the document. It is rebuilt when a
+    phase was added, removed, renamed or moved in the sequence.
+    """
+    key = doc.GetHashCode()
+    resolver = _resolvers.get(key)
+    if resolver is None or resolver.signature != _signature(doc.Phases):
+        resolver = _resolvers[key] = PhaseResolver(doc)
+    return resolver
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+from pyrevit.forms import ProgressBar
+
+from Snippets._trace import span
+
+# refreshes of the progress bar per second
+MAX_UPDATES_PER_SECOND = 4
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return '{}:{:02d}:{:02d}'.format(hours, minutes, seconds)
+    return '{}:{:02d}'.format(minutes, seconds)
+
+
+def format_progress(done, total, elapsed):
+    """Get e.g. '120 / 800  (40.0 /s, ETA 0:17)'"""
+    text = '{} / {}'.format(done, total)
+    if done and elapsed > 0:
+        rate = done / float(elapsed)
+        text += '  ({:.1f} /s, ETA {})'.format(
+            rate, format_duration(max(total - done, 0) / rate))
+    return text
+
+
+class ProgressReporter(object):
+    """
+    Rate-limited wrapper around the pyRevit ProgressBar.
+
+    update() is cheap: the bar, its text with throughput and ETA and the
+    cancelled flag of the window are refreshed at most
+    max_updates_per_second times, so it can be called for every element
+    even in tight loops.
+
+    Example:
+        with ProgressReporter(len(elements)) as progress:
+            for element in elements:
+                ...
+                progress.update()
+                if progress.cancelled:
+                    break
+    """
+    def __init__(self, total, title='', cancellable=True,
+                 max_updates_per_second=MAX_UPDATES_PER_SECOND):
+        self.total = total
+        self.title = title
+        self.done = 0
+        self.cancelled = False
+        self._cancellable = cancellable
+        self._interval = 1.0 / max_updates_per_second
+        self._bar = None
+        self._start = None
+        self._next_refresh = 0
+
+    def __enter__(self):
+        self._bar = ProgressBar(cancellable=self._cancellable)
+        self._bar.__enter__()
+        self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._bar.__exit__(exc_type, exc_value, traceback)
+
+    @property
+    def elapsed(self):
+        return time.time() - self._start
+
+    def update(self, done=None, total=None):
+        """Set the number of done elements, add one if not given"""
+        self.done = self.done + 1 if done is None else done
+        if total is not None:
+            self.total = total
+        now = time.time()
+        if now >= self._next_refresh or self.done >= self.total:
+            self._next_refresh = now + self._interval
+            self.refresh()
+
+    def refresh(self):
+        with span('progress'):
+            self._refresh()
+
+    def _refresh(self):
+        text = format_progress(self.done, self.total, self.elapsed)
+        # the bar formats its title, braces have to be escaped
+        self._bar.title = ('{}  {}'.format(self.title, text) if self.title
+                           else text).replace('{', '{{').replace('}', '}}')
+        self._bar.update_progress(self.done, max(self.total, 1))
+        if self._cancellable and self._bar.cancelled:
+            self.cancelled = True
\ No newline at end of file
@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+from Autodesk.Revit.DB import FilteredElementCollector as FEC
+from System.Collections.Generic import List
+
+# working with element usage
+
+FILTER = 'filter'
+TEMPLATE = 'template'
+LINE_PATTERN = 'line_pattern'
+FILL_PATTERN = 'fill_pattern'
+
+_OVERRIDE_LINE_PATTERNS = (
+    'ProjectionLinePatternId',
+    'CutLinePatternId'
+)
+_OVERRIDE_FILL_PATTERNS = (
+    'SurfaceForegroundPatternId',
+    'SurfaceBackgroundPatternId',
+    'CutForegroundPatternId',
+    'CutBackgroundPatternId'
+)
+_REGION_FILL_PATTERNS = (
+    'ForegroundPatternId',
+    'BackgroundPatternId'
+)
+_PATTERN_KINDS = (LINE_PATTERN, FILL_PATTERN)
+
+
+def _is_valid_id(element_id):
+    return element_id is not None and \
+        element_id != DB.ElementId.InvalidElementId
+
+
+class UsageIndex(object):
+    """
+    Index of filters, view templates, line patterns and fill patterns
+    referenced in the document.
+
+    Views and view templates are swept once, on first use. Patterns are
+    also referenced by the category overrides of every view, by
+    categories, materials and filled region types, these are swept once
+    on the first pattern query only. Every reference is stored with the
+    id of the element it comes from, so all "unused" queries are set
+    lookups. View templates are swept like any other view: a filter or
+    pattern referenced only by a template counts as used.
+    """
+    def __init__(self, doc):
+        self._doc = doc
+        self._references = None
+        self._override_views = []
+        self._patterns_swept = False
+        self._elements = {}
+
+    @property
+    def doc(self):
+        return self._doc
+
+    def _add(self, kind, element_id, source_id):
+        if not _is_valid_id(element_id):
+            return
+        sources = self._references[kind].setdefault(
+            element_id.IntegerValue, set())
+        sources.add(source_id.IntegerValue)
+
+    def _add_all(self, kind, item, attributes, source_id):
+        for attribute in attributes:
+            self._add(kind, getattr(item, attribute, None), source_id)
+
+    def _add_overrides(self, overrides, source_id):
+        self._add_all(LINE_PATTERN, overrides, _OVERRIDE_LINE_PATTERNS,
+                      source_id)
+        self._add_all(FILL_PATTERN, overrides, _OVERRIDE_FILL_PATTERNS,
+                      source_id)
+
+    def _sweep_views(self):
+        templates = []
+        for view in FEC(self._doc).OfClass(DB.View):
+            if view.IsTemplate:
+                templates.append(view)
+            self._add(TEMPLATE, view.ViewTemplateId, view.Id)
+            if not view.AreGraphicsOverridesAllowed():
+                continue
+            self._override_views.append(view)
+            try:
+                filter_ids = view.GetFilters()
+            except Exception:
+                continue
+            for filter_id in filter_ids:
+                self._add(FILTER, filter_id, view.Id)
+                self._add_overrides(
+                    view.GetFilterOverrides(filter_id), view.Id)
+        self._elements[TEMPLATE] = templates
+
+    def _sweep_categories(self):
+        category_ids = []
+        for category in self._doc.Settings.Categories:
+            for item in [category] + list(category.SubCategories):
+                category_ids.append(item.Id)
+                for style_type in (DB.GraphicsStyleType.Projection,
+                                   DB.GraphicsStyleType.Cut):
+                    try:
+                        pattern_id = item.GetLinePatternId(style_type)
+                    except Exception:
+                        continue
+                    self._add(LINE_PATTERN, pattern_id, item.Id)
+        for view in self._override_views:
+            for category_id in category_ids:
+                try:
+                    overrides = view.GetCategoryOverrides(category_id)
+                except Exception:
+                    continue
+                self._add_overrides(overrides, view.Id)
+
+    def _sweep_fill_pattern_owners(self):
+        for material in FEC(self._doc).OfClass(DB.Material):
+            self._add_all(FILL_PATTERN, material, _OVERRIDE_FILL_PATTERNS,
+                          material.Id)
+        for region_type in FEC(self._doc).OfClass(DB.FilledRegionType):
+            self._add_all(FILL_PATTERN, region_type, _REGION_FILL_PATTERNS,
+                          region_type.Id)
+
+    def _ensure_swept(self, kind=None):
+        if self._references is None:
+            self._references = dict(
+                (k, {}) for k in
+                (FILTER, TEMPLATE, LINE_PATTERN, FILL_PATTERN)
+            )
+            self._sweep_views()
+        if kind in _PATTERN_KINDS and not self._patterns_swept:
+            self._patterns_swept = True
+            self._sweep_categories()
+            self._sweep_fill_pattern_owners()
+
+    def _collect(self, kind):
+        if kind == FILTER:
+            return list(FEC(self._doc).WherePasses(DB.LogicalOrFilter(
+                DB.ElementClassFilter(DB.ParameterFilterElement),
+                DB.ElementClassFilter(DB.SelectionFilterElement)
+            )))
+        if kind == LINE_PATTERN:
+            return list(FEC(self._doc).OfClass(DB.LinePatternElement))
+        if kind == FILL_PATTERN:
+            return list(FEC(self._doc).OfClass(DB.FillPatternElement))
+        raise ValueError('Unknown usage kind: {}'.format(kind))
+
+    def elements(self, kind):
+        """Get all elements of the given kind in the document"""
+        if kind == TEMPLATE:
+            self._ensure_swept()
+        if kind not in self._elements:
+            self._elements[kind] = self._collect(kind)
+        return self._elements[kind]
+
+    def is_used(self, kind, element_id):
+        self._ensure_swept(kind)
+        return element_id.IntegerValue in self._references[kind]
+
+    def referrers(self, kind, element_id):
+        """
+        Get ids of the views, categories, materials and filled region
+        types that reference the element
+        """
+        self._ensure_swept(kind)
+        return [DB.ElementId(source) for source in sorted(
+            self._references[kind].get(element_id.IntegerValue, ()))]
+
+    def used(self, kind):
+        return [element for element in self.elements(kind)
+                if self.is_used(kind, element.Id)]
+
+    def unused(self, kind):
+        return [element for element in self.elements(kind)
+                if not self.is_used(kind, element.Id)]
+
+
+# working with bulk deletion
+
+def delete_elements(doc, element_ids):
+    """
+    Delete elements with a single call and return the ids of everything
+    removed, dependent elements included. Ids that already disappeared
+    together with an earlier deleted parent are skipped. If Revit rejects
+    the batch, the elements are deleted one by one.
+    """
+    element_ids = [element_id for element_id in element_ids
+                   if doc.GetElement(element_id) is not None]
+    if not element_ids:
+        return []
+    try:
+        return list(doc.Delete(List[DB.ElementId](element_ids)))
+    except Exception:
+        deleted = []
+        for element_id in element_ids:
+            if doc.GetElement(element_id) is None:
+                continue
+            try:
+                deleted.extend(doc.Delete(element_id))
+            except Exception:
+                pass
+        return deleted
+
+
+def delete_in_order(doc, batches):
+    """Delete batches of element ids in the given order, one call per batch"""
+    deleted = []
+    for element_ids in batches:
+        deleted.extend(delete_elements(doc, element_ids))
+    return deleted
+
+# working with views
+
+_SYSTEM_VIEW_TYPES = (
+    DB.ViewType.ProjectBrowser,
+    DB.ViewType.SystemBrowser,
+    DB.ViewType.Internal,
+    DB.ViewType.Undefined
+)
+
+
+def _can_delete_view(doc, view):
+    if view.ViewType in _SYSTEM_VIEW_TYPES:
+        return False
+    if isinstance(view, DB.ViewSchedule) and (
+            view.IsTitleblockRevisionSchedule or
+            view.IsInternalKeynoteSchedule):
+        return False
+    if hasattr(DB, 'DocumentValidation'):
+        return DB.DocumentValidation.CanDeleteElement(doc, view.Id)
+    return True
+
+
+def plan_view_purge(doc, keep_view_ids):
+    """
+    Plan the deletion of all views except the given ones.
+
+    Everything the kept views depend on (view templates, primary views)
+    and the active view are kept as well. Returns a tuple of the kept ids
+    and a list of id batches in dependency order: sheets first, then
+    dependent views, then independent views and finally view templates.
+    """
+    views = dict((view.Id.IntegerValue, view)
+                 for view in FEC(doc).OfClass(DB.View))
+    keep = set(view_id.IntegerValue for view_id in keep_view_ids)
+    if doc.ActiveView is not None:
+        keep.add(doc.ActiveView.Id.IntegerValue)
+    pending = list(keep)
+    while pending:
+        view = views.get(pending.pop())
+        if view is None:
+            continue
+        for dependency_id in (view.ViewTemplateId, view.GetPrimaryViewId()):
+            key = dependency_id.IntegerValue
+            if _is_valid_id(dependency_id) and key not in keep:
+                keep.add(key)
+                pending.append(key)
+    sheets, dependent_views, primary_views, templates = [], [], [], []
+    for key, view in views.items():
+        if key in keep or not _can_delete_view(doc, view):
+            continue
+        if view.IsTemplate:
+            templates.append(view.Id)
+        elif view.ViewType == DB.ViewType.DrawingSheet:
+            sheets.append(view.Id)
+        elif _is_valid_id(view.GetPrimaryViewId()):
+            dependent_views.append(view.Id)
+        else:
+            primary_views.append(view.Id)
+    kept_ids = [DB.ElementId(key) for key in sorted(keep)]
+    return kept_ids, [sheets, dependent_views, primary_views, templates]
+
+# working with links
+
+DWG = 'DWG'
+IFC = 'IFC'
+RVT = 'RVT'
+LINK_KINDS = (DWG, IFC, RVT)
+
+
+class LinkRecord(object):
+    """Metadata of a CAD or Revit link type and its placed instances"""
+    def __init__(self, link_type, kind, name, path, is_loaded):
+        self.type_id = link_type.Id
+        self.kind = kind
+        self.name = name
+        self.path = path
+        self.is_loaded = is_loaded
+        self.instance_ids = []
+
+    @property
+    def instance_count(self):
+        return len(self.instance_ids)
+
+    def __repr__(self):
+        return '{} ({}, {} instance(s), {})'.format(
+            self.name, self.kind, self.instance_count,
+            'loaded' if self.is_loaded else 'not loaded')
+
+
+def _get_link_kind(link_type, name):
+    if isinstance(link_type, DB.CADLinkType):
+        return DWG
+    if '.ifc' in name.lower():
+        return IFC
+    if '.rvt' in name.lower():
+        return RVT
+
+
+def _get_link_reference(link_type):
+    try:
+        if link_type.IsExternalFileReference():
+            return link_type.GetExternalFileReference()
+    except Exception:
+        pass
+
+
+class LinkInventory(object):
+    """
+    Index of all CAD and Revit link types and instances in the document,
+    built with one collector pass. Link kinds are told apart by class
+    and by the '.ifc' / '.rvt' extension in the type name.
+    """
+    def __init__(self, doc):
+        self._doc = doc
+        self._records = self._index()
+
+    @property
+    def doc(self):
+        return self._doc
+
+    def _create_record(self, link_type):
+        name = link_type.Parameter[
+            DB.BuiltInParameter.ALL_MODEL_TYPE_NAME].AsString() or ''
+        kind = _get_link_kind(link_type, name)
+        if kind is None:
+            return None
+        path, is_loaded = None, True
+        reference = _get_link_reference(link_type)
+        if reference is not None:
+            path = DB.ModelPathUtils.ConvertModelPathToUserVisiblePath(
+                reference.GetAbsolutePath())
+            is_loaded = \
+                reference.GetLinkedFileStatus() == DB.LinkedFileStatus.Loaded
+        return LinkRecord(link_type, kind, name, path, is_loaded)
+
+    def _index(self):
+        link_filter = DB.LogicalOrFilter(List[DB.ElementFilter]([
+            DB.ElementClassFilter(DB.CADLinkType),
+            DB.ElementClassFilter(DB.RevitLinkType),
+            DB.ElementClassFilter(DB.ImportInstance),
+            DB.ElementClassFilter(DB.RevitLinkInstance)
+        ]))
+        records = {}
+        instances = []
+        for element in FEC(self._doc).WherePasses(link_filter):
+            if isinstance(element, (DB.ImportInstance, DB.RevitLinkInstance)):
+                instances.append(element)
+                continue
+            record = self._create_record(element)
+            if record is not None:
+                records[element.Id.IntegerValue] = record
+        for instance in instances:
+            record = records.get(instance.GetTypeId().IntegerValue)
+            if record is not None:
+                record.instance_ids.append(instance.Id)
+        return records
+
+    def records(self, kinds=LINK_KINDS):
+        return sorted(
+            [record for record in self._records.values()
+             if record.kind in kinds],
+            key=lambda record: record.name)
+
+    def count(self, kind):
+        return len(self.records([kind]))
+
+    def purge(self, kinds):
+        """
+        Delete link types of the given kinds together with their instances
+        in one batch. Has to be called inside a transaction. Returns the
+        removed records and the ids of all deleted elements.
+        """
+        records = self.records(kinds)
+        deleted = delete_elements(
+            self._doc, [record.type_id for record in records])
+        for record in records:
+            self._records.pop(record.type_id.IntegerValue, None)
+        return records, deleted
+
+# working with rooms
+
+NOT_PLACED = 'Not Placed'
+NOT_ENCLOSED = 'Not Enclosed'
+REDUNDANT = 'Redundant'
+ROOM_STATES = (NOT_PLACED, NOT_ENCLOSED, REDUNDANT)
+
+
+def get_zero_area_room_ids(doc):
+    """
+    Get ids of all rooms with zero area. The area test runs as a native
+    parameter filter, so no room is loaded on the Python side.
+    """
+    area_rule = DB.ParameterFilterRuleFactory.CreateEqualsRule(
+        DB.ElementId(DB.BuiltInParameter.ROOM_AREA), 0.0, 1e-9)
+    return list(
+        FEC(doc).OfCategory(DB.BuiltInCategory.OST_Rooms)
+        .WhereElementIsNotElementType()
+        .WherePasses(DB.ElementParameterFilter(area_rule))
+        .ToElementIds()
+    )
+
+
+def classify_zero_area_rooms(doc, room_ids):
+    """
+    Split zero area rooms into not placed, not enclosed and redundant ones.
+
+    Rooms without location are not placed. Placed rooms without boundary
+    are not enclosed, placed rooms with a boundary share their region
+    with another room and are redundant.
+    """
+    options = DB.SpatialElementBoundaryOptions()
+    room_states = dict((state, []) for state in ROOM_STATES)
+    for room_id in room_ids:
+        room = doc.GetElement(room_id)
+        if room.Location is None:
+            room_states[NOT_PLACED].append(room_id)
+            continue
+        segments = room.GetBoundarySegments(options)
+        if segments is None or segments.Count == 0:
+            room_states[NOT_ENCLOSED].append(room_id)
+        else:
+            room_states[REDUNDANT].append(room_id)
+    return room_states
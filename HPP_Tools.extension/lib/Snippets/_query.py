@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+from Autodesk.Revit.DB import FilteredElementCollector as FEC
+from System.Collections.Generic import List
+
+from Snippets._apicalls import count_members, counted
+from Snippets._phases import get_phase_resolver
+from Snippets._telemetry import count
+from Snippets._trace import span
+
+
+def _parameter_id(builtin_parameter):
+    return DB.ElementId(builtin_parameter)
+
+
+def _combine(filters, logical_filter=DB.LogicalAndFilter):
+    """Combine the filters into one, None if there are no filters"""
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return logical_filter(List[DB.ElementFilter](filters))
+
+
+def get_phase_id(doc, phase):
+    """Get phase id from a Phase, an ElementId or a phase name"""
+    return get_phase_resolver(doc).get_id(phase)
+
+
+class ElementQuery(object):
+    """
+    Declarative element query compiled into native collector filters.
+
+    Category, class and view scope become quick filters, parameter tests
+    become slow ElementParameterFilters; both run inside Revit, so only
+    matching elements (or just their ids) reach Python. Nothing is
+    collected until the query is iterated or ids are requested.
+
+    Example:
+        floors = ElementQuery(doc).of_categories(
+            DB.BuiltInCategory.OST_Floors
+        ).instances().type_name_contains('GFB', 'GDA', 'DAD')
+    """
+    def __init__(self, doc, view_id=None):
+        self._doc = doc
+        self._view_id = view_id
+        self._quick_filters = []
+        self._slow_filters = []
+        self._unions = []
+        self._id_set = None
+
+    @property
+    def doc(self):
+        return self._doc
+
+    # scope
+
+    def in_view(self, view):
+        """Limit the query to elements visible in the view"""
+        self._view_id = view.Id if isinstance(view, DB.View) else view
+        return self
+
+    def of_categories(self, *categories):
+        category_list = List[DB.BuiltInCategory](categories)
+        self._quick_filters.append(
+            DB.ElementMulticategoryFilter(category_list)
+            if len(categories) > 1
+            else DB.ElementCategoryFilter(categories[0])
+        )
+        return self
+
+    def of_class(self, element_class):
+        self._quick_filters.append(DB.ElementClassFilter(element_class))
+        return self
+
+    def instances(self):
+        self._quick_filters.append(DB.ElementIsElementTypeFilter(True))
+        return self
+
+    def types(self):
+        self._quick_filters.append(DB.ElementIsElementTypeFilter(False))
+        return self
+
+    # parameter rules
+
+    def where_rule(self, rule):
+        self._slow_filters.append(DB.ElementParameterFilter(rule))
+        return self
+
+    def where_any_rule(self, rules):
+        """Element passes if at least one of the rules is fulfilled"""
+        return self.where(_combine(
+            [DB.ElementParameterFilter(rule) for rule in rules],
+            DB.LogicalOrFilter
+        ), slow=True)
+
+    def where(self, element_filter, slow=False):
+        """Add any native filter to the query, None adds no filter"""
+        if element_filter is None:
+            return self
+        filters = self._slow_filters if slow else self._quick_filters
+        filters.append(element_filter)
+        return self
+
+    def parameter_equals(self, builtin_parameter, value):
+        if isinstance(value, float):
+            rule = DB.ParameterFilterRuleFactory.CreateEqualsRule(
+                _parameter_id(builtin_parameter), value, 1e-9)
+        else:
+            rule = DB.ParameterFilterRuleFactory.CreateEqualsRule(
+                _parameter_id(builtin_parameter), value)
+        return self.where_rule(rule)
+
+    def parameter_greater(self, builtin_parameter, value):
+        return self.where_rule(DB.ParameterFilterRuleFactory.CreateGreaterRule(
+            _parameter_id(builtin_parameter), float(value), 1e-9))
+
+    def parameter_contains(self, builtin_parameter, *tokens):
+        """Parameter value contains at least one of the tokens"""
+        return self.where_any_rule([
+            DB.ParameterFilterRuleFactory.CreateContainsRule(
+                _parameter_id(builtin_parameter), token, True)
+            for token in tokens
+        ])
+
+    def parameter_not_contains(self, builtin_parameter, *tokens):
+        """Parameter value contains none of the tokens"""
+        for token in tokens:
+            self.where_rule(DB.ParameterFilterRuleFactory.CreateNotContainsRule(
+                _parameter_id(builtin_parameter), token, True))
+        return self
+
+    def type_name_contains(self, *tokens):
+        """Type name contains at least one of the tokens"""
+        return self.parameter_contains(
+            DB.BuiltInParameter.ELEM_TYPE_PARAM, *tokens)
+
+    def family_name_contains(self, *tokens):
+        """Family name contains at least one of the tokens"""
+        return self.parameter_contains(
+            DB.BuiltInParameter.ELEM_FAMILY_PARAM, *tokens)
+
+    def family_name_not_contains(self, *tokens):
+        """Family name contains none of the tokens"""
+        return self.parameter_not_contains(
+            DB.BuiltInParameter.ELEM_FAMILY_PARAM, *tokens)
+
+    def has_parameter_value(self, parameter_id):
+        return self.where_rule(
+            DB.ParameterFilterRuleFactory.CreateHasValueParameterRule(
+                parameter_id))
+
+    # phases
+
+    def created_in_phase(self, phase):
+        """Phase Created equals the phase (Phase, ElementId or name)"""
+        return self.parameter_equals(
+            DB.BuiltInParameter.PHASE_CREATED,
+            get_phase_id(self._doc, phase))
+
+    def room_phase(self, phase):
+        """Phase of rooms equals the phase (Phase, ElementId or name)"""
+        return self.parameter_equals(
+            DB.BuiltInParameter.ROOM_PHASE,
+            get_phase_id(self._doc, phase))
+
+    def phase_status(self, phase, *statuses):
+        """Element status on the phase is one of ElementOnPhaseStatus"""
+        return self.where(
+            get_phase_resolver(self._doc).status_filter(phase, statuses))
+
+    def not_demolished(self):
+        return self.parameter_equals(
+            DB.BuiltInParameter.PHASE_DEMOLISHED,
+            DB.ElementId.InvalidElementId)
+
+    # composition
+
+    def union(self, other):
+        """Element passes this query or the other one"""
+        self._unions.append(other)
+        return self
+
+    def filter(self):
+        """
+        Get the query compiled into a single native filter, None if the
+        query passes every element (no filters, or a union with such a query)
+        """
+        element_filter = _combine(self._quick_filters + self._slow_filters)
+        if self._unions and element_filter is not None:
+            filters = [element_filter] + [other.filter()
+                                          for other in self._unions]
+            if None in filters:
+                return None
+            element_filter = _combine(filters, DB.LogicalOrFilter)
+        return element_filter
+
+    # results
+
+    def collector(self):
+        collector = FEC(self._doc, self._view_id) if self._view_id \
+            else FEC(self._doc)
+        if self._unions:
+            element_filter = self.filter()
+            if element_filter is None:
+                return collector
+            return collector.WherePasses(element_filter)
+        for element_filter in self._quick_filters + self._slow_filters:
+            collector = collector.WherePasses(element_filter)
+        return collector
+
+    def __iter__(self):
+        return iter(self.collector())
+
+    @counted('ElementQuery.elements')
+    def elements(self):
+        with span('collect elements') as collect:
+            elements = [count_members(element)
+                        for element in self.collector()]
+            collect.set(count=len(elements))
+        count('collected', len(elements))
+        return elements
+
+    @counted('ElementQuery.ids')
+    def ids(self):
+        with span('collect ids') as collect:
+            ids = list(self.collector().ToElementIds())
+            collect.set(count=len(ids))
+        count('collected', len(ids))
+        return ids
+
+    def id_set(self):
+        """Get integer values of the matching ids, collected once"""
+        if self._id_set is None:
+            self._id_set = set(
+                element_id.IntegerValue for element_id in self.ids())
+        return self._id_set
+
+    @counted('ElementQuery.first')
+    def first(self):
+        return count_members(self.collector().FirstElement())
+
+    @counted('ElementQuery.count')
+    def count(self):
+        return self.collector().GetElementCount()
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import os
+import tempfile
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+
+from Snippets._families import FamilyNameIndex
+from Snippets._walls import INTERIOR_LAYER, LAYER_RULES, \
+    WallMaterialIndex, WallWidthIndex
+
+RULES_PATH = os.path.join(os.path.dirname(__file__), 'door_rules.json')
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'HPP_Tools')
+# increase when the compiled form changes
+COMPILED_VERSION = 3
+
+
+# compiling the rule file
+
+def _compile_attribute(rule, room_sets):
+    source = rule.get('source')
+    if source not in SOURCES:
+        raise ValueError('Unknown rule source "{}"'.format(source))
+    if not rule.get('group') or \
+            not (rule.get('parameter') or rule.get('builtin')):
+        raise ValueError(
+            'Rule for "{}" needs a group and a parameter'.format(source))
+    compiled = dict(rule)
+    when = rule.get('when', {})
+    compiled['when'] = (
+        tuple(when.get('family_contains', ())),
+        tuple(when.get('family_not_contains', ()))
+    )
+    compiled['demolished'] = bool(rule.get('demolished', False))
+    if source == 'room_count':
+        compiled['values'] = dict(
+            (int(count), value) for count, value in rule['values'].items())
+    elif source == 'flip_table':
+        compiled['table'] = dict(
+            ((bool(row['facing']), bool(row['hand'])), row['value'])
+            for row in rule['table'])
+    elif source == 'wall_material':
+        layer = rule.get('layer', INTERIOR_LAYER)
+        if layer not in LAYER_RULES and not isinstance(layer, int):
+            raise ValueError('Unknown layer rule "{}"'.format(layer))
+    elif source == 'room_names_contain':
+        if rule['rooms'] not in room_sets:
+            raise ValueError('Unknown room list "{}"'.format(rule['rooms']))
+        compiled['rooms'] = room_sets[rule['rooms']]
+    return compiled
+
+
+def compile_rules(rules):
+    """Validate the rule file content and compile it into plain data"""
+    room_sets = dict(
+        (name, tuple(rooms)) for name, rooms in rules['rooms'].items())
+    door_number = rules.get('door_number', {})
+    priority = room_sets.get(door_number.get('rooms'), ())
+    family_name = rules['family_name']
+    return {
+        'family_name': (
+            family_name['separator'],
+            int(family_name['code_token']),
+            dict((field, tuple(code_slice)) for field, code_slice
+                 in family_name['code_fields'].items())
+        ),
+        'rooms': room_sets,
+        'attributes': [_compile_attribute(rule, room_sets)
+                       for rule in rules['attributes']],
+        'door_number': dict(
+            (variant, tuple(room for room in priority
+                            if room not in settings.get('exclude', ())))
+            for variant, settings in door_number.get('variants', {}).items()
+        ),
+    }
+
+
+def _stamp(path):
+    return COMPILED_VERSION, os.path.getmtime(path), os.path.getsize(path)
+
+
+def _cache_path(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, name + '.compiled')
+
+
+def _read_cache(path, stamp):
+    try:
+        with open(_cache_path(path), 'rb') as cache_file:
+            cached_stamp, compiled = pickle.load(cache_file)
+    except Exception:
+        return None
+    return compiled if cached_stamp == stamp else None
+
+
+def _write_cache(path, stamp, compiled):
+    # the cache only speeds up loading, a failure to write is not an error
+    try:
+        if not os.path.isdir(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        with open(_cache_path(path), 'wb') as cache_file:
+            pickle.dump((stamp, compiled), cache_file, 2)
+    except Exception:
+        pass
+
+
+_rule_sets = {}
+
+
+def load_rules(path=RULES_PATH):
+    """
+    Get the compiled rule set of the rule file.
+
+    The compiled form is cached on disk next to the temp files and is
+    rebuilt only when the rule file changes.
+    """
+    stamp = _stamp(path)
+    loaded = _rule_sets.get(path)
+    if loaded is not None and loaded[0] == stamp:
+        return loaded[1]
+    compiled = _read_cache(path, stamp)
+    if compiled is None:
+        with io.open(path, encoding='utf-8') as rules_file:
+            compiled = compile_rules(json.load(rules_file))
+        _write_cache(path, stamp, compiled)
+    rule_set = RuleSet(compiled)
+    _rule_sets[path] = (stamp, rule_set)
+    return rule_set
+
+
+# rule sources: rule -> function(record, context) -> value or None
+
+def _family_field(rule):
+    field = rule['field']
+
+    def get(record, context):
+        return context.family_names.field(record.door, field)
+    return get
+
+
+def _wall_material(rule):
+    key = ('wall_material', rule.get('layer', INTERIOR_LAYER),
+           rule['token'], rule.get('separator', '_'), rule.get('curtain_wall'))
+
+    def create_index(doc):
+        return WallMaterialIndex(doc, *key[1:])
+
+    def get(record, context):
+        if record.host is not None:
+            return context.index(key, create_index).get(record.host)
+    return get
+
+
+def _host_width(rule):
+    def get(record, context):
+        if record.host is not None:
+            return context.index(
+                'wall_width', WallWidthIndex).formatted(record.host)
+    return get
+
+
+def _room_count(rule):
+    values = rule['values']
+
+    def get(record, context):
+        count = len([room for room in (record.from_room, record.to_room)
+                     if room is not None])
+        return values.get(count)
+    return get
+
+
+def _symbol_function(rule):
+    not_equal = rule['not_equal']
+
+    def get(record, context):
+        return record.symbol_function != not_equal
+    return get
+
+
+def _flip_table(rule):
+    table = rule['table']
+
+    def get(record, context):
+        door = record.door
+        return table.get((bool(door.FacingFlipped), bool(door.HandFlipped)))
+    return get
+
+
+def _room_names_contain(rule):
+    tokens, true, false = rule['rooms'], rule['true'], rule['false']
+
+    def get(record, context):
+        is_in = any(token in name
+                    for name in record.room_names for token in tokens)
+        return true if is_in else false
+    return get
+
+
+SOURCES = {
+    'family_field': _family_field,
+    'wall_material': _wall_material,
+    'host_width': _host_width,
+    'room_count': _room_count,
+    'symbol_function': _symbol_function,
+    'flip_table': _flip_table,
+    'room_names_contain': _room_names_contain,
+}
+
+
+def _family_filter(when):
+    contains, not_contains = when
+    if not contains and not not_contains:
+        return None
+
+    def passes(family_name):
+        return (not contains or any(
+            token in family_name for token in contains)) and \
+            not any(token in family_name for token in not_contains)
+    return passes
+
+
+class RuleSet(object):
+    """
+    Door and room rules compiled from the rule file.
+
+    Attribute rules are turned into one evaluator per set of groups;
+    room priorities are matched once per room name and remembered.
+    """
+    def __init__(self, compiled):
+        self._compiled = compiled
+        self._ranks = dict((variant, {}) for variant in compiled['door_number'])
+
+    @property
+    def groups(self):
+        groups = []
+        for rule in self._compiled['attributes']:
+            if rule['group'] not in groups:
+                groups.append(rule['group'])
+        return groups
+
+    def family_name_index(self, doc):
+        """Get an empty index of family names decoded by the rules"""
+        separator, code_token, code_fields = self._compiled['family_name']
+        return FamilyNameIndex(doc, separator, code_token, code_fields)
+
+    def rooms(self, name):
+        return self._compiled['rooms'][name]
+
+    def evaluator(self, groups=None):
+        """Get a single evaluator of the rules of the groups"""
+        rules = [rule for rule in self._compiled['attributes']
+                 if groups is None or rule['group'] in groups]
+        return DoorEvaluator([
+            (
+                getattr(DB.BuiltInParameter, rule['builtin'])
+                if rule.get('builtin') else rule['parameter'],
+                SOURCES[rule['source']](rule),
+                _family_filter(rule['when']),
+                rule['demolished']
+            )
+            for rule in rules
+        ])
+
+    def room_rank(self, room_name, variant):
+        """Get the priority of the room name, lower is more important"""
+        ranks = self._ranks[variant]
+        if room_name not in ranks:
+            ranks[room_name] = next(
+                (rank for rank, name in enumerate(
+                    self._compiled['door_number'][variant])
+                 if name in room_name), None)
+        return ranks[room_name]
+
+    def choose_room(self, rooms, variant):
+        """
+        Get the room a door is numbered after.
+        rooms - (room, room name) pairs, the first one wins a tie
+        """
+        chosen, chosen_rank = None, None
+        for room, room_name in rooms:
+            if room is None:
+                continue
+            rank = self.room_rank(room_name or '', variant)
+            if rank is not None and (chosen_rank is None or rank < chosen_rank):
+                chosen, chosen_rank = room, rank
+        return chosen
+
+
+class DoorEvaluator(object):
+    """Compute all parameter values of a door in one pass over the rules"""
+    def __init__(self, rules):
+        self._rules = rules
+        self.include_demolished = any(rule[3] for rule in rules)
+
+    def evaluate(self, record, context):
+        values = []
+        for parameter, get, family_filter, demolished in self._rules:
+            if record.is_demolished and not demolished:
+                continue
+            if family_filter is not None and \
+                    not family_filter(record.family_name):
+                continue
+            value = get(record, context)
+            if value is not None:
+                values.append((parameter, value))
+        return values
\ No newline at end of file
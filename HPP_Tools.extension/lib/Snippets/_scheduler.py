@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+
+import clr
+clr.AddReference('RevitAPI')
+clr.AddReference('RevitAPIUI')
+from Autodesk.Revit.UI.Events import IdlingEventArgs
+from System import EventHandler
+
+from pyrevit import forms
+
+from Snippets._progress import ProgressReporter, format_progress
+from Snippets._telemetry import count, get_run_log
+from Snippets._trace import NULL_SPAN, get_tracer
+from Snippets._transaction import FailureReport
+
+PANEL_PATH = os.path.join(os.path.dirname(__file__), 'job_panel.xaml')
+
+# time spent on steps per Idling event, in seconds
+SLICE_SECONDS = 0.1
+
+
+class IdleJob(object):
+    """
+    A long-running check split into small steps.
+
+    steps() is a generator doing one small read-only unit of work per
+    iteration; it must not change the model, a step may only read it in
+    a temporary state it rolls back. It has to expect elements deleted
+    by the user between two steps. apply() writes the results in one
+    short transaction at the end. Messages are collected instead of
+    printed, so they can be shown in the status panel.
+    """
+    title = 'HPP Tools'
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.total = 0
+        self.done = 0
+        self.status = ''
+        self.messages = []
+        self.report = FailureReport()
+
+    def steps(self):
+        return iter(())
+
+    def apply(self):
+        pass
+
+    def log(self, message):
+        self.messages.append(message)
+
+    def get_element(self, element_id):
+        """Get the element or None if it was deleted meanwhile"""
+        element = self.doc.GetElement(element_id)
+        if element is None or not element.IsValidObject:
+            return None
+        return element
+
+
+def run_in_foreground(job):
+    """Run the job blocking with a ProgressBar, return False if cancelled"""
+    with ProgressReporter(job.total, job.title) as progress:
+        for _ in job.steps():
+            progress.update(job.done)
+            if progress.cancelled:
+                print('Operation is cancelled!')
+                return False
+    job.apply()
+    count('processed', job.done)
+    for message in job.messages:
+        print(message)
+    job.report.print_report()
+    return True
+
+
+# working with the status panel
+
+class JobPanel(forms.WPFWindow):
+    """Modeless panel showing the progress of a background job"""
+    def __init__(self, scheduler):
+        forms.WPFWindow.__init__(self, PANEL_PATH)
+        self._scheduler = scheduler
+        self.title_text.Text = scheduler.job.title
+        self.Closed += self._closed
+
+    def update(self, done, total, status, elapsed=0):
+        self.progress_bar.Value = float(done) / total if total else 0
+        self.status_text.Text = status or format_progress(done, total, elapsed)
+
+    def finish(self, text):
+        self.progress_bar.Value = 1
+        self.status_text.Text = text
+        self.action_button.Content = 'Close'
+
+    def action_click(self, sender, args):
+        if self._scheduler.is_running:
+            self._scheduler.cancel()
+        else:
+            self.Close()
+
+    def _closed(self, sender, args):
+        if self._scheduler.is_running:
+            self._scheduler.cancel()
+
+
+# working with the Idling event
+
+# keeps running schedulers alive while the engine runs
+_schedulers = {}
+
+
+class IdleScheduler(object):
+    """
+    Run an IdleJob in time slices while Revit is idle.
+
+    Every Idling event runs the steps of the job for SLICE_SECONDS and
+    asks Revit to raise the event again without delay, so the user can
+    keep working in between. Slices only run while the document of the
+    job is active. When the steps are exhausted, apply() runs inside
+    the Idling event, which allows transactions.
+    The calling script needs __persistentengine__ = True.
+    """
+    def __init__(self, uiapp, job, slice_seconds=SLICE_SECONDS):
+        self._uiapp = uiapp
+        self.job = job
+        self._slice_seconds = slice_seconds
+        self._steps = None
+        # time spent in slices, the user's idle time is not counted
+        self._elapsed = 0.0
+        self._handler = EventHandler[IdlingEventArgs](self._on_idling)
+        self.panel = None
+        self.is_running = False
+        self.cancelled = False
+        self.error = None
+        # spans of the slices are added to the run that started the job,
+        # which is logged when the job is done
+        self._tracer = get_tracer()
+        self._run_log = get_run_log()
+
+    def _span(self, name, **args):
+        if self._tracer is None:
+            return NULL_SPAN
+        return self._tracer.span(name, **args)
+
+    def start(self):
+        self._steps = iter(self.job.steps())
+        self.is_running = True
+        _schedulers[self.job.title] = self
+        self.panel = JobPanel(self)
+        self.panel.update(0, self.job.total, 'Waiting for Revit to be idle')
+        self.panel.show()
+        if self._run_log is not None:
+            self._run_log.deferred = True
+        self._uiapp.Idling += self._handler
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _is_job_document_active(self):
+        ui_document = self._uiapp.ActiveUIDocument
+        return ui_document is not None and \
+            ui_document.Document.Equals(self.job.doc)
+
+    def _on_idling(self, sender, args):
+        if not self.job.doc.IsValidObject:
+            self._finish('Cancelled, the document was closed.')
+            return
+        if self.cancelled:
+            self._finish('Cancelled, nothing was changed.')
+            return
+        if not self._is_job_document_active():
+            return
+        start = time.time()
+        try:
+            with self._span('idle slice', job=self.job.title):
+                deadline = start + self._slice_seconds
+                while time.time() < deadline:
+                    next(self._steps)
+        except StopIteration:
+            self._complete()
+            return
+        except Exception as error:
+            self.error = error
+            self._finish('Failed: {}'.format(error))
+            return
+        self._elapsed += time.time() - start
+        self.panel.update(self.job.done, self.job.total, self.job.status,
+                          self._elapsed)
+        args.SetRaiseWithoutDelay()
+
+    def _complete(self):
+        try:
+            with self._span('apply', job=self.job.title):
+                self.job.apply()
+        except Exception as error:
+            self.error = error
+            self._finish('Failed: {}'.format(error))
+            return
+        messages = list(self.job.messages)
+        handled = self.job.report.count()
+        if handled:
+            messages.append(
+                '{} warnings and errors were handled.'.format(handled))
+        self._finish('\n'.join(messages) or 'Done.')
+
+    def _finish(self, text):
+        self._uiapp.Idling -= self._handler
+        self.is_running = False
+        _schedulers.pop(self.job.title, None)
+        self.panel.finish(text)
+        if self._run_log is not None:
+            if self.error is not None:
+                self._run_log.fail(self.error)
+            self._run_log.count('processed', self.job.done)
+            self._run_log.write(self._tracer.phases)
+        if self._tracer is not None and self._tracer.keep_events:
+            self._tracer.write()
+
+
+def is_job_running(title):
+    return title in _schedulers
+
+
+def start_in_background(uiapp, job):
+    """Start the job unless a job with the same title is running"""
+    if is_job_running(job.title):
+        forms.alert('"{}" is already running.'.format(job.title))
+        return None
+    scheduler = IdleScheduler(uiapp, job)
+    scheduler.start()
+    return scheduler
\ No newline at end of file
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit.DB import FilteredElementCollector as FEC
+from Autodesk.Revit.DB import ExtensibleStorage as ES
+from System import Guid, String
+
+STATE_FIELD = 'State'
+
+
+class JsonStorage(object):
+    """
+    State of a tool stored in the project as JSON, in the one String
+    field of an ExtensibleStorage schema on a DataStorage element.
+
+    Example:
+        storage = JsonStorage('3d8e5b1a-...', 'HPP_Numbering', 'Numbers')
+        state = storage.load(doc)
+        with DB.Transaction(doc, 'Numbering') as t:
+            t.Start()
+            storage.save(doc, state)
+            t.Commit()
+    """
+    def __init__(self, guid, name, documentation):
+        self.guid = Guid(guid)
+        self.name = name
+        self.documentation = documentation
+
+    def get_schema(self):
+        schema = ES.Schema.Lookup(self.guid)
+        if schema is not None:
+            return schema
+        builder = ES.SchemaBuilder(self.guid)
+        builder.SetSchemaName(self.name)
+        builder.SetDocumentation(self.documentation)
+        builder.SetReadAccessLevel(ES.AccessLevel.Public)
+        builder.SetWriteAccessLevel(ES.AccessLevel.Public)
+        builder.AddSimpleField(STATE_FIELD, String)
+        return builder.Finish()
+
+    def _get_storage(self, doc, schema):
+        for storage in FEC(doc).OfClass(ES.DataStorage):
+            if storage.GetEntity(schema).IsValid():
+                return storage
+
+    def load(self, doc):
+        """Get the stored state, an empty dict if nothing is stored"""
+        schema = self.get_schema()
+        storage = self._get_storage(doc, schema)
+        if storage is None:
+            return {}
+        state = storage.GetEntity(schema).Get[String](STATE_FIELD)
+        return json.loads(state) if state else {}
+
+    def save(self, doc, state):
+        """Store the state, has to be called inside a transaction"""
+        schema = self.get_schema()
+        storage = self._get_storage(doc, schema)
+        if storage is None:
+            if not state:
+                return
+            storage = ES.DataStorage.Create(doc)
+        entity = ES.Entity(schema)
+        entity.Set[String](STATE_FIELD, json.dumps(state, sort_keys=True))
+        storage.SetEntity(entity)
\ No newline at end of file
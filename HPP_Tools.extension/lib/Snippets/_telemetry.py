@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import platform
+import tempfile
+import time
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+
+from Snippets._config import get_option
+
+RUN_LOG_OPTION = 'run_log'
+RUN_LOG_FOLDER_OPTION = 'run_log_folder'
+DEFAULT_RUN_LOG_FOLDER = os.path.join(
+    os.getenv('APPDATA') or tempfile.gettempdir(), 'HPP_Tools', 'runs')
+
+
+def is_enabled():
+    return bool(get_option(RUN_LOG_OPTION, True))
+
+
+def get_log_path(folder=None):
+    """
+    Get the log file of this user and computer. Every user writes an own
+    file, so the folder can be a share of the office.
+    """
+    folder = folder or get_option(RUN_LOG_FOLDER_OPTION,
+                                  DEFAULT_RUN_LOG_FOLDER)
+    user = os.getenv('USERNAME') or os.getenv('USER') or 'user'
+    return os.path.join(folder, '{}_{}.jsonl'.format(
+        user, platform.node() or 'computer'))
+
+
+def _get_document():
+    try:
+        ui_document = __revit__.ActiveUIDocument
+    except (NameError, AttributeError):
+        return None
+    return ui_document.Document if ui_document is not None else None
+
+
+def describe_model(doc):
+    """
+    Get the name, the path, the element count and the Revit version of
+    the model. The path tells apart models with the same name.
+    """
+    if doc is None:
+        return {'model': None, 'model_path': None, 'model_elements': None,
+                'revit': None}
+    return {
+        'model': doc.Title,
+        'model_path': doc.PathName or None,
+        'model_elements': DB.FilteredElementCollector(doc)
+        .WhereElementIsNotElementType().GetElementCount(),
+        'revit': doc.Application.VersionNumber,
+    }
+
+
+class RunLog(object):
+    """
+    One line of the run log: the tool, the model, the wall time of the
+    run and of its phases, the number of collected, processed and
+    written elements, the handled failures and the error the run failed
+    with.
+    """
+    def __init__(self, tool, doc=None, path=None):
+        self.tool = tool.replace('\n', ' ')
+        self.doc = doc
+        self.path = path or get_log_path()
+        self.counts = {}
+        self.deferred = False
+        self.error = None
+        self._started = time.time()
+
+    def count(self, name, number=1):
+        self.counts[name] = self.counts.get(name, 0) + number
+
+    def fail(self, error):
+        self.error = '{}: {}'.format(type(error).__name__, error)
+
+    def record(self, phases=None):
+        record = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S',
+                                  time.localtime(self._started)),
+            'tool': self.tool,
+            'user': os.getenv('USERNAME') or os.getenv('USER'),
+            'wall_time': round(time.time() - self._started, 3),
+            'phases': dict((name, round(seconds, 3))
+                           for name, seconds in (phases or {}).items()),
+            'elements': dict((name, number)
+                             for name, number in self.counts.items()
+                             if name not in ('written', 'failures')),
+            'written': self.counts.get('written', 0),
+            'failures': self.counts.get('failures', 0),
+            'error': self.error,
+        }
+        record.update(describe_model(self.doc))
+        return record
+
+    def write(self, phases=None):
+        """
+        Append the run to the log, return the record.
+        The log must never break a tool, so IO errors are ignored.
+        """
+        record = self.record(phases)
+        try:
+            folder = os.path.dirname(self.path)
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            with open(self.path, 'a') as log_file:
+                log_file.write(json.dumps(record, sort_keys=True) + '\n')
+        except (IOError, OSError):
+            pass
+        return record
+
+
+# working with the run of the current script
+
+_run_log = None
+
+
+def get_run_log():
+    """Get the log of the current run or None if logging is off"""
+    return _run_log
+
+
+def start_run_log(tool):
+    global _run_log
+    _run_log = RunLog(tool, _get_document()) if is_enabled() else None
+    return _run_log
+
+
+def count(name, number=1):
+    """Add to an element count of the current run, e.g. 'written'"""
+    if _run_log is not None:
+        _run_log.count(name, number)
\ No newline at end of file
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from Snippets._apicalls import get_counter, start_counting, \
+    stop_counting
+from Snippets._bootstrap import pop_started
+from Snippets._config import get_option
+from Snippets._telemetry import get_run_log, start_run_log
+
+TRACING_OPTION = 'tracing'
+TRACE_FOLDER_OPTION = 'trace_folder'
+DEFAULT_TRACE_FOLDER = os.path.join(
+    tempfile.gettempdir(), 'HPP_Tools', 'traces')
+
+# high resolution clock, time.clock on IronPython 2.7
+_clock = getattr(time, 'perf_counter', None) or time.clock
+
+
+class _NullSpan(object):
+    """Span used while tracing is disabled, does nothing"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span(object):
+    """A timed section of a run, recorded when the block is left"""
+    def __init__(self, tracer, name, args):
+        self._tracer = tracer
+        self.name = name
+        self.args = args
+        self._start = None
+
+    def __enter__(self):
+        self._start = self._tracer.now()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.args['error'] = '{}: {}'.format(
+                exc_type.__name__, exc_value)
+        self._tracer.add(self.name, self._start, self._tracer.now(),
+                         self.args)
+        return False
+
+    def set(self, **args):
+        """Add arguments shown with the span, e.g. element counts"""
+        self.args.update(args)
+
+
+class Tracer(object):
+    """
+    Spans of one run of a tool in the Chrome trace event format.
+
+    The written JSON file opens in chrome://tracing and in Perfetto.
+    Timestamps are microseconds since the start of the run.
+    The time of the spans is also summed up per name in phases, in
+    seconds. Without keep_events only these sums are kept.
+    origin is the clock value the run started at, by default now.
+    """
+    def __init__(self, tool, folder=None, keep_events=True, origin=None):
+        self.tool = tool
+        self.folder = folder or get_option(
+            TRACE_FOLDER_OPTION, DEFAULT_TRACE_FOLDER)
+        self.keep_events = keep_events
+        self.events = []
+        self.phases = {}
+        self._origin = _clock() if origin is None else origin
+        self._pid = os.getpid()
+        name = re.sub(r'[^\w.-]+', '_', tool.replace('\n', ' ')).strip('_')
+        self.path = os.path.join(self.folder, '{}_{}.json'.format(
+            name or 'run', time.strftime('%Y%m%d_%H%M%S')))
+
+    def now(self):
+        return (_clock() - self._origin) * 1e6
+
+    def span(self, name, **args):
+        return Span(self, name, args)
+
+    def add(self, name, start, end, args=None):
+        self.phases[name] = self.phases.get(name, 0) + (end - start) / 1e6
+        if not self.keep_events:
+            return
+        self.events.append({
+            'name': name,
+            'cat': self.tool,
+            'ph': 'X',
+            'ts': round(start, 1),
+            'dur': round(end - start, 1),
+            'pid': self._pid,
+            'tid': threading.current_thread().ident or 0,
+            'args': args or {},
+        })
+
+    def write(self):
+        """Write the trace file, return its path"""
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+        metadata = {'name': 'process_name', 'ph': 'M', 'pid': self._pid,
+                    'args': {'name': self.tool.replace('\n', ' ')}}
+        with open(self.path, 'w') as trace_file:
+            json.dump({'traceEvents': [metadata] + self.events,
+                       'displayTimeUnit': 'ms'}, trace_file)
+        return self.path
+
+
+# working with the run of the current script
+
+_tracer = None
+
+
+def is_enabled():
+    return bool(get_option(TRACING_OPTION, False))
+
+
+def get_tracer():
+    """
+    Get the tracer of the current run or None if neither tracing nor
+    the run log is on. Without tracing it only sums up the phases.
+    """
+    return _tracer
+
+
+def start_run(tool):
+    """
+    Start tracing and logging a run of the tool, as far as they are
+    switched on, and counting its API calls if that is switched on.
+    The time since bootstrap() is recorded as the startup phase of the
+    run.
+    """
+    global _tracer
+    start_counting()
+    started = pop_started()
+    tracing = is_enabled()
+    if start_run_log(tool) is not None or tracing:
+        _tracer = Tracer(tool, keep_events=tracing, origin=started)
+        if started is not None:
+            _tracer.add('startup', 0, _tracer.now())
+    else:
+        _tracer = None
+    return _tracer
+
+
+def finish_run(error=None):
+    """
+    Append the current run to the run log and write its trace.
+    The error the run failed with, if any, is logged with the run.
+    Returns the path of the trace or None if tracing is off.
+    """
+    run_log = get_run_log()
+    if run_log is not None and error is not None:
+        run_log.fail(error)
+    stop_counting()
+    if get_counter() is not None:
+        get_counter().print_report()
+    if _tracer is None:
+        return None
+    # runs going on in the background are logged when they are done
+    if run_log is not None and not run_log.deferred:
+        run_log.write(_tracer.phases)
+    if not _tracer.keep_events:
+        return None
+    path = _tracer.write()
+    print('Trace is written to {}'.format(path))
+    return path
+
+
+@contextmanager
+def logged_run(tool):
+    """
+    Run the block as a run of the tool. The run is logged even if the
+    block raises, the error is logged with it.
+
+    Example:
+        with logged_run(__title__):
+            ...
+    """
+    start_run(tool)
+    error = None
+    try:
+        yield
+    except Exception as exception:
+        error = exception
+        raise
+    finally:
+        finish_run(error)
+
+
+def span(name, **args):
+    """
+    Time the block as a span of the current run.
+
+    Example:
+        with span('boundaries', rooms=len(rooms)):
+            ...
+    """
+    if _tracer is None:
+        return NULL_SPAN
+    return _tracer.span(name, **args)
+
+
+def traced(name=None):
+    """Decorator timing every call of the function as a span"""
+    def decorator(function):
+        span_name = name or function.__name__
+
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return function(*args, **kwargs)
+            with _tracer.span(span_name):
+                return function(*args, **kwargs)
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+    return decorator
\ No newline at end of file
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+
+from Snippets._telemetry import count
+from Snippets._trace import span
+
+DELETED = 'deleted'
+RESOLVED = 'resolved'
+ROLLED_BACK = 'rolled back'
+SKIPPED = 'skipped'
+
+
+class FailureRecord(object):
+    """A failure message or an exception handled during a batch run"""
+    def __init__(self, severity, description, action, element_ids):
+        self.severity = severity
+        self.description = description
+        self.action = action
+        self.element_ids = element_ids
+
+
+class FailureReport(object):
+    """
+    Structured report of a batch run.
+
+    Collects Revit failure messages handled by the failures
+    preprocessor and exceptions of operations run through attempt().
+    """
+    def __init__(self):
+        self.records = []
+        self.statuses = {}
+
+    def add(self, severity, description, action, element_ids=()):
+        self.records.append(FailureRecord(
+            severity, description, action,
+            [element_id.IntegerValue for element_id in element_ids]))
+        count('failures')
+
+    @property
+    def is_empty(self):
+        return not self.records
+
+    def count(self, action=None):
+        return len([record for record in self.records
+                    if action is None or record.action == action])
+
+    def summary(self):
+        """Get a dict of (severity, action, description) -> records"""
+        summary = {}
+        for record in self.records:
+            key = (record.severity, record.action, record.description)
+            summary.setdefault(key, []).append(record)
+        return summary
+
+    def print_report(self, max_ids=10):
+        if self.is_empty:
+            return
+        with span('print report'):
+            self._print_report(max_ids)
+
+    def _print_report(self, max_ids):
+        print('***')
+        print('Warnings and errors handled during the run:')
+        for key, records in sorted(self.summary().items()):
+            severity, action, description = key
+            print('{} x {} ({}): {}'.format(
+                len(records), severity, action, description))
+            element_ids = sorted(set(
+                element_id for record in records
+                for element_id in record.element_ids))
+            if element_ids:
+                print('    elements: {}{}'.format(
+                    ', '.join(str(element_id)
+                              for element_id in element_ids[:max_ids]),
+                    ' ...' if len(element_ids) > max_ids else ''))
+        for name, status in sorted(self.statuses.items()):
+            if status != DB.TransactionStatus.Committed:
+                print('Transaction "{}" was not committed: {}'.format(
+                    name, status))
+
+
+class BatchFailuresPreprocessor(DB.IFailuresPreprocessor):
+    """
+    Handle failures of a batch transaction without any dialog.
+
+    Warnings are deleted, errors with a resolution are resolved and all
+    of them are recorded in the report. If an error cannot be resolved,
+    the transaction is rolled back instead of waiting for the user.
+    """
+    def __init__(self, report, resolve_errors=True):
+        self._report = report
+        self._resolve_errors = resolve_errors
+
+    def PreprocessFailures(self, failures_accessor):
+        resolved = False
+        for failure in failures_accessor.GetFailureMessages():
+            severity = failure.GetSeverity()
+            description = failure.GetDescriptionText()
+            element_ids = list(failure.GetFailingElementIds())
+            if severity == DB.FailureSeverity.Warning:
+                failures_accessor.DeleteWarning(failure)
+                self._report.add('Warning', description, DELETED, element_ids)
+            elif self._resolve_errors and failure.HasResolutions():
+                failures_accessor.ResolveFailure(failure)
+                self._report.add('Error', description, RESOLVED, element_ids)
+                resolved = True
+            else:
+                self._report.add(
+                    'Error', description, ROLLED_BACK, element_ids)
+                return DB.FailureProcessingResult.ProceedWithRollBack
+        if resolved:
+            return DB.FailureProcessingResult.ProceedWithCommit
+        return DB.FailureProcessingResult.Continue
+
+
+class BatchTransaction(object):
+    """
+    Transaction for unattended batch runs.
+
+    Failures are handled by the BatchFailuresPreprocessor and collected
+    in the report, no modal failure dialog is shown. The transaction is
+    rolled back if the block raises. With roll_back=True it is always
+    rolled back, to read the model in a temporary state.
+
+    Example:
+        with BatchTransaction(doc, 'Join Elements') as t:
+            t.attempt(DB.JoinGeometryUtils.JoinGeometry, doc, a, b)
+        t.report.print_report()
+    """
+    def __init__(self, doc, name, report=None, resolve_errors=True,
+                 roll_back=False):
+        self.doc = doc
+        self.name = name
+        self.report = report or FailureReport()
+        self._resolve_errors = resolve_errors
+        self._roll_back = roll_back
+        self._transaction = None
+        self._span = None
+        self.status = None
+
+    def __enter__(self):
+        self._span = span('transaction', transaction=self.name)
+        self._span.__enter__()
+        self._transaction = DB.Transaction(self.doc, self.name)
+        options = self._transaction.GetFailureHandlingOptions()
+        options.SetFailuresPreprocessor(BatchFailuresPreprocessor(
+            self.report, self._resolve_errors))
+        options.SetForcedModalHandling(False)
+        options.SetClearAfterRollback(True)
+        self._transaction.SetFailureHandlingOptions(options)
+        self._transaction.Start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None or self._roll_back:
+            self._transaction.RollBack()
+            self.status = DB.TransactionStatus.RolledBack
+        else:
+            with span('commit', transaction=self.name):
+                self.status = self._transaction.Commit()
+        # an intended roll back is not reported
+        if not self._roll_back:
+            self.report.statuses[self.name] = self.status
+        self._transaction.Dispose()
+        self._span.__exit__(exc_type, exc_value, traceback)
+        return False
+
+    @property
+    def is_committed(self):
+        return self.status == DB.TransactionStatus.Committed
+
+    def attempt(self, operation, *args):
+        """
+        Run a model operation, record an exception instead of raising.
+        Returns the result of the operation or None if it failed.
+        """
+        try:
+            return operation(*args)
+        except Exception as error:
+            element_ids = [argument.Id for argument in args
+                           if isinstance(argument, DB.Element)] + \
+                [argument for argument in args
+                 if isinstance(argument, DB.ElementId)]
+            self.report.add(
+                'Exception',
+                '{}: {}'.format(getattr(operation, '__name__', operation),
+                                error),
+                SKIPPED, element_ids)
\ No newline at end of file
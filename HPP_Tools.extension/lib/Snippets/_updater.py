@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+from System import Guid
+from pyrevit import script
+
+from Snippets._doors import ATTRIBUTE_NAMES, DoorAttributePipeline, \
+    collect_doors
+from Snippets._phases import get_phase_resolver
+
+UPDATER_GUID = Guid('6f1c2a4e-93b7-4d0a-9a3e-2b5d8c7e41f0')
+UPDATER_NAME = 'HPP door attributes'
+
+
+def get_updater_id(addin_id):
+    return DB.UpdaterId(addin_id, UPDATER_GUID)
+
+
+def _category_id(builtin_category):
+    return DB.ElementId(builtin_category).IntegerValue
+
+
+class DoorAttributeUpdater(DB.IUpdater):
+    """
+    Keep HPP door attributes up to date while the model is edited.
+
+    Placed, flipped or retyped doors, doors of walls that changed their
+    type and doors of renamed rooms are recomputed in the transaction
+    of the edit, so the cost depends on the size of the edit only.
+    Placing, moving or deleting rooms and room separation lines changes
+    the rooms of doors anywhere, these edits re-read the rooms of all
+    doors and recompute the doors whose rooms changed.
+
+    The pipeline reads wall types and families that may change between
+    edits and is created per edit, only the working phase and the doors
+    of the rooms are kept per document.
+    """
+    def __init__(self, addin_id, attributes=ATTRIBUTE_NAMES):
+        self._updater_id = get_updater_id(addin_id)
+        self._attributes = attributes
+        self._documents = {}
+
+    def GetUpdaterId(self):
+        return self._updater_id
+
+    def GetUpdaterName(self):
+        return UPDATER_NAME
+
+    def GetAdditionalInformation(self):
+        return 'Fills HPP door parameters of changed doors'
+
+    def GetChangePriority(self):
+        return DB.ChangePriority.DoorsOpeningsWindows
+
+    def _get_state(self, doc):
+        """Get the working phase and the room door index of the document"""
+        key = doc.GetHashCode()
+        resolver = get_phase_resolver(doc)
+        state = self._documents.get(key)
+        # phases were renamed or reordered, the working phase may differ
+        if state is None or state[0] is not resolver:
+            state = self._documents[key] = (
+                resolver, RoomDoorIndex(doc, resolver.new_phase))
+        return resolver.new_phase, state[1]
+
+    def Execute(self, data):
+        doc = data.GetDocument()
+        changed_ids = list(data.GetAddedElementIds()) + \
+            list(data.GetModifiedElementIds())
+        # an exception would disable the updater for the session
+        try:
+            phase, room_doors = self._get_state(doc)
+            if changes_room_layout(doc, data, room_doors):
+                changed_ids.extend(room_doors.rebuild())
+            else:
+                for element_id in data.GetDeletedElementIds():
+                    room_doors.remove(element_id.IntegerValue)
+            doors = get_affected_doors(doc, changed_ids, room_doors)
+            if doors:
+                pipeline = DoorAttributePipeline(
+                    doc, self._attributes, phase)
+                pipeline.write(pipeline.compute(doors))
+        except Exception as error:
+            script.get_logger().error(
+                '{} could not be updated: {}'.format(UPDATER_NAME, error))
+
+    def add_triggers(self):
+        updater_id = self._updater_id
+        type_change = DB.Element.GetChangeTypeParameter(
+            DB.ElementId(DB.BuiltInParameter.ELEM_TYPE_PARAM))
+        door_filter = DB.ElementCategoryFilter(DB.BuiltInCategory.OST_Doors)
+        DB.UpdaterRegistry.AddTrigger(
+            updater_id, door_filter, DB.Element.GetChangeTypeElementAddition())
+        # keeps the doors of the rooms up to date
+        DB.UpdaterRegistry.AddTrigger(
+            updater_id, door_filter, DB.Element.GetChangeTypeElementDeletion())
+        # flipping and moving a door changes its geometry
+        DB.UpdaterRegistry.AddTrigger(
+            updater_id, door_filter, DB.Element.GetChangeTypeGeometry())
+        DB.UpdaterRegistry.AddTrigger(updater_id, door_filter, type_change)
+        DB.UpdaterRegistry.AddTrigger(
+            updater_id, DB.ElementClassFilter(DB.Wall), type_change)
+        room_filter = DB.ElementCategoryFilter(DB.BuiltInCategory.OST_Rooms)
+        DB.UpdaterRegistry.AddTrigger(
+            updater_id, room_filter,
+            DB.Element.GetChangeTypeParameter(
+                DB.ElementId(DB.BuiltInParameter.ROOM_NAME))
+        )
+        # placed, moved and deleted rooms and room separation lines
+        # change the rooms of the doors
+        for layout_filter in (room_filter, DB.ElementCategoryFilter(
+                DB.BuiltInCategory.OST_RoomSeparationLines)):
+            for change_type in (DB.Element.GetChangeTypeElementAddition(),
+                                DB.Element.GetChangeTypeElementDeletion(),
+                                DB.Element.GetChangeTypeGeometry()):
+                DB.UpdaterRegistry.AddTrigger(
+                    updater_id, layout_filter, change_type)
+
+
+class RoomDoorIndex(object):
+    """
+    Doors by the ids of their from and to rooms in the phase.
+
+    Built by one scan of the doors when a room is renamed first, then
+    kept up to date with the doors the updater sees placed, changed or
+    deleted, so later renames cost only the doors of the room. Changes
+    of the room layout make it scan the doors again.
+    """
+    def __init__(self, doc, phase):
+        self._doc = doc
+        self._phase = phase
+        self._rooms = None
+        self._doors = None
+
+    def _build(self):
+        self._rooms = {}
+        self._doors = {}
+        for door in collect_doors(self._doc, include_demolished=True):
+            self._add(door)
+
+    def _add(self, door):
+        door_id = door.Id.IntegerValue
+        room_ids = set(
+            room.Id.IntegerValue
+            for room in (door.FromRoom[self._phase], door.ToRoom[self._phase])
+            if room is not None)
+        self._rooms[door_id] = room_ids
+        for room_id in room_ids:
+            self._doors.setdefault(room_id, {})[door_id] = door.Id
+
+    @property
+    def is_built(self):
+        return self._rooms is not None
+
+    def has_door(self, door_id):
+        return self._rooms is not None and door_id in self._rooms
+
+    def rebuild(self):
+        """
+        Re-read the rooms of all doors after the room layout changed.
+        Returns the ids of the doors whose rooms changed, none if the
+        index was not built before.
+        """
+        previous = self._rooms
+        self._build()
+        if previous is None:
+            return []
+        return [DB.ElementId(door_id)
+                for door_id, room_ids in self._rooms.items()
+                if previous.get(door_id) != room_ids]
+
+    def update(self, door):
+        """Re-read the rooms of a placed or changed door"""
+        if self._rooms is None:
+            return
+        self.remove(door.Id.IntegerValue)
+        self._add(door)
+
+    def remove(self, door_id):
+        if self._rooms is None:
+            return
+        for room_id in self._rooms.pop(door_id, ()):
+            self._doors.get(room_id, {}).pop(door_id, None)
+
+    def get(self, room_ids):
+        """Get the ids of the doors of the rooms"""
+        if self._rooms is None:
+            self._build()
+        door_ids = []
+        for room_id in room_ids:
+            door_ids.extend(self._doors.get(room_id, {}).values())
+        return door_ids
+
+
+def changes_room_layout(doc, data, room_doors):
+    """
+    Were rooms placed, moved or deleted or room separation lines drawn,
+    moved or deleted by the edit. Deleted elements are rooms or lines
+    unless the index knows them as doors.
+    """
+    room_category = _category_id(DB.BuiltInCategory.OST_Rooms)
+    line_category = _category_id(DB.BuiltInCategory.OST_RoomSeparationLines)
+    geometry_change = DB.Element.GetChangeTypeGeometry()
+    for element_id in data.GetAddedElementIds():
+        element = doc.GetElement(element_id)
+        if element is not None and element.Category is not None and \
+                element.Category.Id.IntegerValue in (
+                    room_category, line_category):
+            return True
+    for element_id in data.GetModifiedElementIds():
+        element = doc.GetElement(element_id)
+        if element is None or element.Category is None:
+            continue
+        category = element.Category.Id.IntegerValue
+        if category == line_category or category == room_category and \
+                data.IsChangeTriggered(element_id, geometry_change):
+            return True
+    if room_doors.is_built:
+        for element_id in data.GetDeletedElementIds():
+            if not room_doors.has_door(element_id.IntegerValue):
+                return True
+    return False
+
+
+def get_affected_doors(doc, element_ids, room_doors):
+    """Get doors whose attributes depend on the changed elements"""
+    door_category = _category_id(DB.BuiltInCategory.OST_Doors)
+    wall_category = _category_id(DB.BuiltInCategory.OST_Walls)
+    room_category = _category_id(DB.BuiltInCategory.OST_Rooms)
+    doors = {}
+    room_ids = set()
+    for element_id in element_ids:
+        element = doc.GetElement(element_id)
+        if element is None or element.Category is None:
+            continue
+        category = element.Category.Id.IntegerValue
+        if category == door_category:
+            doors[element_id.IntegerValue] = element
+        elif category == wall_category:
+            for insert_id in element.FindInserts(True, False, False, False):
+                insert = doc.GetElement(insert_id)
+                if insert.Category is not None and \
+                        insert.Category.Id.IntegerValue == door_category:
+                    doors[insert_id.IntegerValue] = insert
+        elif category == room_category:
+            room_ids.add(element_id.IntegerValue)
+    # placed, moved or flipped doors may have other rooms now
+    for door in doors.values():
+        room_doors.update(door)
+    if room_ids:
+        for door_id in room_doors.get(room_ids):
+            door = doc.GetElement(door_id)
+            if door is not None:
+                doors[door_id.IntegerValue] = door
+    return list(doors.values())
+
+
+# working with the registration
+
+# keeps registered updaters alive while the engine runs
+_updaters = {}
+
+
+def is_door_updater_registered(addin_id):
+    return DB.UpdaterRegistry.IsUpdaterRegistered(get_updater_id(addin_id))
+
+
+def register_door_updater(addin_id):
+    """Register the updater for all documents, return True if done now"""
+    if is_door_updater_registered(addin_id):
+        return False
+    updater = DoorAttributeUpdater(addin_id)
+    # optional: documents open without warnings if the updater is missing
+    DB.UpdaterRegistry.RegisterUpdater(updater, True)
+    updater.add_triggers()
+    _updaters[UPDATER_GUID.ToString()] = updater
+    return True
+
+
+def unregister_door_updater(addin_id):
+    """Unregister the updater, return True if it was registered"""
+    if not is_door_updater_registered(addin_id):
+        return False
+    DB.UpdaterRegistry.UnregisterUpdater(get_updater_id(addin_id))
+    _updaters.pop(UPDATER_GUID.ToString(), None)
+    return True
\ No newline at end of file
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+
+# which compound structure layer gives the wall material
+EXTERIOR_LAYER = 'first'
+INTERIOR_LAYER = 'last'
+CORE_LAYER = 'core'
+LAYER_RULES = (EXTERIOR_LAYER, INTERIOR_LAYER, CORE_LAYER)
+
+
+def _material_layers(compound_structure):
+    """Get layers with a material, ordered from exterior to interior"""
+    return [layer for layer in compound_structure.GetLayers()
+            if layer.MaterialId != DB.ElementId.InvalidElementId]
+
+
+def get_layer_material_id(wall_type, layer_rule=INTERIOR_LAYER):
+    """
+    Get the material id of the wall type layer chosen by the rule.
+    layer_rule - 'first' (exterior), 'last' (interior), 'core' (first
+    structural core layer) or the index of the layer
+    """
+    compound_structure = wall_type.GetCompoundStructure()
+    if compound_structure is None:
+        return None
+    layers = _material_layers(compound_structure)
+    if not layers:
+        return None
+    if layer_rule == EXTERIOR_LAYER:
+        return layers[0].MaterialId
+    if layer_rule == INTERIOR_LAYER:
+        return layers[-1].MaterialId
+    if layer_rule == CORE_LAYER:
+        structural = compound_structure.StructuralMaterialIndex
+        if structural >= 0:
+            return compound_structure.GetMaterialId(structural)
+        return layers[0].MaterialId
+    index = int(layer_rule)
+    return layers[index].MaterialId if -len(layers) <= index < len(layers) \
+        else None
+
+
+class WallMaterialIndex(object):
+    """
+    HPP material code of wall types, resolved once per WallType.
+
+    The code is a token of the material name of the layer chosen by
+    the layer rule. Curtain walls have no layers and get the explicit
+    curtain wall value.
+    """
+    def __init__(self, doc, layer_rule=INTERIOR_LAYER, token=2,
+                 separator='_', curtain_wall_value=None):
+        if layer_rule not in LAYER_RULES and \
+                not isinstance(layer_rule, int):
+            raise ValueError('Unknown layer rule "{}"'.format(layer_rule))
+        self._doc = doc
+        self._layer_rule = layer_rule
+        self._token = token
+        self._separator = separator
+        self._curtain_wall_value = curtain_wall_value
+        self._codes = {}
+
+    def _resolve(self, wall_type):
+        if wall_type.Kind == DB.WallKind.Curtain:
+            return self._curtain_wall_value
+        material_id = get_layer_material_id(wall_type, self._layer_rule)
+        if material_id is None:
+            return None
+        tokens = self._doc.GetElement(material_id).Name.split(
+            self._separator)
+        return tokens[self._token] if len(tokens) > self._token else None
+
+    def get(self, wall):
+        """Get the material code of the wall type of the wall"""
+        type_id = wall.GetTypeId()
+        key = type_id.IntegerValue
+        if key not in self._codes:
+            self._codes[key] = self._resolve(self._doc.GetElement(type_id))
+        return self._codes[key]
+
+
+# working with wall widths
+
+def get_mullion_width(mullion_type):
+    """Get the thickness (diameter) of a rectangular (round) mullion type"""
+    width_parameter = mullion_type.Parameter[
+        DB.BuiltInParameter.RECT_MULLION_THICK]
+    if width_parameter:
+        return width_parameter.AsDouble()
+    radius_parameter = mullion_type.Parameter[
+        DB.BuiltInParameter.CIRC_MULLION_RADIUS]
+    if radius_parameter:
+        return radius_parameter.AsDouble() * 2
+
+
+def get_wall_width(doc, wall, mullion_widths=None):
+    """
+    Get the wall width.
+
+    For basic and stacked walls the Width property is returned. For
+    curtain walls the maximal thickness (diameter) of the mullions is
+    returned. mullion_widths - optional cache of widths by mullion type
+    """
+    if wall.WallType.Kind != DB.WallKind.Curtain:
+        return wall.Width
+    if mullion_widths is None:
+        mullion_widths = {}
+    mullion_type_ids = set(
+        doc.GetElement(mullion_id).GetTypeId()
+        for mullion_id in wall.CurtainGrid.GetMullionIds()
+    )
+    values = []
+    for mullion_type_id in mullion_type_ids:
+        key = mullion_type_id.IntegerValue
+        if key not in mullion_widths:
+            mullion_widths[key] = get_mullion_width(
+                doc.GetElement(mullion_type_id))
+        if mullion_widths[key] is not None:
+            values.append(mullion_widths[key])
+    return max(values) if values else wall.Width
+
+
+class WallWidthIndex(object):
+    """
+    Host wall widths formatted in the project length units.
+
+    Basic and stacked walls are measured once per wall type, curtain
+    walls once per wall with mullion widths cached per mullion type.
+    Every distinct width is converted and formatted only once.
+    """
+    def __init__(self, doc):
+        self._doc = doc
+        self._display_units = doc.GetUnits().GetFormatOptions(
+            DB.SpecTypeId.Length).GetUnitTypeId()
+        self._kinds = {}
+        self._widths = {}
+        self._mullion_widths = {}
+        self._formatted = {}
+
+    def _kind(self, wall):
+        type_id = wall.GetTypeId()
+        key = type_id.IntegerValue
+        if key not in self._kinds:
+            self._kinds[key] = self._doc.GetElement(type_id).Kind
+        return self._kinds[key]
+
+    def width(self, wall):
+        """Get the wall width in internal units"""
+        if self._kind(wall) == DB.WallKind.Curtain:
+            key = ('wall', wall.Id.IntegerValue)
+        else:
+            key = ('type', wall.GetTypeId().IntegerValue)
+        if key not in self._widths:
+            self._widths[key] = get_wall_width(
+                self._doc, wall, self._mullion_widths)
+        return self._widths[key]
+
+    def formatted(self, wall):
+        """Get the wall width as text in the project length units"""
+        width = self.width(wall)
+        key = round(width, 9)
+        if key not in self._formatted:
+            self._formatted[key] = str(DB.UnitUtils.ConvertFromInternalUnits(
+                width, self._display_units))
+        return self._formatted[key]
\ No newline at end of file
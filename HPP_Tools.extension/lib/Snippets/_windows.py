@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+
+
+class WindowSizeNumbering(object):
+    """
+    Window numbers in the F.Width.Sill format, memoized per group.
+
+    Windows are read once into columns (type, width, sill height,
+    mirrored) and grouped by equal values; each group's number is
+    converted and formatted only once. Type widths are read once per
+    window type.
+    """
+    def __init__(self, doc):
+        self._doc = doc
+        self._display_units = doc.GetUnits().GetFormatOptions(
+            DB.SpecTypeId.Length).GetUnitTypeId()
+        self._type_widths = {}
+        self._converted = {}
+        self.groups = {}
+        self.skipped = []
+
+    def _type_width(self, window):
+        type_id = window.GetTypeId()
+        key = type_id.IntegerValue
+        if key not in self._type_widths:
+            parameter = self._doc.GetElement(type_id).get_Parameter(
+                DB.BuiltInParameter.WINDOW_WIDTH)
+            self._type_widths[key] = parameter.AsDouble() \
+                if parameter is not None else None
+        return self._type_widths[key]
+
+    def _read(self, window):
+        """Get the group key of the window or None"""
+        type_width = self._type_width(window)
+        sill_parameter = window.get_Parameter(
+            DB.BuiltInParameter.INSTANCE_SILL_HEIGHT_PARAM)
+        width_parameter = window.get_Parameter(
+            DB.BuiltInParameter.WINDOW_WIDTH)
+        if type_width is None or sill_parameter is None or \
+                width_parameter is None:
+            return None
+        width = type_width if type_width > 0 else width_parameter.AsDouble()
+        return (window.GetTypeId().IntegerValue, round(width, 9),
+                round(sill_parameter.AsDouble(), 9), bool(window.Mirrored))
+
+    def _format_length(self, value):
+        if value not in self._converted:
+            self._converted[value] = str(int(round(
+                DB.UnitUtils.ConvertFromInternalUnits(
+                    value, self._display_units) * 100)))
+        return self._converted[value]
+
+    def _format(self, key):
+        _, width, sill_height, mirrored = key
+        number = 'F.{}.{}'.format(
+            self._format_length(width), self._format_length(sill_height))
+        return number + '.M' if mirrored else number
+
+    def assign(self, windows):
+        """Group the windows, return a dict of group number -> windows"""
+        for window in windows:
+            key = self._read(window)
+            if key is None:
+                self.skipped.append(window)
+                continue
+            if key not in self.groups:
+                self.groups[key] = (self._format(key), [])
+            self.groups[key][1].append(window)
+        numbers = {}
+        for number, group_windows in self.groups.values():
+            numbers.setdefault(number, []).extend(group_windows)
+        return numbers
+
+
+# working with positions along the room boundary
+
+def _signed_area(points):
+    return sum(a.X * b.Y - b.X * a.Y
+               for a, b in zip(points, points[1:] + points[:1])) / 2.0
+
+
+class RoomBoundaryPositions(object):
+    """
+    Positions along the outer boundary of a room.
+
+    The boundary is parameterized once by the cumulated lengths of its
+    segments. A position is measured clockwise (seen from above) from
+    the start corner, the boundary corner with the greatest Y and, among
+    those, the smallest X (north-west), so it does not depend on the
+    order the elements were collected in.
+    """
+    def __init__(self, room, options=None):
+        loops = room.GetBoundarySegments(
+            options or DB.SpatialElementBoundaryOptions())
+        self._curves = []
+        self._offsets = []
+        self.length = 0.0
+        if loops is not None and loops.Count > 0:
+            for segment in loops[0]:
+                curve = segment.GetCurve()
+                self._curves.append(curve)
+                self._offsets.append(self.length)
+                self.length += curve.Length
+        points = [curve.GetEndPoint(0) for curve in self._curves]
+        self._is_clockwise = _signed_area(points) < 0 if points else True
+        self._start = 0.0
+        if points:
+            start = min(range(len(points)), key=lambda i: (
+                round(-points[i].Y, 6), round(points[i].X, 6)))
+            self._start = self._offsets[start]
+            self._elevation = points[0].Z
+
+    def position(self, point):
+        """Get the position of the point projected to the boundary"""
+        if not self._curves or self.length <= 0:
+            return None
+        point = DB.XYZ(point.X, point.Y, self._elevation)
+        closest = None
+        for curve, offset in zip(self._curves, self._offsets):
+            result = curve.Project(point)
+            if result is None:
+                continue
+            if closest is None or result.Distance < closest[0]:
+                closest = (
+                    result.Distance,
+                    offset + curve.ComputeNormalizedParameter(
+                        result.Parameter) * curve.Length
+                )
+        if closest is None:
+            return None
+        position = (closest[1] - self._start) % self.length
+        if not self._is_clockwise:
+            position = (self.length - position) % self.length
+        return position
+
+
+def order_along_boundary(room, elements, positions=None):
+    """
+    Get the elements ordered clockwise along the room boundary.
+    Elements without a location point come last, ties by element id.
+    """
+    positions = positions or RoomBoundaryPositions(room)
+
+    def key(element):
+        location = element.Location
+        position = positions.position(location.Point) \
+            if isinstance(location, DB.LocationPoint) else None
+        return (position is None, position or 0.0, element.Id.IntegerValue)
+    return sorted(elements, key=key)
\ No newline at end of file
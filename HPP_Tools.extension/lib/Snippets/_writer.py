@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import clr
+clr.AddReference('RevitAPI')
+from Autodesk.Revit import DB
+
+from Snippets._apicalls import counted
+from Snippets._telemetry import count
+
+
+@counted()
+def get_parameter(element, parameter):
+    """Get parameter by name or by BuiltInParameter"""
+    if isinstance(parameter, DB.BuiltInParameter):
+        return element.get_Parameter(parameter)
+    return element.LookupParameter(parameter)
+
+
+def _same_value(parameter, value):
+    storage_type = parameter.StorageType
+    if storage_type == DB.StorageType.String:
+        return (parameter.AsString() or '') == (value or '')
+    try:
+        if storage_type == DB.StorageType.Integer:
+            return parameter.AsInteger() == int(value)
+        if storage_type == DB.StorageType.Double:
+            return abs(parameter.AsDouble() - float(value)) < 1e-9
+        if storage_type == DB.StorageType.ElementId:
+            return parameter.AsElementId().IntegerValue == value.IntegerValue
+    except (AttributeError, TypeError, ValueError):
+        # the value does not fit the storage type, setting it fails and
+        # is reported for the element
+        return False
+    return False
+
+
+def _to_storage(parameter, value):
+    if parameter.StorageType == DB.StorageType.Integer:
+        return int(value)
+    if parameter.StorageType == DB.StorageType.String:
+        return '' if value is None else value
+    return value
+
+
+class ParameterWriter(object):
+    """
+    Diff-aware parameter writer.
+
+    The new value is compared with the current one and the parameter is
+    set only if it differs. Missing and read-only parameters are
+    collected per parameter name instead of stopping the run.
+    Has to be used inside a transaction.
+    """
+    def __init__(self):
+        self.written = {}
+        self.unchanged = {}
+        self.missing = {}
+        self.failed = {}
+
+    def _count(self, counter, name):
+        counter[name] = counter.get(name, 0) + 1
+
+    @counted('ParameterWriter.set')
+    def set(self, element, parameter_name, value):
+        """Set the value, return True if the parameter was changed"""
+        name = str(parameter_name)
+        parameter = get_parameter(element, parameter_name)
+        if parameter is None or parameter.IsReadOnly:
+            self.missing.setdefault(name, []).append(element.Id)
+            return False
+        if _same_value(parameter, value):
+            self._count(self.unchanged, name)
+            return False
+        try:
+            # Set returns False for a value of another storage type
+            is_set = parameter.Set(_to_storage(parameter, value))
+        except Exception:
+            is_set = False
+        if not is_set:
+            self.failed.setdefault(name, []).append(element.Id)
+            return False
+        self._count(self.written, name)
+        count('written')
+        return True
+
+    @property
+    def written_count(self):
+        return sum(self.written.values())
+
+    def print_report(self, parameter_names=None):
+        names = parameter_names or sorted(
+            set(self.written) | set(self.unchanged) |
+            set(self.missing) | set(self.failed))
+        for name in names:
+            name = str(name)
+            if name in self.missing:
+                print('Please apply "{}" parameter! ({} element(s) without it)'
+                      .format(name, len(self.missing[name])))
+            if name in self.failed:
+                print('"{}" could not be set on {} element(s)'.format(
+                    name, len(self.failed[name])))
+            print('"{}": {} value(s) written, {} unchanged'.format(
+                name, self.written.get(name, 0), self.unchanged.get(name, 0)))
\ No newline at end of file
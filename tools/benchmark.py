@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+Scaling benchmark of the HPP buttons on synthetic buildings.
+
+Every button runs on generated buildings of about 1k, 10k and 100k
+elements (see tools/standin). A run is measured twice on fresh models:
+once for the wall time, once with tracemalloc and the counting of the
+calls of the stand-in API (standin.calls) for the peak memory and the
+number of Revit API calls.
+The table shows the scaling exponent between two sizes, 1 for linear,
+2 for quadratic.
+
+The exponents are compared with the committed baseline
+(tools/benchmark_baseline.json): a button scaling worse than its
+baseline fails the run, so a loop turning quadratic is caught before it
+reaches a large model. A button scaling worse than MAX_EXPONENT fails
+the run whatever its baseline says, and is not saved as a baseline.
+API calls are counted exactly, wall times only from MIN_SECONDS on, as
+shorter runs are dominated by noise.
+
+Runs with CPython 3:
+    python tools/benchmark.py
+    python tools/benchmark.py --tools Collision Location --sizes 1000 10000
+    python tools/benchmark.py --save
+"""
+from __future__ import print_function
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standin import find_script, install, run_script  # noqa: E402
+from standin.building import ELEMENTS_PER_ROOM, \
+    generate_building  # noqa: E402
+from standin.calls import count_calls  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'benchmark_baseline.json')
+SIZES = (1000, 10000, 100000)
+SEED = 0
+# allowed growth of the exponents over the baseline
+TIME_TOLERANCE = 0.5
+CALLS_TOLERANCE = 0.2
+# exponent no button may scale worse with, 2 is quadratic
+MAX_EXPONENT = 1.5
+# wall times below are not compared, runs below are repeated
+MIN_SECONDS = 0.02
+REPEAT_BELOW = 1.0
+REPEATS = 3
+
+
+class Benchmark(object):
+    """
+    A button measured on the building. setup buttons run before it
+    without being measured, e.g. the room numbers the door numbers are
+    made of. Buttons known to be quadratic are limited to max_elements.
+    """
+    def __init__(self, button, setup=(), select=(), max_elements=None):
+        self.button = button
+        self.setup = setup
+        self.select = select
+        self.max_elements = max_elements
+
+    def sizes(self, sizes):
+        return [size for size in sizes
+                if self.max_elements is None or size <= self.max_elements]
+
+
+BENCHMARKS = (
+    # numbering
+    Benchmark('Room Number'),
+    Benchmark('Door Number', setup=('Room Number',)),
+    Benchmark('Window Number', setup=('Room Number',)),
+    # attributes of the Doors panel
+    Benchmark('All Attributes'),
+    # doors against the finishing floors around them
+    Benchmark('Fußboden'),
+    # joins of the elements with intersecting bounding boxes, their
+    # number grows faster than the model as the storeys get larger
+    Benchmark('Join', max_elements=10000),
+    Benchmark('Join Intersected'),
+    Benchmark('Floor Join'),
+    # checks
+    Benchmark('Collision'),
+    Benchmark('Location'),
+    Benchmark('Room Height'),
+    # purge planning
+    Benchmark('Views but 3D', select=('{3D}',)),
+    Benchmark('Unused Filters'),
+    Benchmark('Unused View Templates'),
+)
+
+
+# working with a single run
+
+def _prepare(benchmark, size):
+    """Generate and install the building, run the setup buttons"""
+    doc = generate_building(SEED, max(1, size // ELEMENTS_PER_ROOM))
+    uiapp = install(doc)
+    uiapp.ActiveUIDocument.Selection.SetElementIds(
+        element.Id for element in doc.elements()
+        if element.Name in benchmark.select)
+    for button in benchmark.setup:
+        _run(uiapp, button)
+    return doc, uiapp
+
+
+def _run(uiapp, button):
+    """Run the button and its background job to the end, silently"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_script(find_script(button))
+        uiapp.idle()
+
+
+def measure(benchmark, size):
+    """Get the elements, seconds, peak MB and API calls of a run"""
+    seconds = None
+    for _ in range(REPEATS):
+        doc, uiapp = _prepare(benchmark, size)
+        # like timeit, the collections of the garbage of the generated
+        # building are kept out of the wall time
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            _run(uiapp, benchmark.button)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+        if elapsed >= REPEAT_BELOW:
+            break
+
+    doc, uiapp = _prepare(benchmark, size)
+    tracemalloc.start()
+    try:
+        with count_calls() as calls:
+            _run(uiapp, benchmark.button)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'elements': doc.element_count,
+        'seconds': round(seconds, 4),
+        'peak_mb': round(peak / 1e6, 2),
+        'api_calls': calls.count,
+    }
+
+
+# working with the scaling
+
+def exponent(elements, values, index):
+    """Scaling exponent between the runs index - 1 and index"""
+    low, high = values[index - 1], values[index]
+    if not low or not high or elements[index] == elements[index - 1]:
+        return None
+    return math.log(float(high) / low) / \
+        math.log(float(elements[index]) / elements[index - 1])
+
+
+def _format_exponent(value):
+    return '-' if value is None else '{:.2f}'.format(value)
+
+
+def print_table(results):
+    print('{:<24} {:>9} {:>9} {:>9} {:>11} {:>9} {:>9}'.format(
+        'button', 'elements', 'seconds', 'peak MB', 'API calls',
+        'exp time', 'exp calls'))
+    for button, runs in results.items():
+        elements = [run['elements'] for run in runs]
+        for index, run in enumerate(runs):
+            time_exponent = calls_exponent = None
+            if index > 0:
+                time_exponent = exponent(
+                    elements, [run['seconds'] for run in runs], index)
+                calls_exponent = exponent(
+                    elements, [run['api_calls'] for run in runs], index)
+            print('{:<24} {:>9} {:>9.3f} {:>9.2f} {:>11} {:>9} {:>9}'.format(
+                button if index == 0 else '', run['elements'],
+                run['seconds'], run['peak_mb'],
+                '-' if run['api_calls'] is None else run['api_calls'],
+                _format_exponent(time_exponent),
+                _format_exponent(calls_exponent)))
+
+
+def find_superlinear(results):
+    """Get (button, message) for the buttons scaling worse than MAX_EXPONENT"""
+    messages = []
+    for button, runs in results.items():
+        elements = [run['elements'] for run in runs]
+        for index in range(1, len(runs)):
+            span = '{} to {} elements'.format(elements[index - 1],
+                                              elements[index])
+            if runs[index - 1]['seconds'] >= MIN_SECONDS:
+                current = exponent(
+                    elements, [run['seconds'] for run in runs], index)
+                if current is not None and current > MAX_EXPONENT:
+                    messages.append((button, '{}: wall time scales with '
+                                     'n^{:.2f} from {}'.format(
+                                         button, current, span)))
+            current = exponent(
+                elements, [run['api_calls'] for run in runs], index)
+            if current is not None and current > MAX_EXPONENT:
+                messages.append((button, '{}: API calls scale with '
+                                 'n^{:.2f} from {}'.format(
+                                     button, current, span)))
+    return messages
+
+
+def find_regressions(results, baseline):
+    """Get messages for the buttons scaling worse than the baseline"""
+    regressions = []
+    for button, runs in results.items():
+        base_runs = {run['elements']: run
+                     for run in baseline.get(button, [])}
+        elements = [run['elements'] for run in runs]
+        for index in range(1, len(runs)):
+            base_low = base_runs.get(elements[index - 1])
+            base_high = base_runs.get(elements[index])
+            if base_low is None or base_high is None:
+                # sizes or generator changed, save a new baseline
+                continue
+            base_elements = [base_low['elements'], base_high['elements']]
+            span = '{} to {} elements'.format(elements[index - 1],
+                                              elements[index])
+            if runs[index - 1]['seconds'] >= MIN_SECONDS and \
+                    base_low['seconds'] >= MIN_SECONDS:
+                current = exponent(
+                    elements, [run['seconds'] for run in runs], index)
+                base = exponent(base_elements, [base_low['seconds'],
+                                                base_high['seconds']], 1)
+                if current is not None and base is not None and \
+                        current > base + TIME_TOLERANCE:
+                    regressions.append(
+                        '{}: wall time scales with n^{:.2f} from {}, '
+                        'baseline n^{:.2f}'.format(button, current, span,
+                                                   base))
+            current = exponent(
+                elements, [run['api_calls'] for run in runs], index)
+            base = exponent(base_elements, [base_low['api_calls'],
+                                            base_high['api_calls']], 1)
+            if current is not None and base is not None and \
+                    current > base + CALLS_TOLERANCE:
+                regressions.append(
+                    '{}: API calls scale with n^{:.2f} from {}, '
+                    'baseline n^{:.2f}'.format(button, current, span, base))
+    return regressions
+
+
+def read_baseline(path):
+    if not os.path.isfile(path):
+        return None
+    with open(path, encoding='utf-8') as baseline_file:
+        return json.load(baseline_file)['buttons']
+
+
+def save_baseline(path, results, sizes):
+    with open(path, 'w', encoding='utf-8') as baseline_file:
+        json.dump({'seed': SEED, 'sizes': list(sizes), 'buttons': results},
+                  baseline_file, indent=1, ensure_ascii=False)
+        baseline_file.write('\n')
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tools', nargs='+', metavar='BUTTON',
+                        help='only these buttons, e.g. "Join"')
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES,
+                        help='numbers of elements of the buildings')
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help='baseline file to compare with')
+    parser.add_argument('--save', action='store_true',
+                        help='save the results as the new baseline')
+    options = parser.parse_args(arguments)
+
+    benchmarks = [benchmark for benchmark in BENCHMARKS
+                  if not options.tools or benchmark.button in options.tools]
+    if not benchmarks:
+        print('No benchmarks of these buttons.')
+        return 1
+    results = {}
+    for benchmark in benchmarks:
+        runs = []
+        for size in benchmark.sizes(options.sizes):
+            runs.append(measure(benchmark, size))
+            print('{} at {} elements: {:.3f} s'.format(
+                benchmark.button, runs[-1]['elements'],
+                runs[-1]['seconds']), file=sys.stderr)
+        results[benchmark.button] = runs
+    print_table(results)
+
+    superlinear = find_superlinear(results)
+    if superlinear:
+        print('\nScaling worse than n^{}:'.format(MAX_EXPONENT))
+        for _, message in superlinear:
+            print(message)
+    if options.save:
+        rejected = set(button for button, _ in superlinear)
+        baseline = read_baseline(options.baseline) or {}
+        baseline.update((button, runs) for button, runs in results.items()
+                        if button not in rejected)
+        save_baseline(options.baseline, baseline, options.sizes)
+        print('\nBaseline is saved to {}'.format(options.baseline))
+        if rejected:
+            print('Not saved: {}'.format(', '.join(sorted(rejected))))
+            return 1
+        return 0
+    baseline = read_baseline(options.baseline)
+    if baseline is None:
+        print('\nNo baseline to compare with, run with --save first.')
+        return 0
+    regressions = find_regressions(results, baseline)
+    if regressions:
+        print('\nScaling worse than the baseline:')
+        for message in regressions:
+            print(message)
+        return 1
+    if superlinear:
+        return 1
+    print('\nNo scaling regressions against the baseline.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Aggregate the run logs of the HPP tools.
+
+Every run of a HPP button appends one JSON line to a log file of the
+user (see Snippets._telemetry). This script reads the logs of a folder,
+e.g. the office share set as 'run_log_folder', and prints the p50 / p95
+wall times per tool and model size and the slowest models.
+
+Runs with CPython 3, outside Revit:
+    python tools/run_stats.py \\\\server\\bim\\HPP_Tools\\runs
+    python tools/run_stats.py runs --tool "Room Height" --phases
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+# upper bounds of the model size classes, in elements
+SIZE_CLASSES = ((10000, '< 10k'), (100000, '10k-100k'),
+                (1000000, '100k-1M'), (None, '> 1M'))
+
+
+def read_runs(paths):
+    """
+    Read the runs of the given log files and folders. Paths that do not
+    exist are reported and skipped.
+    """
+    runs = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(glob.glob(os.path.join(path, '**', '*.jsonl'),
+                                     recursive=True))
+        elif os.path.isfile(path):
+            files = [path]
+        else:
+            sys.stderr.write(
+                'Skipped {}, no such file or folder.\n'.format(path))
+            continue
+        for file_path in files:
+            with open(file_path, encoding='utf-8') as log_file:
+                for line in log_file:
+                    try:
+                        runs.append(json.loads(line))
+                    except ValueError:
+                        # a line cut off by a crashed run
+                        continue
+    return runs
+
+
+def size_class(model_elements):
+    if model_elements is None:
+        return 'unknown'
+    for bound, name in SIZE_CLASSES:
+        if bound is None or model_elements < bound:
+            return name
+
+
+def percentile(values, share):
+    """Linear interpolated percentile of the values, share from 0 to 1"""
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * share
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def group(runs, key):
+    groups = {}
+    for run in runs:
+        groups.setdefault(key(run), []).append(run)
+    return groups
+
+
+def print_table(header, rows):
+    widths = [max(len(str(row[index])) for row in [header] + rows)
+              for index in range(len(header))]
+    for row in [header] + rows:
+        print('  '.join(
+            str(value).ljust(width) if index == 0 else str(value).rjust(width)
+            for index, (value, width) in enumerate(zip(row, widths))))
+    print('')
+
+
+def _seconds(value):
+    return '{:.2f}'.format(value) if value is not None else '-'
+
+
+def _stats(values):
+    return [len(values), _seconds(percentile(values, 0.5)),
+            _seconds(percentile(values, 0.95)), _seconds(max(values))]
+
+
+def print_tools(runs):
+    print('Wall time per tool and model size (s)')
+    rows = []
+    size_order = [name for _, name in SIZE_CLASSES] + ['unknown']
+    groups = group(runs, lambda run: (
+        run.get('tool'), size_class(run.get('model_elements'))))
+    for (tool, size), tool_runs in sorted(
+            groups.items(),
+            key=lambda item: (item[0][0] or '', size_order.index(item[0][1]))):
+        elements = [sum((run.get('elements') or {}).values())
+                    for run in tool_runs]
+        rows.append([tool, size] + _stats(
+            [run['wall_time'] for run in tool_runs]) +
+            [int(percentile(elements, 0.5))])
+    print_table(['tool', 'model size', 'runs', 'p50', 'p95', 'max',
+                 'elements p50'], rows)
+
+
+def print_phases(runs):
+    for tool, tool_runs in sorted(group(runs,
+                                        lambda run: run.get('tool')).items()):
+        print('Phases of {} (s)'.format(tool))
+        phases = {}
+        for run in tool_runs:
+            for name, seconds in (run.get('phases') or {}).items():
+                phases.setdefault(name, []).append(seconds)
+        rows = [[name] + _stats(values)
+                for name, values in sorted(
+                    phases.items(),
+                    key=lambda item: -percentile(item[1], 0.5))]
+        print_table(['phase', 'runs', 'p50', 'p95', 'max'], rows)
+
+
+def print_models(runs, limit):
+    """
+    Print the slowest models. Models are told apart by their path too,
+    models of several projects often share a name like "Architektur".
+    """
+    print('Slowest models (s, summed over all tools)')
+    rows = []
+    for (model, path), model_runs in group(runs, lambda run: (
+            run.get('model'), run.get('model_path'))).items():
+        total = sum(run['wall_time'] for run in model_runs)
+        slowest = max(model_runs, key=lambda run: run['wall_time'])
+        rows.append([model, path or '-',
+                     model_runs[0].get('model_elements') or '-',
+                     len(model_runs), total,
+                     '{} ({})'.format(slowest.get('tool'),
+                                      _seconds(slowest['wall_time']))])
+    rows.sort(key=lambda row: -row[4])
+    rows = [row[:4] + [_seconds(row[4])] + row[5:] for row in rows[:limit]]
+    print_table(['model', 'path', 'elements', 'runs', 'total',
+                 'slowest run'], rows)
+
+
+def print_errors(runs):
+    """Print the number of failed runs per tool and error"""
+    failed = [run for run in runs if run.get('error')]
+    if not failed:
+        return
+    print('Failed runs')
+    rows = [[tool, error, len(tool_runs)]
+            for (tool, error), tool_runs in sorted(group(
+                failed, lambda run: (run.get('tool'), run['error'])).items())]
+    print_table(['tool', 'error', 'runs'], rows)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('paths', nargs='+',
+                        help='log files or folders with *.jsonl logs')
+    parser.add_argument('--tool', help='only runs of this tool')
+    parser.add_argument('--since', help='only runs since this date, '
+                                        'e.g. 2026-10-01')
+    parser.add_argument('--phases', action='store_true',
+                        help='print the wall time per phase of each tool')
+    parser.add_argument('--models', type=int, default=10,
+                        help='number of slowest models to print')
+    options = parser.parse_args(arguments)
+
+    runs = [run for run in read_runs(options.paths)
+            if 'wall_time' in run and
+            (options.tool is None or run.get('tool') == options.tool) and
+            (options.since is None or run.get('time', '') >= options.since)]
+    if not runs:
+        print('No runs found.')
+        return 1
+    print('{} runs\n'.format(len(runs)))
+    print_tools(runs)
+    if options.phases:
+        print_phases(runs)
+    print_models(runs, options.models)
+    print_errors(runs)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Run HPP buttons on a synthetic building, outside Revit.
+
+The stand-in of the Revit API (tools/standin) holds a generated model in
+memory, so the logic of the tools can be run and debugged with CPython
+on any machine. Runs in the background are driven to the end by raising
+the Idling event until the job is done. Several buttons run one after
+the other on the same model, like a workflow.
+
+Runs with CPython 3:
+    python tools/run_tool.py "Room Number" "Door Number" --rooms 500
+    python tools/run_tool.py "Room Height" --rooms 200 --shift --seed 7
+    python tools/run_tool.py "Views but 3D" --select "{3D}"
+    python tools/run_tool.py "Fußboden" --count-calls "LookupParameter, Symbol"
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from standin import find_script, install, run_script  # noqa: E402
+from standin.addins import WINDOWS, user_config  # noqa: E402
+from standin.building import generate_building  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('buttons', nargs='+',
+                        help='names of the buttons, e.g. "Join"')
+    parser.add_argument('--rooms', type=int, default=100,
+                        help='number of rooms of the building')
+    parser.add_argument('--storeys', type=int, default=None,
+                        help='number of storeys, by default by the rooms')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the generated building')
+    parser.add_argument('--shift', action='store_true',
+                        help='run as with Shift+Click')
+    parser.add_argument('--select', action='append', default=[],
+                        metavar='NAME',
+                        help='select the elements of the name, e.g. "{3D}"')
+    parser.add_argument('--count-calls', nargs='?', const='',
+                        default=None, metavar='MEMBERS',
+                        help='count the API calls, and the reads of the '
+                             'comma separated API members')
+    args = parser.parse_args(argv)
+    if args.count_calls is not None:
+        section = user_config.get_section('HPP_Tools')
+        section.set_option('count_api_calls', True)
+        section.set_option('api_call_members', args.count_calls)
+
+    start = time.time()
+    doc = generate_building(args.seed, args.rooms, args.storeys)
+    print('Generated {} elements in {:.2f} s'.format(
+        doc.element_count, time.time() - start))
+    uiapp = install(doc)
+    uiapp.ActiveUIDocument.Selection.SetElementIds(
+        element.Id for element in doc.elements()
+        if element.Name in args.select)
+    for button in args.buttons:
+        start = time.time()
+        shown = len(WINDOWS)
+        run_script(find_script(button), shiftclick=args.shift)
+        events = uiapp.idle()
+        # the status panels of background jobs show their outcome
+        for window in WINDOWS[shown:]:
+            print(window.status_text.Text)
+        print('Ran "{}" in {:.2f} s{}'.format(
+            button, time.time() - start,
+            ', {} idle events'.format(events) if events else ''))
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory stand-in of the Revit API subset the HPP tools use, so their
+logic runs under plain CPython.
+
+Example:
+    from standin import install, run_script
+    from standin.building import generate_building
+    doc = generate_building(seed=1, rooms=200)
+    install(doc)
+    run_script('HPP_Tools.extension/.../Room Number.pushbutton/script.py')
+
+install() registers the modules the scripts import (clr, System,
+Autodesk.Revit, pyrevit, RevitServices, Revit) in sys.modules and sets
+__revit__ like pyRevit does. Nothing of the real APIs is needed.
+"""
+import os
+import runpy
+import sys
+import types
+
+try:
+    import builtins
+except ImportError:
+    import __builtin__ as builtins
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+LIB_PATH = os.path.join(ROOT, 'HPP_Tools.extension', 'lib')
+TAB_PATH = os.path.join(ROOT, 'HPP_Tools.extension', 'HPP_Tools.tab')
+
+
+def _make_revit_modules():
+    from standin import db, storage, ui
+    from standin.system import InvalidOperationException
+    architecture = types.ModuleType('Autodesk.Revit.DB.Architecture')
+    architecture.Room = db.Room
+    exceptions = types.ModuleType('Autodesk.Revit.Exceptions')
+    exceptions.InvalidOperationException = InvalidOperationException
+    exceptions.ArgumentException = db.ArgumentException
+    exceptions.ModificationOutsideTransactionException = \
+        db.ModificationOutsideTransactionException
+    modules = {
+        'Autodesk': types.ModuleType('Autodesk'),
+        'Autodesk.Revit': types.ModuleType('Autodesk.Revit'),
+        'Autodesk.Revit.DB': db,
+        'Autodesk.Revit.DB.Architecture': architecture,
+        'Autodesk.Revit.DB.ExtensibleStorage': storage,
+        'Autodesk.Revit.Exceptions': exceptions,
+    }
+    modules.update(ui.make_ui_modules())
+    return modules
+
+
+def _link(modules):
+    """Make every module an attribute of its parent, like packages"""
+    for name, module in modules.items():
+        parent, _, child = name.rpartition('.')
+        if parent in modules:
+            setattr(modules[parent], child, module)
+
+
+def install(doc):
+    """
+    Make doc the active document of the stand-in Revit and register the
+    API modules. Returns the UIApplication, the __revit__ of the scripts.
+    """
+    from standin.addins import make_addin_modules
+    from standin.system import make_clr_module, make_system_modules
+    from standin.ui import UIApplication
+    uiapp = UIApplication(doc)
+    modules = {'clr': make_clr_module()}
+    modules.update(make_system_modules())
+    modules.update(_make_revit_modules())
+    modules.update(make_addin_modules(uiapp))
+    _link(modules)
+    sys.modules.update(modules)
+    if LIB_PATH not in sys.path:
+        sys.path.insert(0, LIB_PATH)
+    builtins.__revit__ = uiapp
+    return uiapp
+
+
+def reset_snippets():
+    """Forget the imported Snippets, they bind the document on import"""
+    for name in list(sys.modules):
+        if name == 'Snippets' or name.startswith('Snippets.'):
+            del sys.modules[name]
+
+
+def find_script(button):
+    """Get the script of the button, e.g. 'Room Number'"""
+    for folder, _, files in os.walk(TAB_PATH):
+        name = os.path.basename(folder)
+        if os.path.splitext(name)[0] == button and 'script.py' in files:
+            return os.path.join(folder, 'script.py')
+    raise ValueError('No button "{}" found.'.format(button))
+
+
+def run_script(path, shiftclick=False):
+    """
+    Run a button script like pyRevit does, on the installed document.
+    Returns the globals of the script after the run.
+    """
+    reset_snippets()
+    return runpy.run_path(path, init_globals={'__shiftclick__': shiftclick},
+                          run_name='__main__')
\ No newline at end of file
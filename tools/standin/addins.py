@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-ins for pyRevit and the Dynamo libraries the scripts import.
+Dialogs do not wait for a user: alerts are printed and answered from
+ANSWERS, lists are selected completely.
+"""
+from __future__ import print_function
+
+import logging
+import types
+
+from standin.system import Event
+
+# answers of the dialogs, alert is the answer of yes/no questions
+ANSWERS = {'alert': False}
+ALERTS = []
+# windows shown, e.g. the panels of background jobs
+WINDOWS = []
+
+
+# working with pyrevit.forms
+
+def alert(message, title=None, yes=False, no=False, **kwargs):
+    ALERTS.append(message)
+    print(message)
+    if yes or no:
+        return ANSWERS['alert']
+    return True
+
+
+class ProgressBar(object):
+    def __init__(self, title='', cancellable=False, **kwargs):
+        self.title = title
+        self.cancellable = cancellable
+        self.cancelled = False
+        self.value = 0
+        self.maximum = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def update_progress(self, value, max_value=1):
+        self.value = value
+        self.maximum = max_value
+
+
+class _Control(object):
+    """A WPF control, any property can be set"""
+    def __init__(self):
+        self.Text = ''
+        self.Value = 0
+        self.Content = ''
+
+
+class WPFWindow(object):
+    def __init__(self, xaml_file, **kwargs):
+        self.xaml_file = xaml_file
+        self.Closed = Event()
+        self.is_shown = False
+
+    def __getattr__(self, name):
+        # named controls of the XAML file
+        if name.startswith('_'):
+            raise AttributeError(name)
+        control = _Control()
+        setattr(self, name, control)
+        return control
+
+    def show(self, modal=False):
+        self.is_shown = True
+        WINDOWS.append(self)
+
+    def show_dialog(self):
+        self.is_shown = True
+        WINDOWS.append(self)
+
+    def Close(self):
+        if self.is_shown:
+            self.is_shown = False
+            self.Closed.raise_event(self, None)
+
+
+class SelectFromList(object):
+    @staticmethod
+    def show(items, multiselect=False, **kwargs):
+        items = list(items)
+        if multiselect:
+            return items
+        return items[0] if items else None
+
+
+# working with pyrevit.script and pyrevit.userconfig
+
+def toggle_icon(state, **kwargs):
+    pass
+
+
+def get_logger():
+    return logging.getLogger('pyrevit')
+
+
+def get_output():
+    return types.SimpleNamespace(print_md=print, print_html=print,
+                                 close=lambda: None)
+
+
+class ConfigSection(object):
+    def __init__(self, name):
+        self.name = name
+        self._options = {}
+
+    def get_option(self, option, default=None):
+        return self._options.get(option, default)
+
+    def set_option(self, option, value):
+        self._options[option] = value
+
+    def has_option(self, option):
+        return option in self._options
+
+
+class UserConfig(object):
+    """In-memory user config, nothing is written to disk"""
+    def __init__(self):
+        self._sections = {}
+
+    def has_section(self, name):
+        return name in self._sections
+
+    def get_section(self, name):
+        return self._sections[name]
+
+    def add_section(self, name):
+        return self._sections.setdefault(name, ConfigSection(name))
+
+    def save_changes(self):
+        pass
+
+
+user_config = UserConfig()
+# runs of the stand-in are kept out of the run log of the user
+user_config.add_section('HPP_Tools').set_option('run_log', False)
+
+
+# working with Dynamo
+
+class DocumentManager(object):
+    Instance = types.SimpleNamespace(CurrentDBDocument=None,
+                                     CurrentUIApplication=None)
+
+
+class TransactionManager(object):
+    Instance = types.SimpleNamespace(
+        EnsureInTransaction=lambda doc: None,
+        TransactionTaskDone=lambda: None,
+        ForceCloseTransaction=lambda: None)
+
+
+def _module(name, **members):
+    module = types.ModuleType(name)
+    for key, value in members.items():
+        setattr(module, key, value)
+    return module
+
+
+def make_addin_modules(uiapp):
+    """Get the pyrevit, RevitServices and Dynamo modules"""
+    DocumentManager.Instance.CurrentDBDocument = \
+        uiapp.ActiveUIDocument.Document
+    DocumentManager.Instance.CurrentUIApplication = uiapp
+    forms = _module('pyrevit.forms', alert=alert, ProgressBar=ProgressBar,
+                    WPFWindow=WPFWindow, SelectFromList=SelectFromList)
+    script = _module('pyrevit.script', toggle_icon=toggle_icon,
+                     get_output=get_output, get_logger=get_logger)
+    userconfig = _module('pyrevit.userconfig', user_config=user_config)
+    pyrevit = _module('pyrevit')
+    persistence = _module('RevitServices.Persistence',
+                          DocumentManager=DocumentManager)
+    transactions = _module('RevitServices.Transactions',
+                           TransactionManager=TransactionManager)
+    services = _module('RevitServices')
+    # the geometry conversion extensions are not available, so curves
+    # have no ToProtoType like in Revit without Dynamo
+    elements = _module('Revit.Elements')
+    conversion = _module('Revit.GeometryConversion')
+    revit = _module('Revit')
+    design_script = _module('Autodesk.DesignScript')
+    geometry = _module('Autodesk.DesignScript.Geometry')
+    return {
+        'pyrevit': pyrevit,
+        'pyrevit.forms': forms,
+        'pyrevit.script': script,
+        'pyrevit.userconfig': userconfig,
+        'RevitServices': services,
+        'RevitServices.Persistence': persistence,
+        'RevitServices.Transactions': transactions,
+        'Revit': revit,
+        'Revit.Elements': elements,
+        'Revit.GeometryConversion': conversion,
+        'Autodesk.DesignScript': design_script,
+        'Autodesk.DesignScript.Geometry': geometry,
+    }
\ No newline at end of file
@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic buildings for the stand-in: storeys of rectangular rooms on a
+grid, with walls, doors, windows, floors and ceilings, named the way the
+HPP templates name them. The same seed gives the same building.
+
+Every room brings about seven elements: the room, two walls, a door, a
+finishing floor, a slab and a ceiling. Rooms on the facade get a window.
+"""
+import math
+import random
+
+from standin import db
+from standin.db import BuiltInCategory, BuiltInParameter, StorageType, \
+    ViewFamily, XYZ, to_feet
+from standin.system import Guid
+
+ELEMENTS_PER_ROOM = 7
+
+ROOM_WIDTH = to_feet(5.0)
+ROOM_DEPTH = to_feet(4.0)
+STOREY_HEIGHT = to_feet(3.0)
+CEILING_HEIGHT = to_feet(2.6)
+SCREED = to_feet(0.08)
+
+ROOM_NAMES = (
+    ('Büro', 20), ('Flur', 10), ('Besprechung', 6), ('Bad', 4),
+    ('WC Damen', 3), ('WC Herren', 3), ('Dusche', 2), ('Abstellraum', 5),
+    ('Teeküche', 3), ('Lager', 4), ('Technik', 2), ('Wohnen', 5),
+    ('Schlafen', 5), ('Kind', 3), ('Küche', 3), ('Waschküche', 1),
+    ('Schacht', 1),
+)
+
+# name and layers from exterior to interior: material, width (m)
+WALL_TYPES = (
+    ('AW_365_Mauerwerk', (('HPP_MA_Putz_Aussen', 0.02),
+                          ('HPP_MA_Mauerwerk_Ziegel', 0.33),
+                          ('HPP_MA_Putz_Innen', 0.015))),
+    ('IW_175_Kalksandstein', (('HPP_MA_Kalksandstein_KS', 0.175),)),
+    ('IW_125_Trockenbau', (('HPP_MA_Trockenbau_GK', 0.125),)),
+)
+
+# family name, symbol name, function, has H_TÜ_Fußbodenaufbau
+DOOR_FAMILIES = (
+    ('HPP_TÜR_DT_INN_1FL_Drehtür', '1010 x 2135', 0, True),
+    ('HPP_TÜR_DT_INN_2FL_Drehtür', '1760 x 2135', 0, True),
+    ('HPP_TÜR_ST_INN_1SCH_Schiebetür', '1135 x 2135', 0, True),
+    ('HPP_TÜR_DT_AUS_1FL_Haustür', '1135 x 2260', 1, True),
+    ('HPP_TÜR_DT_INN_1FL_Bestand', '885 x 2010', 0, False),
+    ('Tür_Standard', '885 x 2010', 0, True),
+)
+
+DOOR_PARAMETERS = (
+    ('H_TÜ_Flügelanzahl', StorageType.String),
+    ('H_TÜ_Türform', StorageType.String),
+    ('H_TÜ_Wandart', StorageType.String),
+    ('H_TÜ_ZA_Maulweite', StorageType.String),
+    ('H_TÜ_Aussentür', StorageType.Integer),
+    ('H_TÜ_DIN-rl', StorageType.String),
+    ('H_TÜ_Nassraum-Feuchtraum', StorageType.String),
+    ('H_TÜ_Türnummer', StorageType.String),
+    ('H_TÜ_Fußbodenaufbau', StorageType.Double),
+)
+WINDOW_PARAMETERS = (
+    ('H_FE_Fensternummer', StorageType.String),
+)
+COLLISION_PARAMETERS = (
+    ('H_TÜ_Kollisionskörper einschalten', StorageType.Integer),
+    ('H_OQ_Kollisionsprüfung', StorageType.Integer),
+)
+ROOM_PARAMETERS = (
+    ('H_RA_Raumnummer', StorageType.String),
+    ('H_RA_lichte_Höhe', StorageType.String),
+)
+
+
+class _Builder(object):
+    """Keeps the shared elements while the storeys are generated"""
+    def __init__(self, doc, rng):
+        self.doc = doc
+        self.rng = rng
+        self.shared = {}
+
+    def shared_parameter(self, name, storage_type):
+        if name not in self.shared:
+            element = db.SharedParameterElement(
+                self.doc, name, Guid(), storage_type)
+            self.shared[name] = element.definition
+        return self.shared[name]
+
+    def parameter_set(self, base, parameters):
+        return base.extended(self.shared_parameter(name, storage_type)
+                             for name, storage_type in parameters)
+
+
+def _weighted_names(rng, count):
+    names = [name for name, _ in ROOM_NAMES]
+    weights = [weight for _, weight in ROOM_NAMES]
+    return [rng.choices(names, weights)[0] for _ in range(count)] \
+        if hasattr(rng, 'choices') else \
+        [names[rng.randrange(len(names))] for _ in range(count)]
+
+
+def _create_types(builder):
+    doc = builder.doc
+    materials = {}
+    wall_types = []
+    for name, layers in WALL_TYPES:
+        structure_layers = []
+        for material_name, width in layers:
+            if material_name not in materials:
+                materials[material_name] = db.Material(doc, material_name)
+            structure_layers.append(db.CompoundStructureLayer(
+                to_feet(width), materials[material_name].Id))
+        wall_types.append(db.WallType(doc, name, db.CompoundStructure(
+            structure_layers, len(structure_layers) // 2)))
+    concrete = db.Material(doc, 'HPP_MA_Beton_C25')
+    concrete.CutForegroundPatternId = db.FillPatternElement(
+        doc, 'Kreuzschraffur', False).Id
+    screed = db.Material(doc, 'HPP_MA_Estrich_ZE')
+    plaster = db.Material(doc, 'HPP_MA_Gipskarton_GK')
+    floor_types = {
+        'finish': db.FloorType(doc, 'GFB_Estrich_80', db.CompoundStructure(
+            [db.CompoundStructureLayer(SCREED, screed.Id)], 0)),
+        'slab': db.FloorType(doc, 'STB_Decke_250', db.CompoundStructure(
+            [db.CompoundStructureLayer(to_feet(0.25), concrete.Id)], 0)),
+    }
+    ceiling_type = db.CeilingType(doc, 'AD_GK_12,5', db.CompoundStructure(
+        [db.CompoundStructureLayer(to_feet(0.0125), plaster.Id)], 0))
+    return wall_types, floor_types, ceiling_type
+
+
+def _create_families(builder):
+    doc = builder.doc
+    door_parameters = builder.parameter_set(
+        db.FamilyInstance._parameters, DOOR_PARAMETERS + COLLISION_PARAMETERS)
+    door_parameters_old = builder.parameter_set(
+        db.FamilyInstance._parameters,
+        tuple(parameter for parameter in DOOR_PARAMETERS
+              if parameter[0] != 'H_TÜ_Fußbodenaufbau') +
+        COLLISION_PARAMETERS)
+    doors = []
+    for family_name, symbol_name, function, has_floor in DOOR_FAMILIES:
+        family = db.Family(doc, family_name, BuiltInCategory.OST_Doors)
+        symbol = db.FamilySymbol(doc, symbol_name, family)
+        width, height = [to_feet(int(size) / 1000.0)
+                         for size in symbol_name.split(' x ')]
+        symbol._values[int(BuiltInParameter.FUNCTION_PARAM)] = function
+        doors.append((symbol, width, height,
+                      door_parameters if has_floor else door_parameters_old))
+    window_parameters = builder.parameter_set(
+        db.FamilyInstance._parameters.extended([db.builtin(
+            'WINDOW_WIDTH', StorageType.Double, 'Width')]),
+        WINDOW_PARAMETERS + COLLISION_PARAMETERS)
+    windows = []
+    family = db.Family(doc, 'HPP_FEN_FE_AUS_1FL_Drehkipp',
+                       BuiltInCategory.OST_Windows)
+    for width, height in ((1.01, 1.385), (1.51, 1.385), (0.885, 1.01)):
+        symbol = db.FamilySymbol(doc, '{:.0f} x {:.0f}'.format(
+            width * 1000, height * 1000), family)
+        # sized by the instances, like families with an instance width
+        symbol._values[int(BuiltInParameter.WINDOW_WIDTH)] = 0.0
+        windows.append((symbol, to_feet(width), to_feet(height),
+                        window_parameters))
+    return doors, windows
+
+
+def _create_views(doc, levels):
+    db.ViewFamilyType(doc, '3D-Ansicht', ViewFamily.ThreeDimensional)
+    db.ViewFamilyType(doc, 'Grundriss', ViewFamily.FloorPlan)
+    template = db.View3D(doc, 'HPP 3D Vorlage', is_template=True)
+    plan_template = db.ViewPlan(doc, 'HPP Grundriss Vorlage', None,
+                                is_template=True)
+    db.ViewPlan(doc, 'HPP Grundriss alt', None, is_template=True)
+    view = db.View3D(doc, '{3D}')
+    view._template_id = template._id
+    solid = db.FillPatternElement(doc, '<Solid fill>', True)
+    hatch = db.FillPatternElement(doc, 'Schraffur 45', False)
+    db.FillPatternElement(doc, 'Punktraster', False)
+    db.FilledRegionType(doc, 'Schraffur Bestand', hatch.Id)
+    dashed = db.LinePatternElement(doc, 'Gestrichelt')
+    db.LinePatternElement(doc, 'Punkt')
+    used_filter = db.ParameterFilterElement(
+        doc, 'Wände tragend', [BuiltInCategory.OST_Walls])
+    db.ParameterFilterElement(doc, 'Türen Bestand', [BuiltInCategory.OST_Doors])
+    plan_template._filters[used_filter._id] = db.OverrideGraphicSettings() \
+        .SetProjectionLinePatternId(dashed.Id) \
+        .SetSurfaceForegroundPatternId(solid.Id)
+    plan_template._category_overrides[int(BuiltInCategory.OST_Walls)] = \
+        db.OverrideGraphicSettings().SetCutForegroundPatternId(solid.Id)
+    for level in levels:
+        plan = db.ViewPlan(doc, 'Grundriss {}'.format(level.Name), level)
+        plan._template_id = plan_template._id
+        dependent = db.ViewPlan(
+            doc, 'Grundriss {} - Ausschnitt'.format(level.Name), level)
+        dependent._primary_id = plan._id
+    title_block = db.Family(doc, 'HPP_Plankopf_A1', BuiltInCategory.OST_TitleBlocks)
+    db.FamilySymbol(doc, 'A1 quer', title_block)
+    db.ViewSheet(doc, 'A101 - Grundrisse')
+    schedule = db.ViewSchedule(doc, '<Revisionsplan>',
+                               db.ElementId(BuiltInCategory.INVALID))
+    schedule.IsTitleblockRevisionSchedule = True
+    db.ViewSchedule(doc, 'Raumliste', db.ElementId(BuiltInCategory.OST_Rooms))
+    return view
+
+
+def _create_links(doc):
+    dwg = db.CADLinkType(doc, 'Lageplan.dwg', r'C:\Projekt\Lageplan.dwg')
+    db.ImportInstance(doc, dwg)
+    db.CADLinkType(doc, 'Bestand.dwg', r'C:\Projekt\Bestand.dwg',
+                   db.LinkedFileStatus.NotFound)
+    db.CADLinkType(doc, 'Import Linien.dwg')
+    rvt = db.RevitLinkType(doc, 'TGA.rvt', r'C:\Projekt\TGA.rvt')
+    db.RevitLinkInstance(doc, rvt)
+    db.RevitLinkType(doc, 'Tragwerk.ifc.RVT', r'C:\Projekt\Tragwerk.ifc.RVT',
+                     db.LinkedFileStatus.Unloaded)
+
+
+def _set_phase(element, created, demolished=None):
+    element._values[int(BuiltInParameter.PHASE_CREATED)] = created.Id
+    element._values[int(BuiltInParameter.PHASE_DEMOLISHED)] = \
+        demolished.Id if demolished is not None else db.ElementId(-1)
+
+
+def _line(x0, y0, x1, y1, z):
+    return db.Line(XYZ(x0, y0, z), XYZ(x1, y1, z))
+
+
+def _generate_storey(builder, types, families, phases, level, upper_level,
+                     count, columns, names):
+    """Generate count rooms with walls, doors and windows on the level"""
+    doc, rng = builder.doc, builder.rng
+    wall_types, floor_types, ceiling_type = types
+    door_families, window_families = families
+    existing, new = phases
+    elevation = level.Elevation
+    storey = int(round(elevation / STOREY_HEIGHT))
+    room_parameters = builder.parameter_set(db.Room._parameters,
+                                            ROOM_PARAMETERS)
+    cells = [(index // columns, index % columns) for index in range(count)]
+    present = set(cells)
+    walls = {}
+    rooms = {}
+
+    def wall(key, x0, y0, x1, y1, exterior):
+        if key not in walls:
+            wall_type = wall_types[0] if exterior else \
+                wall_types[1 + rng.randrange(len(wall_types) - 1)]
+            element = db.Wall(doc, wall_type, level,
+                              _line(x0, y0, x1, y1, elevation), STOREY_HEIGHT)
+            _set_phase(element, existing if rng.random() < 0.1 else new)
+            walls[key] = element
+        return walls[key]
+
+    for index, (row, column) in enumerate(cells):
+        x0, y0 = column * ROOM_WIDTH, row * ROOM_DEPTH
+        x1, y1 = x0 + ROOM_WIDTH, y0 + ROOM_DEPTH
+        south = wall(('h', row, column), x0, y0, x1, y0, row == 0)
+        east = wall(('v', row, column + 1), x1, y0, x1, y1,
+                    (row, column + 1) not in present)
+        north = wall(('h', row + 1, column), x1, y1, x0, y1,
+                     (row + 1, column) not in present)
+        west = wall(('v', row, column), x0, y1, x0, y0, column == 0)
+        name = 'Treppenhaus' if index == 0 else names[index]
+        room = db.Room(doc, level, new if rng.random() > 0.05 else existing,
+                       (x0, y0, x1, y1), STOREY_HEIGHT, name,
+                       '{}.{:03d}'.format(storey, index + 1),
+                       room_parameters)
+        room._boundary = [
+            (_line(x0, y0, x1, y0, elevation), south._id),
+            (_line(x1, y0, x1, y1, elevation), east._id),
+            (_line(x1, y1, x0, y1, elevation), north._id),
+            (_line(x0, y1, x0, y0, elevation), west._id),
+        ]
+        finish = db.Floor(doc, floor_types['finish'], level,
+                          (x0, y0, x1, y1), SCREED)
+        slab = db.Floor(doc, floor_types['slab'], upper_level,
+                        (x0, y0, x1, y1))
+        ceiling = db.Ceiling(doc, ceiling_type, level, (x0, y0, x1, y1),
+                             CEILING_HEIGHT)
+        for element in (finish, slab, ceiling):
+            _set_phase(element, new)
+        room._bounding_ids = [south._id, east._id, north._id, west._id,
+                              finish._id, slab._id, ceiling._id]
+        rooms[(row, column)] = room
+        # the door leads into the room from the room south of it
+        _place_door(builder, door_families, phases, level, south,
+                    rooms.get((row - 1, column)), room)
+        facade = [element for element, exterior in (
+            (north, (row + 1, column) not in present),
+            (west, column == 0),
+            (east, (row, column + 1) not in present)) if exterior]
+        if facade:
+            _place_window(builder, window_families, phases, level,
+                          upper_level, room, facade[0])
+    return rooms
+
+
+def _place_door(builder, door_families, phases, level, host, from_room,
+                to_room):
+    doc, rng = builder.doc, builder.rng
+    existing, new = phases
+    if from_room is None:
+        symbol, width, height, parameters = door_families[3]
+    else:
+        symbol, width, height, parameters = door_families[
+            rng.choice((0, 0, 0, 0, 1, 2, 4, 5))]
+    curve = host.Location.Curve
+    middle = curve.Evaluate(0.5, True)
+    half_width = host.Width / 2.0
+    door = db.FamilyInstance(doc, symbol, middle, host, level, parameters,
+                             facing=XYZ.BasisY)
+    door._box = (middle.X - width / 2.0, middle.Y - half_width,
+                 level.Elevation, middle.X + width / 2.0,
+                 middle.Y + half_width, level.Elevation + height)
+    door.FacingFlipped = rng.random() < 0.5
+    door.HandFlipped = rng.random() < 0.5
+    door.Mirrored = door.FacingFlipped != door.HandFlipped
+    roll = rng.random()
+    if roll < 0.08:
+        _set_phase(door, existing, new)
+    elif roll < 0.15:
+        _set_phase(door, existing)
+    else:
+        _set_phase(door, new)
+    door._values[builder.shared['H_TÜ_Kollisionskörper einschalten'].key] = \
+        int(rng.random() < 0.3)
+    for phase in phases:
+        door.set_rooms(phase, from_room, to_room)
+    return door
+
+
+def _place_window(builder, window_families, phases, level, upper_level,
+                  room, host):
+    doc, rng = builder.doc, builder.rng
+    symbol, width, height, parameters = rng.choice(window_families)
+    middle = host.Location.Curve.Evaluate(rng.uniform(0.3, 0.7), True)
+    sill = to_feet(0.9)
+    half_width = host.Width / 2.0
+    direction = host.Location.Curve.Direction
+    window = db.FamilyInstance(doc, symbol, middle, host, level, parameters,
+                               facing=host.Orientation, hand=direction)
+    dx, dy = abs(direction.X) * width / 2.0 + abs(direction.Y) * half_width, \
+        abs(direction.Y) * width / 2.0 + abs(direction.X) * half_width
+    z = level.Elevation + sill
+    window._box = (middle.X - dx, middle.Y - dy, z,
+                   middle.X + dx, middle.Y + dy, z + height)
+    window.Mirrored = rng.random() < 0.2
+    if rng.random() < 0.02:
+        # hosted on the wrong level, found by the Location check
+        window._values[int(BuiltInParameter.FAMILY_LEVEL_PARAM)] = \
+            upper_level.Id
+    window._values[int(BuiltInParameter.WINDOW_WIDTH)] = width
+    window._values[int(BuiltInParameter.INSTANCE_SILL_HEIGHT_PARAM)] = sill
+    window._values[
+        builder.shared['H_TÜ_Kollisionskörper einschalten'].key] = 1
+    _set_phase(window, phases[1])
+    for phase in phases:
+        window.set_rooms(phase, None, room)
+    return window
+
+
+def generate_building(seed=0, rooms=100, storeys=None, title=None):
+    """
+    Generate a document with about rooms * ELEMENTS_PER_ROOM elements.
+    seed - seed of the random choices, the same seed gives the same model
+    rooms - number of rooms, spread evenly over the storeys
+    storeys - number of storeys, by default growing with the square root
+    of the number of rooms
+    """
+    rng = random.Random(seed)
+    doc = db.Document(title or 'Building_{}_{}'.format(seed, rooms))
+    builder = _Builder(doc, rng)
+    storeys = storeys or max(1, int(round(math.sqrt(rooms) / 6.0)))
+    per_storey = int(math.ceil(float(rooms) / storeys))
+    columns = max(1, int(math.ceil(math.sqrt(per_storey * 1.5))))
+    rows = int(math.ceil(float(per_storey) / columns))
+    doc._extent = (0.0, 0.0, columns * ROOM_WIDTH, rows * ROOM_DEPTH)
+
+    phases = (db.Phase(doc, 'Bestand'), db.Phase(doc, 'Neubau'))
+    levels = [db.Level(doc, 'EG' if index == 0 else '{}.OG'.format(index),
+                       index * STOREY_HEIGHT) for index in range(storeys)]
+    roof = db.Level(doc, 'Dach', storeys * STOREY_HEIGHT)
+    types = _create_types(builder)
+    families = _create_families(builder)
+    for name, storage_type in DOOR_PARAMETERS + WINDOW_PARAMETERS + \
+            COLLISION_PARAMETERS + ROOM_PARAMETERS:
+        builder.shared_parameter(name, storage_type)
+
+    ground = [db.Floor(doc, types[1]['slab'], levels[0],
+                       (column * ROOM_WIDTH, row * ROOM_DEPTH,
+                        (column + 1) * ROOM_WIDTH, (row + 1) * ROOM_DEPTH))
+              for row in range(rows) for column in range(columns)
+              if row * columns + column < per_storey]
+    for slab in ground:
+        _set_phase(slab, phases[0])
+
+    remaining = rooms
+    for index, level in enumerate(levels):
+        count = min(per_storey, remaining)
+        if count <= 0:
+            break
+        remaining -= count
+        upper = levels[index + 1] if index + 1 < len(levels) else roof
+        _generate_storey(builder, types, families, phases, level, upper,
+                         count, columns, _weighted_names(rng, count))
+
+    # rooms which are placed nowhere, like rooms of deleted plans
+    for index in range(max(1, rooms // 200)):
+        db.Room(doc, levels[0], phases[1], None, STOREY_HEIGHT,
+                'Nicht platziert', 'X.{:03d}'.format(index + 1),
+                builder.parameter_set(db.Room._parameters, ROOM_PARAMETERS))
+
+    doc.ActiveView = _create_views(doc, levels + [roof])
+    _create_links(doc)
+    return doc
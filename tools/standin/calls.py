@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Counting of the calls of the stand-in API, the number of Revit API calls
+a tool makes. Methods, properties, constructors and static functions of
+the API classes are counted when the tool calls them; what the stand-in
+calls of itself meanwhile is not counted, like the work inside Revit.
+Helpers of the stand-in without a Revit counterpart, named in lower
+case like UIApplication.idle, are no API calls.
+
+Example:
+    with count_calls() as calls:
+        run_script(find_script('Fußboden'))
+    print(calls.count)
+"""
+import contextlib
+import functools
+import inspect
+import types
+
+from standin import db, geometry, storage, ui
+
+API_MODULES = (db, geometry, storage, ui)
+
+
+class ApiCalls(object):
+    """Number of the calls of the tool, calls inside the API excluded"""
+    def __init__(self):
+        self.count = 0
+        self._depth = 0
+
+    def wrap(self, function):
+        @functools.wraps(function)
+        def counted(*args, **kwargs):
+            if self._depth == 0:
+                self.count += 1
+            self._depth += 1
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._depth -= 1
+        return counted
+
+
+class _CountedDescriptor(object):
+    """Descriptor like Element.Name, counted on instances"""
+    def __init__(self, calls, descriptor):
+        self._descriptor = descriptor
+        self._get = calls.wrap(descriptor.__get__)
+        self._set = calls.wrap(descriptor.__set__) \
+            if hasattr(descriptor, '__set__') else None
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self._descriptor.__get__(instance, owner)
+        return self._get(instance, owner)
+
+    def __set__(self, instance, value):
+        if self._set is None:
+            raise AttributeError('The attribute is read-only.')
+        self._set(instance, value)
+
+
+def _counted_member(calls, member):
+    """Get the member counting its calls, None if it is not counted"""
+    if isinstance(member, staticmethod):
+        return staticmethod(calls.wrap(member.__func__))
+    if isinstance(member, classmethod):
+        return classmethod(calls.wrap(member.__func__))
+    if isinstance(member, property):
+        return property(
+            calls.wrap(member.fget) if member.fget else None,
+            calls.wrap(member.fset) if member.fset else None,
+            member.fdel, member.__doc__)
+    if inspect.isfunction(member):
+        return calls.wrap(member)
+    # fields of __slots__, e.g. XYZ.X, are no calls
+    if hasattr(member, '__get__') and \
+            not isinstance(member, types.MemberDescriptorType):
+        return _CountedDescriptor(calls, member)
+    return None
+
+
+def _is_api_member(name):
+    """Revit API members are capitalized or get_ and set_ accessors"""
+    return name == '__init__' or name[:1].isupper() or \
+        name.startswith(('get_', 'set_'))
+
+
+def _api_classes():
+    for module in API_MODULES:
+        for name, value in sorted(vars(module).items()):
+            if isinstance(value, type) and not name.startswith('_') and \
+                    value.__module__ == module.__name__:
+                yield value
+
+
+@contextlib.contextmanager
+def count_calls():
+    """Count the calls of the stand-in API made within the block"""
+    calls = ApiCalls()
+    originals = []
+    for api_class in _api_classes():
+        for name, member in list(vars(api_class).items()):
+            if not _is_api_member(name):
+                continue
+            counted = _counted_member(calls, member)
+            if counted is not None:
+                originals.append((api_class, name, member))
+                setattr(api_class, name, counted)
+    try:
+        yield calls
+    finally:
+        for api_class, name, member in originals:
+            setattr(api_class, name, member)
@@ -0,0 +1,2578 @@
+# -*- coding: utf-8 -*-
+"""
+Autodesk.Revit.DB of the stand-in: the subset of the Revit API the HPP
+tools use, held in memory. Lengths are in feet like in Revit, the
+project length unit is meters.
+"""
+import math
+
+from standin.enums import *  # noqa: F401,F403
+from standin.enums import BuiltInCategory, BuiltInParameter, \
+    CATEGORY_NAMES, ElementOnPhaseStatus, FailureProcessingResult, \
+    LinkedFileStatus, SpatialElementBoundaryLocation, StorageType, \
+    TransactionStatus, ViewType, WallKind
+from standin.geometry import *  # noqa: F401,F403
+from standin.geometry import BoundingBoxXYZ, Face, GeometryElement, \
+    LocationCurve, LocationPoint, Outline, Solid, Transform, XYZ
+from standin.system import ArgumentException, Guid, \
+    InvalidOperationException, List
+
+
+class ModificationOutsideTransactionException(InvalidOperationException):
+    pass
+
+
+# working with ids
+
+class ElementId(object):
+    __slots__ = ('IntegerValue',)
+
+    def __init__(self, value):
+        self.IntegerValue = int(value)
+
+    @property
+    def Value(self):
+        return self.IntegerValue
+
+    def __eq__(self, other):
+        return isinstance(other, ElementId) and \
+            self.IntegerValue == other.IntegerValue
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __lt__(self, other):
+        return self.IntegerValue < other.IntegerValue
+
+    def __hash__(self):
+        return hash(self.IntegerValue)
+
+    def __str__(self):
+        return str(self.IntegerValue)
+
+    ToString = __str__
+
+    def __repr__(self):
+        return 'ElementId({})'.format(self.IntegerValue)
+
+    def Compare(self, other):
+        return (self.IntegerValue > other.IntegerValue) - \
+            (self.IntegerValue < other.IntegerValue)
+
+
+ElementId.InvalidElementId = ElementId(-1)
+INVALID = -1
+
+
+def _key(value):
+    """Integer key of an ElementId, an enum member or an int"""
+    if isinstance(value, ElementId):
+        return value.IntegerValue
+    return int(value)
+
+
+def _ids(values):
+    return List[ElementId](ElementId(value) for value in values)
+
+
+# working with units
+
+class ForgeTypeId(object):
+    def __init__(self, type_id):
+        self.TypeId = type_id
+
+    def __eq__(self, other):
+        return isinstance(other, ForgeTypeId) and self.TypeId == other.TypeId
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.TypeId)
+
+    def __repr__(self):
+        return self.TypeId
+
+
+class UnitTypeId(object):
+    Feet = ForgeTypeId('autodesk.unit.unit:feet')
+    Meters = ForgeTypeId('autodesk.unit.unit:meters')
+    Centimeters = ForgeTypeId('autodesk.unit.unit:centimeters')
+    Millimeters = ForgeTypeId('autodesk.unit.unit:millimeters')
+    SquareFeet = ForgeTypeId('autodesk.unit.unit:squareFeet')
+    SquareMeters = ForgeTypeId('autodesk.unit.unit:squareMeters')
+    CubicFeet = ForgeTypeId('autodesk.unit.unit:cubicFeet')
+    CubicMeters = ForgeTypeId('autodesk.unit.unit:cubicMeters')
+
+
+class SpecTypeId(object):
+    Length = ForgeTypeId('autodesk.spec.aec:length')
+    Area = ForgeTypeId('autodesk.spec.aec:area')
+    Volume = ForgeTypeId('autodesk.spec.aec:volume')
+
+
+_FACTORS = {
+    UnitTypeId.Feet: 1.0,
+    UnitTypeId.Meters: 0.3048,
+    UnitTypeId.Centimeters: 30.48,
+    UnitTypeId.Millimeters: 304.8,
+    UnitTypeId.SquareFeet: 1.0,
+    UnitTypeId.SquareMeters: 0.3048 ** 2,
+    UnitTypeId.CubicFeet: 1.0,
+    UnitTypeId.CubicMeters: 0.3048 ** 3,
+}
+
+
+class UnitUtils(object):
+    @staticmethod
+    def ConvertFromInternalUnits(value, unit_type_id):
+        return value * _FACTORS[unit_type_id]
+
+    @staticmethod
+    def ConvertToInternalUnits(value, unit_type_id):
+        return value / _FACTORS[unit_type_id]
+
+
+class FormatOptions(object):
+    def __init__(self, unit_type_id):
+        self._unit_type_id = unit_type_id
+
+    def GetUnitTypeId(self):
+        return self._unit_type_id
+
+
+class Units(object):
+    def __init__(self):
+        self._options = {
+            SpecTypeId.Length: FormatOptions(UnitTypeId.Meters),
+            SpecTypeId.Area: FormatOptions(UnitTypeId.SquareMeters),
+            SpecTypeId.Volume: FormatOptions(UnitTypeId.CubicMeters),
+        }
+
+    def GetFormatOptions(self, spec_type_id):
+        return self._options[spec_type_id]
+
+    def SetFormatOptions(self, spec_type_id, options):
+        self._options[spec_type_id] = options
+
+
+def to_feet(meters):
+    return meters / 0.3048
+
+
+# working with parameters
+
+class Definition(object):
+    def __init__(self, name, builtin=None):
+        self.Name = name
+        self.BuiltInParameter = builtin \
+            if builtin is not None else BuiltInParameter.INVALID
+
+
+class ParameterDefinition(object):
+    """
+    What a parameter is: its key (the BuiltInParameter value or the id
+    of the SharedParameterElement), name and storage type. Values are
+    stored in the elements, definitions are shared by all of them.
+    getter - computes the value of read-only built-in parameters
+    display - formats the value for AsValueString
+    """
+    def __init__(self, key, name, storage_type, read_only=False,
+                 getter=None, display=None, guid=None):
+        self.key = key
+        self.name = name
+        self.storage_type = storage_type
+        self.read_only = read_only or getter is not None
+        self.getter = getter
+        self.display = display
+        self.guid = guid
+        self.definition = Definition(
+            name, None if guid else _builtin_member(key))
+
+
+def _builtin_member(key):
+    for member in BuiltInParameter._members:
+        if member.value__ == key:
+            return member
+
+
+def builtin(name, storage_type, label, getter=None, display=None,
+            read_only=False):
+    return ParameterDefinition(
+        int(getattr(BuiltInParameter, name)), label, storage_type,
+        read_only, getter, display)
+
+
+class ParameterSet(object):
+    """The parameters an element has, shared by elements of one kind"""
+    def __init__(self, definitions):
+        self.definitions = list(definitions)
+        self.by_key = dict((d.key, d) for d in self.definitions)
+        self.by_name = {}
+        for definition in self.definitions:
+            self.by_name.setdefault(definition.name, definition)
+
+    def extended(self, definitions):
+        return ParameterSet(self.definitions + list(definitions))
+
+
+_NO_VALUE = object()
+
+
+class Parameter(object):
+    """A view of one parameter value of an element"""
+    __slots__ = ('Element', '_definition')
+
+    def __init__(self, element, definition):
+        self.Element = element
+        self._definition = definition
+
+    @property
+    def Definition(self):
+        return self._definition.definition
+
+    @property
+    def Id(self):
+        return ElementId(self._definition.key)
+
+    @property
+    def StorageType(self):
+        return self._definition.storage_type
+
+    @property
+    def IsReadOnly(self):
+        return self._definition.read_only
+
+    @property
+    def IsShared(self):
+        return self._definition.guid is not None
+
+    @property
+    def GUID(self):
+        return self._definition.guid
+
+    def _value(self):
+        if self._definition.getter is not None:
+            return self._definition.getter(self.Element)
+        return self.Element._values.get(self._definition.key)
+
+    @property
+    def HasValue(self):
+        value = self._value()
+        return value is not None and value != ''
+
+    def AsString(self):
+        if self._definition.storage_type == StorageType.String:
+            return self._value()
+        return None
+
+    def AsInteger(self):
+        if self._definition.storage_type == StorageType.Integer:
+            return self._value() or 0
+        return 0
+
+    def AsDouble(self):
+        if self._definition.storage_type == StorageType.Double:
+            return self._value() or 0.0
+        return 0.0
+
+    def AsElementId(self):
+        if self._definition.storage_type == StorageType.ElementId:
+            return self._value() or ElementId.InvalidElementId
+        return ElementId.InvalidElementId
+
+    def AsValueString(self):
+        if self._definition.display is not None:
+            return self._definition.display(self.Element)
+        value = self._value()
+        if value is None:
+            return None
+        if self._definition.storage_type == StorageType.ElementId:
+            element = self.Element.Document.GetElement(value)
+            return element.Name if element is not None else None
+        if self._definition.storage_type == StorageType.Double:
+            return '{:.3f}'.format(
+                UnitUtils.ConvertFromInternalUnits(value, UnitTypeId.Meters))
+        return str(value)
+
+    def Set(self, value):
+        element = self.Element
+        element.Document._check_modifiable()
+        if self._definition.read_only:
+            raise InvalidOperationException(
+                'The parameter is read-only.')
+        storage_type = self._definition.storage_type
+        if storage_type == StorageType.Double:
+            if isinstance(value, bool) or \
+                    not isinstance(value, (int, float)):
+                return False
+            value = float(value)
+        elif storage_type == StorageType.Integer:
+            if not isinstance(value, (int, bool)):
+                return False
+            value = int(value)
+        elif storage_type == StorageType.String:
+            if not isinstance(value, str):
+                return False
+        elif storage_type == StorageType.ElementId:
+            if not isinstance(value, ElementId):
+                return False
+        element._set_value(self._definition.key, value)
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, Parameter) and \
+            self.Element is other.Element and \
+            self._definition is other._definition
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self.Element), self._definition.key))
+
+
+class _ParameterIndexer(object):
+    """element.Parameter[builtin] and element.Parameter(builtin)"""
+    __slots__ = ('_element',)
+
+    def __init__(self, element):
+        self._element = element
+
+    def __getitem__(self, key):
+        return self._element.get_Parameter(key)
+
+    __call__ = __getitem__
+
+
+class _NameProperty(object):
+    """Element.Name, readable from the class as Element.Name.GetValue"""
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance._get_name()
+
+    def __set__(self, instance, value):
+        instance._set_name(value)
+
+    def GetValue(self, element):
+        return element._get_name()
+
+
+class _Indexer(object):
+    __slots__ = ('_get',)
+
+    def __init__(self, get):
+        self._get = get
+
+    def __getitem__(self, key):
+        return self._get(key)
+
+
+# working with elements
+
+def _type_name(element):
+    element_type = element.Document.GetElement(element.GetTypeId())
+    return element_type.Name if element_type is not None else None
+
+
+def _family_name(element):
+    element_type = element.Document.GetElement(element.GetTypeId())
+    return element_type.FamilyName if element_type is not None else None
+
+
+def _family_and_type(element):
+    element_type = element.Document.GetElement(element.GetTypeId())
+    if element_type is None:
+        return None
+    return '{}: {}'.format(element_type.FamilyName, element_type.Name)
+
+
+def _type_id(element):
+    return element.GetTypeId()
+
+
+MODEL_INSTANCE_PARAMETERS = (
+    builtin('PHASE_CREATED', StorageType.ElementId, 'Phase Created'),
+    builtin('PHASE_DEMOLISHED', StorageType.ElementId, 'Phase Demolished'),
+    builtin('ALL_MODEL_INSTANCE_COMMENTS', StorageType.String, 'Comments'),
+    builtin('ALL_MODEL_MARK', StorageType.String, 'Mark'),
+    builtin('ELEM_TYPE_PARAM', StorageType.ElementId, 'Type',
+            _type_id, _type_name),
+    builtin('ELEM_FAMILY_PARAM', StorageType.ElementId, 'Family',
+            _type_id, _family_name),
+    builtin('ELEM_FAMILY_AND_TYPE_PARAM', StorageType.ElementId,
+            'Family and Type', _type_id, _family_and_type),
+)
+TYPE_PARAMETERS = (
+    builtin('ALL_MODEL_TYPE_NAME', StorageType.String, 'Type Name',
+            lambda element: element.Name),
+)
+
+
+class Element(object):
+    """
+    Base of all elements. Parameter values are stored in _values by
+    parameter key, which parameters exist is told by the parameter set.
+    """
+    _category = None
+    _parameters = ParameterSet(())
+
+    Name = _NameProperty()
+
+    def __init__(self, doc, name='', parameters=None, category=None):
+        self._doc = doc
+        self._name = name
+        self._values = {}
+        self._deleted = False
+        self._type_id = INVALID
+        self._level_id = INVALID
+        self._box = None
+        self._entities = None
+        self.Location = None
+        if parameters is not None:
+            self._parameters = parameters
+        if category is not None:
+            self._category = int(category)
+        doc._add(self)
+
+    def __repr__(self):
+        return '<{} {} "{}">'.format(
+            type(self).__name__, self._id, self._name)
+
+    # identity
+
+    @property
+    def Id(self):
+        return ElementId(self._id)
+
+    @property
+    def UniqueId(self):
+        return '{}-{:08x}'.format(self._doc._guid, self._id)
+
+    @property
+    def Document(self):
+        return self._doc
+
+    @property
+    def IsValidObject(self):
+        return not self._deleted
+
+    @property
+    def Category(self):
+        if self._category is None:
+            return None
+        return self._doc.Settings.Categories.get_Item(self._category)
+
+    def _get_name(self):
+        return self._name
+
+    def _set_name(self, name):
+        self._doc._check_modifiable()
+        self._doc._record(self._restore_name, self._name)
+        self._name = name
+
+    def _restore_name(self, name):
+        self._name = name
+
+    def GetTypeId(self):
+        return ElementId(self._type_id)
+
+    @property
+    def LevelId(self):
+        return ElementId(self._level_id)
+
+    def GetPhaseStatus(self, phase_id):
+        return _phase_status(self, _key(phase_id))
+
+    # parameters
+
+    @property
+    def Parameter(self):
+        return _ParameterIndexer(self)
+
+    @property
+    def Parameters(self):
+        return [Parameter(self, definition)
+                for definition in self._parameters.definitions]
+
+    def get_Parameter(self, key):
+        definition = self._parameters.by_key.get(int(key)) \
+            if not isinstance(key, Guid) else next(
+                (d for d in self._parameters.definitions if d.guid == key),
+                None)
+        if definition is None:
+            return None
+        return Parameter(self, definition)
+
+    def LookupParameter(self, name):
+        definition = self._parameters.by_name.get(name)
+        if definition is None:
+            return None
+        return Parameter(self, definition)
+
+    def _get_value(self, key):
+        """Get the value of the parameter or _NO_VALUE if it is missing"""
+        definition = self._parameters.by_key.get(key)
+        if definition is None:
+            return _NO_VALUE, None
+        if definition.getter is not None:
+            return definition.getter(self), definition
+        return self._values.get(key), definition
+
+    def _set_value(self, key, value):
+        self._doc._record(self._restore_value, key,
+                          self._values.get(key, _NO_VALUE))
+        self._values[key] = value
+
+    def _restore_value(self, key, value):
+        if value is _NO_VALUE:
+            self._values.pop(key, None)
+        else:
+            self._values[key] = value
+
+    # geometry
+
+    def get_BoundingBox(self, view):
+        if self._box is None:
+            return None
+        x0, y0, z0, x1, y1, z1 = self._box
+        return BoundingBoxXYZ(XYZ(x0, y0, z0), XYZ(x1, y1, z1))
+
+    @property
+    def Geometry(self):
+        return _Indexer(self._get_geometry)
+
+    def _get_geometry(self, options):
+        if self._box is None:
+            return GeometryElement()
+        x0, y0, z0, x1, y1, z1 = self._box
+        return GeometryElement(
+            [Solid([Face(self.Id)], (x1 - x0) * (y1 - y0) * (z1 - z0))])
+
+    def _references(self):
+        """Ids of the elements this one is deleted together with"""
+        return (self._type_id,)
+
+    # extensible storage
+
+    def GetEntity(self, schema):
+        from standin.storage import Entity
+        entity = (self._entities or {}).get(schema.GUID)
+        return entity.copy() if entity is not None else Entity()
+
+    def SetEntity(self, entity):
+        self._doc._check_modifiable()
+        if self._entities is None:
+            self._entities = {}
+        key = entity.Schema.GUID
+        self._doc._record(self._restore_entity, key,
+                          self._entities.get(key))
+        self._entities[key] = entity.copy()
+
+    def DeleteEntity(self, schema):
+        self._doc._check_modifiable()
+        if self._entities and schema.GUID in self._entities:
+            self._doc._record(self._restore_entity, schema.GUID,
+                              self._entities.pop(schema.GUID))
+            return True
+        return False
+
+    def _restore_entity(self, key, entity):
+        if entity is None:
+            self._entities.pop(key, None)
+        else:
+            self._entities[key] = entity
+
+    # updater triggers
+
+    @staticmethod
+    def GetChangeTypeAny():
+        return ChangeType('any')
+
+    @staticmethod
+    def GetChangeTypeElementAddition():
+        return ChangeType('addition')
+
+    @staticmethod
+    def GetChangeTypeElementDeletion():
+        return ChangeType('deletion')
+
+    @staticmethod
+    def GetChangeTypeGeometry():
+        return ChangeType('geometry')
+
+    @staticmethod
+    def GetChangeTypeParameter(parameter_id):
+        return ChangeType('parameter', _key(parameter_id))
+
+
+def _phase_status(element, phase_key):
+    """ElementOnPhaseStatus of the element on the phase"""
+    doc = element.Document
+    created, _ = element._get_value(
+        int(BuiltInParameter.PHASE_CREATED))
+    if created is _NO_VALUE or created is None:
+        return ElementOnPhaseStatus.None_
+    demolished, _ = element._get_value(
+        int(BuiltInParameter.PHASE_DEMOLISHED))
+    sequence = doc._phase_sequence
+    phase = sequence.get(phase_key)
+    created = sequence.get(created.IntegerValue)
+    demolished = sequence.get(demolished.IntegerValue) \
+        if demolished not in (None, _NO_VALUE) else None
+    if phase is None or created is None:
+        return ElementOnPhaseStatus.None_
+    if created > phase:
+        return ElementOnPhaseStatus.Future
+    if demolished is not None and demolished < phase:
+        return ElementOnPhaseStatus.Past
+    if demolished == phase:
+        return ElementOnPhaseStatus.Temporary if created == phase \
+            else ElementOnPhaseStatus.Demolished
+    if created == phase:
+        return ElementOnPhaseStatus.New
+    return ElementOnPhaseStatus.Existing
+
+
+# 'None' is no valid attribute name in Python
+ElementOnPhaseStatus.None_ = getattr(ElementOnPhaseStatus, 'None')
+
+
+class ElementType(Element):
+    _parameters = ParameterSet(TYPE_PARAMETERS)
+
+    @property
+    def FamilyName(self):
+        return getattr(self, '_family_name', '')
+
+
+class Category(object):
+    def __init__(self, doc, builtin_category, name):
+        self._doc = doc
+        self.BuiltInCategory = builtin_category
+        self.Id = ElementId(builtin_category)
+        self.Name = name
+        self.SubCategories = []
+        self.Parent = None
+        self._line_patterns = {}
+
+    @staticmethod
+    def GetCategory(doc, builtin_category):
+        return doc.Settings.Categories.get_Item(builtin_category)
+
+    def GetLinePatternId(self, graphics_style_type):
+        return ElementId(self._line_patterns.get(
+            int(graphics_style_type), INVALID))
+
+    def SetLinePatternId(self, pattern_id, graphics_style_type):
+        self._line_patterns[int(graphics_style_type)] = _key(pattern_id)
+
+    def __eq__(self, other):
+        return isinstance(other, Category) and self.Id == other.Id
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.Id)
+
+
+class Categories(object):
+    def __init__(self, doc):
+        self._items = dict(
+            (int(getattr(BuiltInCategory, name)),
+             Category(doc, getattr(BuiltInCategory, name), label))
+            for name, label in CATEGORY_NAMES)
+
+    def get_Item(self, key):
+        if isinstance(key, str):
+            return next((category for category in self._items.values()
+                         if category.Name == key), None)
+        return self._items.get(_key(key))
+
+    def __iter__(self):
+        return iter(sorted(self._items.values(),
+                           key=lambda category: category.Name))
+
+    @property
+    def Size(self):
+        return len(self._items)
+
+
+class Settings(object):
+    def __init__(self, doc):
+        self.Categories = Categories(doc)
+
+
+# working with families
+
+class Family(Element):
+    def __init__(self, doc, name, category):
+        Element.__init__(self, doc, name)
+        self.FamilyCategory = Category.GetCategory(doc, category)
+
+    @property
+    def FamilyCategoryId(self):
+        return self.FamilyCategory.Id
+
+    def GetFamilySymbolIds(self):
+        return _ids(element._id for element in self._doc._elements.values()
+                    if isinstance(element, FamilySymbol) and
+                    element._family_id == self._id)
+
+
+class FamilySymbol(ElementType):
+    _parameters = ParameterSet(TYPE_PARAMETERS + (
+        builtin('FUNCTION_PARAM', StorageType.Integer, 'Function'),
+        builtin('FURNITURE_WIDTH', StorageType.Double, 'Width'),
+        builtin('WINDOW_WIDTH', StorageType.Double, 'Width'),
+        builtin('WINDOW_HEIGHT', StorageType.Double, 'Height'),
+    ))
+
+    def __init__(self, doc, name, family, parameters=None):
+        ElementType.__init__(self, doc, name, parameters,
+                             family.FamilyCategory.BuiltInCategory)
+        self._family_id = family._id
+        self.IsActive = True
+
+    @property
+    def Family(self):
+        return self._doc.GetElement(ElementId(self._family_id))
+
+    @property
+    def FamilyName(self):
+        return self.Family.Name
+
+    def Activate(self):
+        self.IsActive = True
+
+    def _references(self):
+        return (self._family_id,)
+
+
+class _RoomIndexer(object):
+    __slots__ = ('_instance', '_side')
+
+    def __init__(self, instance, side):
+        self._instance = instance
+        self._side = side
+
+    def __getitem__(self, phase):
+        rooms = self._instance._rooms.get(
+            phase._id if isinstance(phase, Element) else _key(phase))
+        if rooms is None or rooms[self._side] == INVALID:
+            return None
+        return self._instance._doc.GetElement(
+            ElementId(rooms[self._side]))
+
+
+class FamilyInstance(Element):
+    _parameters = ParameterSet(MODEL_INSTANCE_PARAMETERS + (
+        builtin('FAMILY_LEVEL_PARAM', StorageType.ElementId, 'Level'),
+        builtin('INSTANCE_SILL_HEIGHT_PARAM', StorageType.Double,
+                'Sill Height'),
+    ))
+
+    def __init__(self, doc, symbol, point, host=None, level=None,
+                 parameters=None, facing=None, hand=None):
+        Element.__init__(self, doc, symbol.Name, parameters,
+                         symbol._category)
+        self._type_id = symbol._id
+        self._host_id = host._id if host is not None else INVALID
+        self._level_id = level._id if level is not None else INVALID
+        self._rooms = {}
+        self.Location = LocationPoint(point)
+        self.FacingOrientation = facing or XYZ.BasisY
+        self.HandOrientation = hand or XYZ.BasisX
+        self.FacingFlipped = False
+        self.HandFlipped = False
+        self.Mirrored = False
+        self.SuperComponent = None
+        if level is not None:
+            self._values[int(BuiltInParameter.FAMILY_LEVEL_PARAM)] = level.Id
+
+    @property
+    def Symbol(self):
+        return self._doc.GetElement(ElementId(self._type_id))
+
+    @property
+    def Host(self):
+        if self._host_id == INVALID:
+            return None
+        return self._doc.GetElement(ElementId(self._host_id))
+
+    @property
+    def FromRoom(self):
+        return _RoomIndexer(self, 0)
+
+    @property
+    def ToRoom(self):
+        return _RoomIndexer(self, 1)
+
+    def set_rooms(self, phase, from_room, to_room):
+        self._rooms[phase._id] = (
+            from_room._id if from_room is not None else INVALID,
+            to_room._id if to_room is not None else INVALID)
+
+    def GetTransform(self):
+        return Transform(self.Location.Point, self.HandOrientation,
+                         self.FacingOrientation)
+
+    def GetSubComponentIds(self):
+        return List[ElementId]()
+
+    def _references(self):
+        return (self._type_id, self._host_id)
+
+
+# working with walls, floors and ceilings
+
+class CompoundStructureLayer(object):
+    def __init__(self, width, material_id, function=None):
+        self.Width = width
+        self.MaterialId = material_id
+        self.Function = function
+
+
+class CompoundStructure(object):
+    def __init__(self, layers, structural_index=-1):
+        self._layers = list(layers)
+        self.StructuralMaterialIndex = structural_index
+
+    def GetLayers(self):
+        return list(self._layers)
+
+    def GetMaterialId(self, index):
+        return self._layers[index].MaterialId
+
+    def GetWidth(self):
+        return sum(layer.Width for layer in self._layers)
+
+    @property
+    def LayerCount(self):
+        return len(self._layers)
+
+
+class Material(Element):
+    def __init__(self, doc, name):
+        Element.__init__(self, doc, name)
+        self.SurfaceForegroundPatternId = ElementId.InvalidElementId
+        self.SurfaceBackgroundPatternId = ElementId.InvalidElementId
+        self.CutForegroundPatternId = ElementId.InvalidElementId
+        self.CutBackgroundPatternId = ElementId.InvalidElementId
+
+
+class HostObjAttributes(ElementType):
+    def __init__(self, doc, name, category, family_name, structure=None):
+        ElementType.__init__(self, doc, name, category=category)
+        self._family_name = family_name
+        self._structure = structure
+
+    def GetCompoundStructure(self):
+        return self._structure
+
+    @property
+    def Width(self):
+        return self._structure.GetWidth() if self._structure else 0.0
+
+
+class WallType(HostObjAttributes):
+    def __init__(self, doc, name, structure=None, kind=WallKind.Basic):
+        HostObjAttributes.__init__(
+            self, doc, name, BuiltInCategory.OST_Walls,
+            'Curtain Wall' if kind == WallKind.Curtain else 'Basic Wall',
+            structure)
+        self.Kind = kind
+
+
+class FloorType(HostObjAttributes):
+    def __init__(self, doc, name, structure=None):
+        HostObjAttributes.__init__(
+            self, doc, name, BuiltInCategory.OST_Floors, 'Floor', structure)
+
+
+class CeilingType(HostObjAttributes):
+    def __init__(self, doc, name, structure=None):
+        HostObjAttributes.__init__(
+            self, doc, name, BuiltInCategory.OST_Ceilings, 'Compound Ceiling',
+            structure)
+
+
+class HostObject(Element):
+    def __init__(self, doc, host_type, level, box, parameters=None):
+        Element.__init__(self, doc, host_type.Name, parameters,
+                         host_type._category)
+        self._type_id = host_type._id
+        self._level_id = level._id
+        self._box = box
+
+
+class Wall(HostObject):
+    _parameters = ParameterSet(MODEL_INSTANCE_PARAMETERS + (
+        builtin('WALL_BASE_CONSTRAINT', StorageType.ElementId,
+                'Base Constraint'),
+        builtin('WALL_USER_HEIGHT_PARAM', StorageType.Double,
+                'Unconnected Height'),
+    ))
+
+    def __init__(self, doc, wall_type, level, curve, height,
+                 parameters=None):
+        start, end = curve.GetEndPoint(0), curve.GetEndPoint(1)
+        half = wall_type.Width / 2.0
+        box = (min(start.X, end.X) - half, min(start.Y, end.Y) - half,
+               level.Elevation, max(start.X, end.X) + half,
+               max(start.Y, end.Y) + half, level.Elevation + height)
+        HostObject.__init__(self, doc, wall_type, level, box, parameters)
+        self.Location = LocationCurve(curve)
+        self.Flipped = False
+        self.CurtainGrid = None
+        self._values[int(BuiltInParameter.WALL_BASE_CONSTRAINT)] = level.Id
+        self._values[int(BuiltInParameter.WALL_USER_HEIGHT_PARAM)] = height
+
+    @property
+    def WallType(self):
+        return self._doc.GetElement(ElementId(self._type_id))
+
+    @property
+    def Width(self):
+        return self.WallType.Width
+
+    @property
+    def Orientation(self):
+        direction = self.Location.Curve.Direction
+        return XYZ(direction.Y, -direction.X, 0)
+
+    def FindInserts(self, openings, shadows, embedded, shared):
+        return _ids(element._id for element in self._doc._elements.values()
+                    if getattr(element, '_host_id', None) == self._id)
+
+
+def _level_elevation(element):
+    return element.Document.GetElement(element.LevelId).Elevation
+
+
+def _host_thickness(element):
+    return element.Document.GetElement(element.GetTypeId()).Width
+
+
+class Floor(HostObject):
+    _parameters = ParameterSet(MODEL_INSTANCE_PARAMETERS + (
+        builtin('LEVEL_PARAM', StorageType.ElementId, 'Level'),
+        builtin('FLOOR_HEIGHTABOVELEVEL_PARAM', StorageType.Double,
+                'Height Offset From Level'),
+        builtin('FLOOR_ATTR_THICKNESS_PARAM', StorageType.Double,
+                'Thickness', _host_thickness),
+        builtin('STRUCTURAL_ELEVATION_AT_TOP', StorageType.Double,
+                'Elevation at Top', lambda floor: _level_elevation(floor) +
+                floor._values[int(
+                    BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM)]),
+    ))
+
+    def __init__(self, doc, floor_type, level, rectangle, offset=0.0,
+                 parameters=None):
+        x0, y0, x1, y1 = rectangle
+        top = level.Elevation + offset
+        HostObject.__init__(self, doc, floor_type, level,
+                            (x0, y0, top - floor_type.Width, x1, y1, top),
+                            parameters)
+        self._values[int(BuiltInParameter.LEVEL_PARAM)] = level.Id
+        self._values[int(
+            BuiltInParameter.FLOOR_HEIGHTABOVELEVEL_PARAM)] = offset
+
+    @property
+    def FloorType(self):
+        return self._doc.GetElement(ElementId(self._type_id))
+
+
+class Ceiling(HostObject):
+    _parameters = ParameterSet(MODEL_INSTANCE_PARAMETERS + (
+        builtin('LEVEL_PARAM', StorageType.ElementId, 'Level'),
+        builtin('CEILING_HEIGHTABOVELEVEL_PARAM', StorageType.Double,
+                'Height Offset From Level'),
+    ))
+
+    def __init__(self, doc, ceiling_type, level, rectangle, offset,
+                 parameters=None):
+        x0, y0, x1, y1 = rectangle
+        bottom = level.Elevation + offset
+        HostObject.__init__(
+            self, doc, ceiling_type, level,
+            (x0, y0, bottom, x1, y1, bottom + ceiling_type.Width),
+            parameters)
+        self._values[int(BuiltInParameter.LEVEL_PARAM)] = level.Id
+        self._values[int(
+            BuiltInParameter.CEILING_HEIGHTABOVELEVEL_PARAM)] = offset
+
+
+class Level(Element):
+    _category = int(BuiltInCategory.OST_Levels)
+    _parameters = ParameterSet((
+        builtin('LEVEL_ELEV', StorageType.Double, 'Elevation',
+                lambda level: level.Elevation),
+        builtin('LEVEL_IS_BUILDING_STORY', StorageType.Integer,
+                'Building Story'),
+    ))
+
+    def __init__(self, doc, name, elevation, is_building_story=True):
+        Element.__init__(self, doc, name)
+        self.Elevation = elevation
+        self.ProjectElevation = elevation
+        self._values[int(BuiltInParameter.LEVEL_IS_BUILDING_STORY)] = \
+            int(is_building_story)
+
+    def get_BoundingBox(self, view):
+        x0, y0, x1, y1 = self._doc._extent
+        return BoundingBoxXYZ(XYZ(x0, y0, self.Elevation),
+                              XYZ(x1, y1, self.Elevation))
+
+
+class Phase(Element):
+    pass
+
+
+class PhaseArray(object):
+    def __init__(self, phases):
+        self._phases = list(phases)
+
+    def __iter__(self):
+        return iter(self._phases)
+
+    def __len__(self):
+        return len(self._phases)
+
+    @property
+    def Size(self):
+        return len(self._phases)
+
+    @property
+    def IsEmpty(self):
+        return not self._phases
+
+    def get_Item(self, index):
+        return self._phases[index]
+
+    __getitem__ = get_Item
+
+
+# working with rooms
+
+class BoundarySegment(object):
+    def __init__(self, curve, element_id):
+        self._curve = curve
+        self.ElementId = element_id
+        self.LinkElementId = ElementId.InvalidElementId
+
+    def GetCurve(self):
+        return self._curve
+
+
+class SpatialElement(Element):
+    pass
+
+
+def _room_area(room):
+    if room.Location is None or room._rectangle is None:
+        return 0.0
+    x0, y0, x1, y1 = room._rectangle
+    return (x1 - x0) * (y1 - y0)
+
+
+class Room(SpatialElement):
+    _category = int(BuiltInCategory.OST_Rooms)
+    _parameters = ParameterSet((
+        builtin('ROOM_NAME', StorageType.String, 'Name'),
+        builtin('ROOM_NUMBER', StorageType.String, 'Number'),
+        builtin('ROOM_AREA', StorageType.Double, 'Area', _room_area),
+        builtin('ROOM_PHASE', StorageType.ElementId, 'Phase',
+                read_only=True),
+        builtin('ROOM_LEVEL_ID', StorageType.ElementId, 'Level',
+                lambda room: room.LevelId),
+        builtin('ROOM_UPPER_OFFSET', StorageType.Double, 'Limit Offset'),
+        builtin('ALL_MODEL_INSTANCE_COMMENTS', StorageType.String,
+                'Comments'),
+    ))
+
+    def __init__(self, doc, level, phase, rectangle, height, name, number,
+                 parameters=None):
+        Element.__init__(self, doc, name, parameters)
+        self._level_id = level._id
+        self._rectangle = rectangle
+        self._boundary = []
+        self._bounding_ids = []
+        self._values[int(BuiltInParameter.ROOM_NAME)] = name
+        self._values[int(BuiltInParameter.ROOM_NUMBER)] = number
+        self._values[int(BuiltInParameter.ROOM_PHASE)] = phase.Id
+        self._values[int(BuiltInParameter.ROOM_UPPER_OFFSET)] = height
+        if rectangle is not None:
+            x0, y0, x1, y1 = rectangle
+            elevation = level.Elevation
+            self._box = (x0, y0, elevation, x1, y1, elevation + height)
+            self.Location = LocationPoint(
+                XYZ((x0 + x1) / 2.0, (y0 + y1) / 2.0, elevation))
+
+    def _get_name(self):
+        return '{} {}'.format(
+            self._values.get(int(BuiltInParameter.ROOM_NAME)) or '',
+            self.Number or '').strip()
+
+    def _set_name(self, name):
+        self.get_Parameter(BuiltInParameter.ROOM_NAME).Set(name)
+
+    @property
+    def Number(self):
+        return self._values.get(int(BuiltInParameter.ROOM_NUMBER))
+
+    @Number.setter
+    def Number(self, number):
+        self.get_Parameter(BuiltInParameter.ROOM_NUMBER).Set(number)
+
+    @property
+    def Level(self):
+        return self._doc.GetElement(self.LevelId)
+
+    @property
+    def Area(self):
+        return _room_area(self)
+
+    @property
+    def UnboundedHeight(self):
+        return self._values[int(BuiltInParameter.ROOM_UPPER_OFFSET)]
+
+    def GetBoundarySegments(self, options):
+        loops = List[List[BoundarySegment]]()
+        if self.Location is not None and self._boundary:
+            loops.Add(List[BoundarySegment](
+                BoundarySegment(curve, ElementId(element_id))
+                for curve, element_id in self._boundary))
+        return loops
+
+    def IsPointInRoom(self, point):
+        if self._box is None:
+            return False
+        x0, y0, z0, x1, y1, z1 = self._box
+        return x0 <= point.X <= x1 and y0 <= point.Y <= y1 and \
+            z0 <= point.Z <= z1
+
+
+class SpatialElementBoundaryOptions(object):
+    def __init__(self):
+        self.SpatialElementBoundaryLocation = None
+        self.StoreFreeBoundaryFaces = False
+
+
+class LinkElementId(object):
+    def __init__(self, host_element_id):
+        self.HostElementId = host_element_id
+        self.LinkedElementId = ElementId.InvalidElementId
+        self.LinkInstanceId = ElementId.InvalidElementId
+
+
+class SpatialElementBoundarySubface(object):
+    def __init__(self, host_element_id):
+        self.SpatialBoundaryElement = LinkElementId(host_element_id)
+
+
+class SpatialElementGeometryResults(object):
+    def __init__(self, solid):
+        self._solid = solid
+
+    def GetGeometry(self):
+        return self._solid
+
+    def GetBoundaryFaceInfo(self, face):
+        return [SpatialElementBoundarySubface(face._host_id)]
+
+
+class SpatialElementGeometryCalculator(object):
+    """Faces of a room come from its walls, floors and ceilings"""
+    def __init__(self, doc, options=None):
+        self._doc = doc
+
+    def CalculateSpatialElementGeometry(self, room):
+        if room.Location is None or not room._bounding_ids:
+            raise InvalidOperationException(
+                'The room is not placed or not enclosed.')
+        return SpatialElementGeometryResults(Solid(
+            [Face(ElementId(element_id))
+             for element_id in room._bounding_ids]))
+
+
+class AreaVolumeSettings(object):
+    def __init__(self, doc):
+        self._doc = doc
+        self._compute_volumes = False
+        self._locations = {}
+
+    @staticmethod
+    def GetAreaVolumeSettings(doc):
+        return doc._area_volume_settings
+
+    @property
+    def ComputeVolumes(self):
+        return self._compute_volumes
+
+    @ComputeVolumes.setter
+    def ComputeVolumes(self, value):
+        self._doc._check_modifiable()
+        self._compute_volumes = value
+
+    def GetSpatialElementBoundaryLocation(self, spatial_element_type):
+        return self._locations.get(int(spatial_element_type),
+                                   SpatialElementBoundaryLocation.Finish)
+
+    def SetSpatialElementBoundaryLocation(self, location,
+                                          spatial_element_type):
+        self._doc._check_modifiable()
+        self._locations[int(spatial_element_type)] = location
+
+
+# working with views
+
+class OverrideGraphicSettings(object):
+    """Set<Name>(value) methods store the values read as <Name>"""
+    def __init__(self):
+        self.ProjectionLinePatternId = ElementId.InvalidElementId
+        self.CutLinePatternId = ElementId.InvalidElementId
+        self.SurfaceForegroundPatternId = ElementId.InvalidElementId
+        self.SurfaceBackgroundPatternId = ElementId.InvalidElementId
+        self.CutForegroundPatternId = ElementId.InvalidElementId
+        self.CutBackgroundPatternId = ElementId.InvalidElementId
+
+    def __getattr__(self, name):
+        if not name.startswith('Set'):
+            raise AttributeError(name)
+        attribute = name[3:]
+
+        def setter(value):
+            setattr(self, attribute, value)
+            return self
+        return setter
+
+
+class Color(object):
+    def __init__(self, red, green, blue):
+        self.Red = red
+        self.Green = green
+        self.Blue = blue
+
+
+class View(Element):
+    _category = int(BuiltInCategory.OST_Views)
+    _view_type = ViewType.Undefined
+    _graphical = True
+
+    def __init__(self, doc, name, view_type=None, is_template=False):
+        Element.__init__(self, doc, name)
+        if view_type is not None:
+            self._view_type = view_type
+        self.IsTemplate = is_template
+        self._template_id = INVALID
+        self._primary_id = INVALID
+        self._filters = {}
+        self._category_overrides = {}
+        self._hidden_categories = set()
+
+    def _set_name(self, name):
+        if any(isinstance(view, View) and view._name == name
+               for view in self._doc._elements.values()
+               if view is not self):
+            raise ArgumentException(
+                'Name "{}" is already in use.'.format(name))
+        Element._set_name(self, name)
+
+    @property
+    def ViewType(self):
+        return self._view_type
+
+    @property
+    def ViewTemplateId(self):
+        return ElementId(self._template_id)
+
+    @ViewTemplateId.setter
+    def ViewTemplateId(self, template_id):
+        self._doc._check_modifiable()
+        self._template_id = _key(template_id)
+
+    def GetPrimaryViewId(self):
+        return ElementId(self._primary_id)
+
+    def GetDependentViewIds(self):
+        return _ids(view._id for view in self._doc._elements.values()
+                    if isinstance(view, View) and
+                    view._primary_id == self._id)
+
+    def AreGraphicsOverridesAllowed(self):
+        return self._graphical
+
+    def GetFilters(self):
+        if not self._graphical:
+            raise InvalidOperationException(
+                'The view does not support filters.')
+        return _ids(self._filters)
+
+    def AddFilter(self, filter_id):
+        self._doc._check_modifiable()
+        self._filters[_key(filter_id)] = OverrideGraphicSettings()
+
+    def RemoveFilter(self, filter_id):
+        self._doc._check_modifiable()
+        self._filters.pop(_key(filter_id), None)
+
+    def GetFilterOverrides(self, filter_id):
+        return self._filters[_key(filter_id)]
+
+    def SetFilterOverrides(self, filter_id, overrides):
+        self._doc._check_modifiable()
+        if _key(filter_id) not in self._filters:
+            raise ArgumentException('The filter is not applied to the view.')
+        self._filters[_key(filter_id)] = overrides
+
+    def GetCategoryOverrides(self, category_id):
+        return self._category_overrides.get(
+            _key(category_id), OverrideGraphicSettings())
+
+    def SetCategoryOverrides(self, category_id, overrides):
+        self._doc._check_modifiable()
+        self._category_overrides[_key(category_id)] = overrides
+
+    def SetCategoryHidden(self, category_id, hidden):
+        self._doc._check_modifiable()
+        if hidden:
+            self._hidden_categories.add(_key(category_id))
+        else:
+            self._hidden_categories.discard(_key(category_id))
+
+    def GetCategoryHidden(self, category_id):
+        return _key(category_id) in self._hidden_categories
+
+    def _shows(self, element):
+        """Is the element collected by FilteredElementCollector(doc, view)"""
+        return element._category is not None and \
+            element._box is not None and \
+            not isinstance(element, (ElementType, View)) and \
+            element._category not in self._hidden_categories
+
+    def _references(self):
+        return (self._primary_id,)
+
+
+class View3D(View):
+    _view_type = ViewType.ThreeD
+
+    def __init__(self, doc, name, is_template=False):
+        View.__init__(self, doc, name, is_template=is_template)
+        self.IsSectionBoxActive = False
+
+    @staticmethod
+    def CreateIsometric(doc, view_family_type_id):
+        doc._check_modifiable()
+        index = 1
+        names = set(view._name for view in doc._elements.values()
+                    if isinstance(view, View))
+        while '3D View {}'.format(index) in names:
+            index += 1
+        view = View3D(doc, '3D View {}'.format(index))
+        view._type_id = _key(view_family_type_id)
+        doc._record(doc._remove, view)
+        return view
+
+
+class ViewPlan(View):
+    _view_type = ViewType.FloorPlan
+
+    def __init__(self, doc, name, level, is_template=False):
+        View.__init__(self, doc, name, is_template=is_template)
+        self._level_id = level._id if level is not None else INVALID
+
+    @property
+    def GenLevel(self):
+        return self._doc.GetElement(self.LevelId)
+
+    def _shows(self, element):
+        return View._shows(self, element) and \
+            element._level_id == self._level_id
+
+
+class ViewSheet(View):
+    _view_type = ViewType.DrawingSheet
+    _graphical = False
+
+
+class ViewFamilyType(ElementType):
+    def __init__(self, doc, name, view_family):
+        ElementType.__init__(self, doc, name)
+        self.ViewFamily = view_family
+
+
+class ScheduleFieldId(object):
+    def __init__(self, index):
+        self.IntegerValue = index
+
+
+class ScheduleField(object):
+    def __init__(self, index, field_type, parameter_id):
+        self.FieldId = ScheduleFieldId(index)
+        self.FieldType = field_type
+        self.ParameterId = parameter_id
+
+
+class ScheduleFilter(object):
+    def __init__(self, field_id, filter_type, value=None):
+        self.FieldId = field_id
+        self.FilterType = filter_type
+        self.Value = value
+
+
+class ScheduleDefinition(object):
+    def __init__(self, schedule):
+        self._schedule = schedule
+        self._fields = []
+        self._filters = []
+
+    def AddField(self, field_type, parameter_id):
+        self._schedule._doc._check_modifiable()
+        field = ScheduleField(len(self._fields), field_type, parameter_id)
+        self._fields.append(field)
+        return field
+
+    def AddFilter(self, schedule_filter):
+        self._schedule._doc._check_modifiable()
+        self._filters.append(schedule_filter)
+        return schedule_filter
+
+    def GetFieldCount(self):
+        return len(self._fields)
+
+    def GetFilterCount(self):
+        return len(self._filters)
+
+
+class ViewSchedule(View):
+    _view_type = ViewType.Schedule
+    _graphical = False
+
+    def __init__(self, doc, name, category_id):
+        View.__init__(self, doc, name)
+        self.Definition = ScheduleDefinition(self)
+        self.IsTitleblockRevisionSchedule = False
+        self.IsInternalKeynoteSchedule = False
+        self._schedule_category = _key(category_id)
+
+    @staticmethod
+    def CreateSchedule(doc, category_id):
+        doc._check_modifiable()
+        category = doc.Settings.Categories.get_Item(category_id)
+        base = '{} Schedule'.format(
+            category.Name if category is not None else 'Multi-Category')
+        names = set(view._name for view in doc._elements.values()
+                    if isinstance(view, View))
+        name, index = base, 1
+        while name in names:
+            index += 1
+            name = '{} {}'.format(base, index)
+        schedule = ViewSchedule(doc, name, category_id)
+        doc._record(doc._remove, schedule)
+        return schedule
+
+
+class FillPattern(object):
+    def __init__(self, name, is_solid_fill):
+        self.Name = name
+        self.IsSolidFill = is_solid_fill
+
+
+class FillPatternElement(Element):
+    def __init__(self, doc, name, is_solid_fill=False):
+        Element.__init__(self, doc, name)
+        self._pattern = FillPattern(name, is_solid_fill)
+
+    def GetFillPattern(self):
+        return self._pattern
+
+
+class LinePatternElement(Element):
+    pass
+
+
+class FilledRegionType(ElementType):
+    def __init__(self, doc, name, foreground_pattern_id=None,
+                 background_pattern_id=None):
+        ElementType.__init__(self, doc, name)
+        self.ForegroundPatternId = foreground_pattern_id or \
+            ElementId.InvalidElementId
+        self.BackgroundPatternId = background_pattern_id or \
+            ElementId.InvalidElementId
+
+
+class FilterElement(Element):
+    pass
+
+
+class ParameterFilterElement(FilterElement):
+    def __init__(self, doc, name, category_ids=()):
+        Element.__init__(self, doc, name)
+        self._category_ids = [_key(category) for category in category_ids]
+
+    def GetCategories(self):
+        return _ids(self._category_ids)
+
+
+class SelectionFilterElement(FilterElement):
+    def __init__(self, doc, name):
+        Element.__init__(self, doc, name)
+        self._element_ids = set()
+
+    @staticmethod
+    def Create(doc, name):
+        doc._check_modifiable()
+        if any(isinstance(element, FilterElement) and element._name == name
+               for element in doc._elements.values()):
+            raise ArgumentException(
+                'Name "{}" is already in use.'.format(name))
+        selection_filter = SelectionFilterElement(doc, name)
+        doc._record(doc._remove, selection_filter)
+        return selection_filter
+
+    def AddSet(self, element_ids):
+        self._doc._check_modifiable()
+        self._element_ids.update(_key(element_id)
+                                 for element_id in element_ids)
+
+    def GetElementIds(self):
+        return _ids(sorted(self._element_ids))
+
+
+class SharedParameterElement(Element):
+    def __init__(self, doc, name, guid, storage_type):
+        Element.__init__(self, doc, name)
+        self.GuidValue = guid
+        self.definition = ParameterDefinition(
+            self._id, name, storage_type, guid=guid)
+
+    def GetDefinition(self):
+        return self.definition.definition
+
+
+# working with links
+
+class ModelPath(object):
+    def __init__(self, path):
+        self._path = path
+
+
+class ModelPathUtils(object):
+    @staticmethod
+    def ConvertModelPathToUserVisiblePath(model_path):
+        return model_path._path
+
+
+class ExternalFileReference(object):
+    def __init__(self, path, status):
+        self._path = ModelPath(path)
+        self._status = status
+
+    def GetAbsolutePath(self):
+        return self._path
+
+    def GetPath(self):
+        return self._path
+
+    def GetLinkedFileStatus(self):
+        return self._status
+
+
+class _LinkType(ElementType):
+    _parameters = ParameterSet(TYPE_PARAMETERS)
+
+    def __init__(self, doc, name, path=None, status=None):
+        ElementType.__init__(self, doc, name)
+        self._reference = ExternalFileReference(
+            path, status or LinkedFileStatus.Loaded) if path else None
+
+    def IsExternalFileReference(self):
+        return self._reference is not None
+
+    def GetExternalFileReference(self):
+        return self._reference
+
+
+class CADLinkType(_LinkType):
+    pass
+
+
+class RevitLinkType(_LinkType):
+    pass
+
+
+class ImportInstance(Element):
+    def __init__(self, doc, link_type):
+        Element.__init__(self, doc, link_type.Name)
+        self._type_id = link_type._id
+
+
+class RevitLinkInstance(ImportInstance):
+    _category = int(BuiltInCategory.OST_RvtLinks)
+
+
+# working with joins
+
+class _Joins(object):
+    """Joined pairs of element ids, indexed by element"""
+    def __init__(self):
+        self._pairs = set()
+        self._by_element = {}
+
+    def __contains__(self, pair):
+        return pair in self._pairs
+
+    def __len__(self):
+        return len(self._pairs)
+
+    def add(self, pair):
+        self._pairs.add(pair)
+        first, second = pair
+        self._by_element.setdefault(first, set()).add(second)
+        self._by_element.setdefault(second, set()).add(first)
+
+    def discard(self, pair):
+        if pair not in self._pairs:
+            return
+        self._pairs.discard(pair)
+        first, second = pair
+        self._by_element[first].discard(second)
+        self._by_element[second].discard(first)
+
+    def joined(self, element_id):
+        return sorted(self._by_element.get(element_id, ()))
+
+
+class JoinGeometryUtils(object):
+    @staticmethod
+    def _pair(first, second):
+        return frozenset((first._id, second._id))
+
+    @staticmethod
+    def AreElementsJoined(doc, first, second):
+        return JoinGeometryUtils._pair(first, second) in doc._joins
+
+    @staticmethod
+    def JoinGeometry(doc, first, second):
+        doc._check_modifiable()
+        pair = JoinGeometryUtils._pair(first, second)
+        if first._id == second._id or pair in doc._joins:
+            raise ArgumentException('The elements are already joined.')
+        if first._box is None or second._box is None or \
+                not _outline(first._box).Intersects(_outline(second._box), 0):
+            raise ArgumentException('The elements do not intersect.')
+        doc._joins.add(pair)
+        doc._record(doc._joins.discard, pair)
+
+    @staticmethod
+    def UnjoinGeometry(doc, first, second):
+        doc._check_modifiable()
+        pair = JoinGeometryUtils._pair(first, second)
+        if pair not in doc._joins:
+            raise ArgumentException('The elements are not joined.')
+        doc._joins.discard(pair)
+        doc._record(doc._joins.add, pair)
+
+    @staticmethod
+    def GetJoinedElements(doc, element):
+        return _ids(doc._joins.joined(element._id))
+
+    @staticmethod
+    def SwitchJoinOrder(doc, first, second):
+        doc._check_modifiable()
+
+    @staticmethod
+    def IsCuttingElementInJoin(doc, first, second):
+        return first._id < second._id
+
+
+def _outline(box):
+    x0, y0, z0, x1, y1, z1 = box
+    return Outline(XYZ(x0, y0, z0), XYZ(x1, y1, z1))
+
+
+# working with filters
+
+class ElementFilter(object):
+    """Filters test elements directly, inverted filters negate the test"""
+    def __init__(self, inverted=False):
+        self.Inverted = inverted
+
+    def PassesElement(self, element):
+        return self._passes(element) != self.Inverted
+
+    def PassesFilter(self, doc, element_id):
+        element = doc.GetElement(element_id)
+        return element is not None and self.PassesElement(element)
+
+    def _passes(self, element):
+        raise NotImplementedError()
+
+    def _categories(self):
+        """Categories all passing elements belong to, None for any"""
+        return None
+
+    def _region(self):
+        """Box all passing elements intersect, None for anywhere"""
+        return None
+
+    def _element_class(self):
+        """Class all passing elements are instances of, None for any"""
+        return None
+
+
+class ElementQuickFilter(ElementFilter):
+    pass
+
+
+class ElementSlowFilter(ElementFilter):
+    pass
+
+
+class ElementCategoryFilter(ElementQuickFilter):
+    def __init__(self, category, inverted=False):
+        ElementQuickFilter.__init__(self, inverted)
+        self._category = _key(category)
+
+    def _passes(self, element):
+        return element._category == self._category
+
+    def _categories(self):
+        return None if self.Inverted else frozenset((self._category,))
+
+
+class ElementMulticategoryFilter(ElementQuickFilter):
+    def __init__(self, categories, inverted=False):
+        ElementQuickFilter.__init__(self, inverted)
+        self._category_set = frozenset(_key(category)
+                                       for category in categories)
+
+    def _passes(self, element):
+        return element._category in self._category_set
+
+    def _categories(self):
+        return None if self.Inverted else self._category_set
+
+
+class ElementClassFilter(ElementQuickFilter):
+    def __init__(self, element_class, inverted=False):
+        ElementQuickFilter.__init__(self, inverted)
+        self._class = element_class
+
+    def _passes(self, element):
+        return isinstance(element, self._class)
+
+    def _element_class(self):
+        return None if self.Inverted else self._class
+
+
+class ElementIsElementTypeFilter(ElementQuickFilter):
+    """Passes element types, with inverted=True everything else"""
+    def _passes(self, element):
+        return isinstance(element, ElementType)
+
+
+class BoundingBoxIntersectsFilter(ElementQuickFilter):
+    def __init__(self, outline, tolerance_or_inverted=False, inverted=False):
+        if isinstance(tolerance_or_inverted, bool):
+            tolerance, inverted = 0.0, tolerance_or_inverted
+        else:
+            tolerance = tolerance_or_inverted
+        ElementQuickFilter.__init__(self, inverted)
+        self._outline = outline
+        self._tolerance = tolerance
+
+    def _passes(self, element):
+        return element._box is not None and self._outline.Intersects(
+            _outline(element._box), self._tolerance)
+
+    def _region(self):
+        if self.Inverted:
+            return None
+        low, high = self._outline.MinimumPoint, self._outline.MaximumPoint
+        tolerance = self._tolerance
+        return (low.X - tolerance, low.Y - tolerance, low.Z - tolerance,
+                high.X + tolerance, high.Y + tolerance, high.Z + tolerance)
+
+
+class ElementIntersectsElementFilter(ElementSlowFilter):
+    """Approximated by bounding boxes, the element itself does not pass"""
+    def __init__(self, element, inverted=False):
+        ElementSlowFilter.__init__(self, inverted)
+        self._element = element
+        self._outline = _outline(element._box) \
+            if element._box is not None else None
+
+    def _passes(self, element):
+        return self._outline is not None and element._box is not None and \
+            element._id != self._element._id and \
+            self._outline.Intersects(_outline(element._box), 0)
+
+    def _region(self):
+        return None if self.Inverted else self._element._box
+
+
+class ElementPhaseStatusFilter(ElementSlowFilter):
+    def __init__(self, phase_id, statuses, inverted=False):
+        ElementSlowFilter.__init__(self, inverted)
+        self._phase = _key(phase_id)
+        self._statuses = frozenset(int(status) for status in (
+            statuses if hasattr(statuses, '__iter__') else [statuses]))
+
+    def _passes(self, element):
+        return int(_phase_status(element, self._phase)) in self._statuses
+
+
+class _LogicalFilter(ElementFilter):
+    def __init__(self, *filters):
+        inverted = False
+        if len(filters) == 1:
+            filters = list(filters[0])
+        elif len(filters) == 2 and isinstance(filters[1], bool):
+            filters, inverted = list(filters[0]), filters[1]
+        ElementFilter.__init__(self, inverted)
+        self._filters = list(filters)
+
+    def GetFilters(self):
+        return List[ElementFilter](self._filters)
+
+
+class LogicalAndFilter(_LogicalFilter):
+    def _passes(self, element):
+        return all(element_filter.PassesElement(element)
+                   for element_filter in self._filters)
+
+    def _categories(self):
+        if self.Inverted:
+            return None
+        categories = None
+        for element_filter in self._filters:
+            filter_categories = element_filter._categories()
+            if filter_categories is not None:
+                categories = filter_categories if categories is None \
+                    else categories & filter_categories
+        return categories
+
+    def _region(self):
+        if self.Inverted:
+            return None
+        for element_filter in self._filters:
+            region = element_filter._region()
+            if region is not None:
+                return region
+        return None
+
+
+class LogicalOrFilter(_LogicalFilter):
+    def _passes(self, element):
+        return any(element_filter.PassesElement(element)
+                   for element_filter in self._filters)
+
+    def _categories(self):
+        if self.Inverted:
+            return None
+        categories = frozenset()
+        for element_filter in self._filters:
+            filter_categories = element_filter._categories()
+            if filter_categories is None:
+                return None
+            categories = categories | filter_categories
+        return categories
+
+
+# working with parameter rules
+
+class FilterRule(object):
+    def __init__(self, parameter_id, test):
+        self._key = _key(parameter_id)
+        self._test = test
+
+    def passes(self, element):
+        value, definition = element._get_value(self._key)
+        if value is _NO_VALUE:
+            return False
+        return self._test(element, value, definition)
+
+
+def _as_text(element, value, definition):
+    if definition.storage_type == StorageType.String:
+        return value
+    return Parameter(element, definition).AsValueString()
+
+
+def _comparable(value, definition):
+    if definition.storage_type == StorageType.ElementId:
+        return value.IntegerValue if value is not None else INVALID
+    if definition.storage_type == StorageType.Double:
+        return value or 0.0
+    if definition.storage_type == StorageType.Integer:
+        return value or 0
+    return value
+
+
+def _compare_rule(parameter_id, value, tolerance, compare):
+    if isinstance(value, ElementId):
+        value = value.IntegerValue
+
+    def test(element, current, definition):
+        if isinstance(value, str):
+            text = _as_text(element, current, definition)
+            if text is None:
+                return False
+            return compare((text > value) - (text < value))
+        current = _comparable(current, definition)
+        if current is None:
+            return False
+        if abs(current - value) <= tolerance:
+            return compare(0)
+        return compare(1 if current > value else -1)
+    return FilterRule(parameter_id, test)
+
+
+def _text_rule(parameter_id, value, case_sensitive, test):
+    if not case_sensitive:
+        value = value.lower()
+
+    def text_test(element, current, definition):
+        text = _as_text(element, current, definition)
+        if text is None:
+            return False
+        return test(text if case_sensitive else text.lower(), value)
+    return FilterRule(parameter_id, text_test)
+
+
+class ParameterFilterRuleFactory(object):
+    @staticmethod
+    def CreateEqualsRule(parameter_id, value, tolerance_or_case=None):
+        tolerance = tolerance_or_case \
+            if isinstance(tolerance_or_case, float) else 0
+        return _compare_rule(parameter_id, value, tolerance,
+                             lambda order: order == 0)
+
+    @staticmethod
+    def CreateNotEqualsRule(parameter_id, value, tolerance_or_case=None):
+        tolerance = tolerance_or_case \
+            if isinstance(tolerance_or_case, float) else 0
+        return _compare_rule(parameter_id, value, tolerance,
+                             lambda order: order != 0)
+
+    @staticmethod
+    def CreateGreaterRule(parameter_id, value, tolerance_or_case=None):
+        tolerance = tolerance_or_case \
+            if isinstance(tolerance_or_case, float) else 0
+        return _compare_rule(parameter_id, value, tolerance,
+                             lambda order: order > 0)
+
+    @staticmethod
+    def CreateLessRule(parameter_id, value, tolerance_or_case=None):
+        tolerance = tolerance_or_case \
+            if isinstance(tolerance_or_case, float) else 0
+        return _compare_rule(parameter_id, value, tolerance,
+                             lambda order: order < 0)
+
+    @staticmethod
+    def CreateContainsRule(parameter_id, value, case_sensitive=True):
+        return _text_rule(parameter_id, value, case_sensitive,
+                          lambda text, token: token in text)
+
+    @staticmethod
+    def CreateNotContainsRule(parameter_id, value, case_sensitive=True):
+        return _text_rule(parameter_id, value, case_sensitive,
+                          lambda text, token: token not in text)
+
+    @staticmethod
+    def CreateBeginsWithRule(parameter_id, value, case_sensitive=True):
+        return _text_rule(parameter_id, value, case_sensitive,
+                          lambda text, token: text.startswith(token))
+
+    @staticmethod
+    def CreateHasValueParameterRule(parameter_id):
+        return FilterRule(parameter_id, lambda element, value, definition:
+                          value is not None and value != '')
+
+    @staticmethod
+    def CreateHasNoValueParameterRule(parameter_id):
+        return FilterRule(parameter_id, lambda element, value, definition:
+                          value is None or value == '')
+
+
+class ElementParameterFilter(ElementSlowFilter):
+    def __init__(self, rules, inverted=False):
+        ElementSlowFilter.__init__(self, inverted)
+        self._rules = [rules] if isinstance(rules, FilterRule) \
+            else list(rules)
+
+    def _passes(self, element):
+        return all(rule.passes(element) for rule in self._rules)
+
+
+# working with the collector
+
+class _SpatialIndex(object):
+    """
+    Uniform grid over the model. Bounding box and intersection filters
+    get their candidates from the cells they overlap instead of testing
+    every element, like the quick filters of Revit do. Elements are
+    indexed on the first query after they were added, so their boxes
+    must be set by then; deleted elements are dropped by the collector.
+    """
+    CELL_SIZE = 10.0
+
+    def __init__(self):
+        self._cells = {}
+        self._pending = []
+
+    def add(self, element):
+        self._pending.append(element)
+
+    def _cells_of(self, box):
+        size = self.CELL_SIZE
+        low = [int(math.floor(value / size)) for value in box[:3]]
+        high = [int(math.floor(value / size)) for value in box[3:]]
+        for x in range(low[0], high[0] + 1):
+            for y in range(low[1], high[1] + 1):
+                for z in range(low[2], high[2] + 1):
+                    yield x, y, z
+
+    def _index_pending(self):
+        for element in self._pending:
+            if element._box is None:
+                continue
+            for cell in self._cells_of(element._box):
+                self._cells.setdefault(cell, []).append(element)
+        self._pending = []
+
+    def candidates(self, box):
+        """Get the elements in the cells the box overlaps, by id"""
+        if self._pending:
+            self._index_pending()
+        found = {}
+        for cell in self._cells_of(box):
+            for element in self._cells.get(cell, ()):
+                found[element._id] = element
+        return found
+
+
+class FilteredElementCollector(object):
+    """
+    Filters are applied lazily, every iteration runs the query again.
+    Category filters narrow the candidates through the category index
+    of the document, bounding box filters through its spatial index.
+    """
+    def __init__(self, doc, scope=None):
+        self._doc = doc
+        self._filters = []
+        self._view = None
+        self._scope_ids = None
+        if isinstance(scope, ElementId):
+            self._view = doc.GetElement(scope)
+            if not isinstance(self._view, View) or not self._view._graphical:
+                raise ArgumentException(
+                    'The view does not display elements.')
+        elif scope is not None:
+            self._scope_ids = set(_key(element_id) for element_id in scope)
+
+    def WherePasses(self, element_filter):
+        self._filters.append(element_filter)
+        return self
+
+    def OfClass(self, element_class):
+        return self.WherePasses(ElementClassFilter(element_class))
+
+    def OfCategory(self, category):
+        return self.WherePasses(ElementCategoryFilter(category))
+
+    def OfCategoryId(self, category_id):
+        return self.WherePasses(ElementCategoryFilter(category_id))
+
+    def WhereElementIsElementType(self):
+        return self.WherePasses(ElementIsElementTypeFilter(False))
+
+    def WhereElementIsNotElementType(self):
+        return self.WherePasses(ElementIsElementTypeFilter(True))
+
+    def Excluding(self, element_ids):
+        excluded = set(_key(element_id) for element_id in element_ids)
+        return self.WherePasses(_ExcludingFilter(excluded))
+
+    def _candidates(self):
+        categories = None
+        region = None
+        element_class = None
+        for element_filter in self._filters:
+            filter_categories = element_filter._categories()
+            if filter_categories is not None:
+                categories = filter_categories if categories is None \
+                    else categories & filter_categories
+            if region is None:
+                region = element_filter._region()
+            if element_class is None:
+                element_class = element_filter._element_class()
+        if region is not None:
+            elements = self._doc._elements
+            return [element for element_id, element
+                    in sorted(self._doc._spatial.candidates(region).items())
+                    if elements.get(element_id) is element and
+                    (categories is None or element._category in categories)]
+        if categories is None:
+            if element_class is not None:
+                return self._doc._of_class(element_class)
+            return self._doc._elements.values()
+        if len(categories) == 1:
+            return self._doc._by_category.get(
+                next(iter(categories)), {}).values()
+        candidates = []
+        for category in categories:
+            candidates.extend(
+                self._doc._by_category.get(category, {}).values())
+        candidates.sort(key=lambda element: element._id)
+        return candidates
+
+    def __iter__(self):
+        filters = self._filters
+        view = self._view
+        scope_ids = self._scope_ids
+        for element in list(self._candidates()):
+            if view is not None and not view._shows(element):
+                continue
+            if scope_ids is not None and element._id not in scope_ids:
+                continue
+            if all(element_filter.PassesElement(element)
+                   for element_filter in filters):
+                yield element
+
+    def ToElements(self):
+        return list(self)
+
+    def ToElementIds(self):
+        return List[ElementId](element.Id for element in self)
+
+    def GetElementCount(self):
+        return sum(1 for _ in self)
+
+    def FirstElement(self):
+        return next(iter(self), None)
+
+    def FirstElementId(self):
+        element = self.FirstElement()
+        return element.Id if element is not None \
+            else ElementId.InvalidElementId
+
+    def GetElementIterator(self):
+        return iter(self)
+
+
+class _ExcludingFilter(ElementQuickFilter):
+    def __init__(self, excluded):
+        ElementQuickFilter.__init__(self)
+        self._excluded = excluded
+
+    def _passes(self, element):
+        return element._id not in self._excluded
+
+
+# working with transactions
+
+class FailureHandlingOptions(object):
+    def __init__(self):
+        self.preprocessor = None
+        self.forced_modal_handling = True
+        self.clear_after_rollback = False
+
+    def SetFailuresPreprocessor(self, preprocessor):
+        self.preprocessor = preprocessor
+        return self
+
+    def GetFailuresPreprocessor(self):
+        return self.preprocessor
+
+    def SetForcedModalHandling(self, value):
+        self.forced_modal_handling = value
+        return self
+
+    def SetClearAfterRollback(self, value):
+        self.clear_after_rollback = value
+        return self
+
+    def SetDelayedMiniWarnings(self, value):
+        return self
+
+
+class IFailuresPreprocessor(object):
+    def PreprocessFailures(self, failures_accessor):
+        return FailureProcessingResult.Continue
+
+
+class Transaction(object):
+    """
+    Changes made while the transaction is open are journaled and undone
+    by RollBack. Transactions cannot be nested, a transaction left open
+    is rolled back when it is disposed.
+    """
+    def __init__(self, doc, name=''):
+        self._doc = doc
+        self._name = name
+        self._status = TransactionStatus.Uninitialized
+        self._mark = None
+        self._options = FailureHandlingOptions()
+
+    def Start(self, name=None):
+        if name:
+            self._name = name
+        if not self._name:
+            raise InvalidOperationException('The transaction has no name.')
+        if self._doc._transaction is not None:
+            raise InvalidOperationException(
+                'Another transaction is open in the document.')
+        self._doc._transaction = self
+        self._mark = len(self._doc._journal)
+        self._status = TransactionStatus.Started
+        return self._status
+
+    def _end(self, status):
+        if self._status != TransactionStatus.Started:
+            raise InvalidOperationException('The transaction is not started.')
+        self._doc._transaction = None
+        self._status = status
+        self._doc._trim_journal()
+        return status
+
+    def Commit(self):
+        return self._end(TransactionStatus.Committed)
+
+    def RollBack(self):
+        self._doc._undo(self._mark)
+        return self._end(TransactionStatus.RolledBack)
+
+    def GetStatus(self):
+        return self._status
+
+    def HasStarted(self):
+        return self._status != TransactionStatus.Uninitialized
+
+    def HasEnded(self):
+        return self._status in (TransactionStatus.Committed,
+                                TransactionStatus.RolledBack)
+
+    def GetName(self):
+        return self._name
+
+    def SetName(self, name):
+        self._name = name
+
+    def GetFailureHandlingOptions(self):
+        return self._options
+
+    def SetFailureHandlingOptions(self, options):
+        self._options = options
+
+    def Dispose(self):
+        if self._status == TransactionStatus.Started:
+            self.RollBack()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Dispose()
+        return False
+
+
+class TransactionGroup(object):
+    """Groups keep the journal of their transactions to roll them back"""
+    def __init__(self, doc, name=''):
+        self._doc = doc
+        self._name = name
+        self._status = TransactionStatus.Uninitialized
+        self._mark = None
+
+    def Start(self, name=None):
+        if self._doc._transaction is not None:
+            raise InvalidOperationException(
+                'A transaction is open in the document.')
+        self._doc._groups.append(self)
+        self._mark = len(self._doc._journal)
+        self._status = TransactionStatus.Started
+        return self._status
+
+    def _end(self, status):
+        if self._status != TransactionStatus.Started or \
+                self._doc._groups[-1] is not self:
+            raise InvalidOperationException('The group is not the open one.')
+        self._doc._groups.pop()
+        self._status = status
+        self._doc._trim_journal()
+        return status
+
+    def Assimilate(self):
+        return self._end(TransactionStatus.Committed)
+
+    def Commit(self):
+        return self._end(TransactionStatus.Committed)
+
+    def RollBack(self):
+        self._doc._undo(self._mark)
+        return self._end(TransactionStatus.RolledBack)
+
+    def GetStatus(self):
+        return self._status
+
+    def Dispose(self):
+        if self._status == TransactionStatus.Started:
+            self.RollBack()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Dispose()
+        return False
+
+
+# working with the document
+
+class Application(object):
+    def __init__(self, version='2024'):
+        self.VersionNumber = version
+        self.VersionName = 'Autodesk Revit {}'.format(version)
+        self.Username = 'standin'
+
+
+class Document(object):
+    """
+    A model held in memory. Elements are indexed by id and by category;
+    ids increase, so both indexes iterate in id order.
+    """
+    def __init__(self, title='Stand-in', application=None):
+        self.Title = title
+        self.PathName = title + '.rvt'
+        self.IsWorkshared = False
+        self.IsFamilyDocument = False
+        self.IsReadOnly = False
+        self.Application = application or Application()
+        self.Settings = Settings(self)
+        self.ActiveView = None
+        self._guid = Guid().ToString()
+        self._elements = {}
+        self._by_category = {}
+        self._next_id = 1000
+        self._units = Units()
+        self._joins = _Joins()
+        self._spatial = _SpatialIndex()
+        self._by_class = {}
+        self._journal = []
+        self._transaction = None
+        self._groups = []
+        self._phases = []
+        self._phase_sequence = {}
+        self._extent = (0.0, 0.0, 0.0, 0.0)
+        self._area_volume_settings = AreaVolumeSettings(self)
+        self._valid = True
+
+    # elements
+
+    def _add(self, element, element_id=None):
+        if element_id is None:
+            element_id = self._next_id
+            self._next_id += 1
+        element._id = element_id
+        element._deleted = False
+        self._elements[element_id] = element
+        if element._category is not None:
+            self._by_category.setdefault(
+                element._category, {})[element_id] = element
+        self._spatial.add(element)
+        self._by_class.setdefault(type(element), {})[element_id] = element
+        if isinstance(element, Phase):
+            self._phases.append(element)
+            self._phase_sequence[element_id] = len(self._phases) - 1
+        return element
+
+    def _remove(self, element):
+        del self._elements[element._id]
+        if element._category is not None:
+            self._by_category[element._category].pop(element._id, None)
+        self._by_class[type(element)].pop(element._id, None)
+        element._deleted = True
+
+    def _of_class(self, element_class):
+        """Elements of the class and its subclasses, in id order"""
+        found = []
+        for stored_class, elements in self._by_class.items():
+            if issubclass(stored_class, element_class):
+                found.extend(elements.values())
+        found.sort(key=lambda element: element._id)
+        return found
+
+    def GetElement(self, key):
+        if key is None:
+            return None
+        if isinstance(key, str):
+            element_id = int(key.rsplit('-', 1)[-1], 16)
+        else:
+            element_id = _key(key)
+        return self._elements.get(element_id)
+
+    def Delete(self, element_ids):
+        """Delete the elements and everything depending on them"""
+        self._check_modifiable()
+        if isinstance(element_ids, ElementId):
+            element_ids = [element_ids]
+        doomed = set()
+        for element_id in element_ids:
+            element = self.GetElement(element_id)
+            if element is None:
+                raise ArgumentException(
+                    'Element {} does not exist.'.format(element_id))
+            if self.ActiveView is not None and element is self.ActiveView:
+                raise ArgumentException('The active view cannot be deleted.')
+            doomed.add(element._id)
+        while True:
+            dependents = set(
+                element._id for element in self._elements.values()
+                if element._id not in doomed and
+                any(key in doomed for key in element._references()))
+            if not dependents:
+                break
+            doomed |= dependents
+        deleted = [self._elements[key] for key in sorted(doomed)]
+        for element in deleted:
+            self._remove(element)
+        self._record(self._restore_all, deleted)
+        for view in self._elements.values():
+            if isinstance(view, View):
+                for key in doomed & set(view._filters):
+                    del view._filters[key]
+        return _ids(sorted(doomed))
+
+    def _restore_all(self, elements):
+        for element in elements:
+            self._elements[element._id] = element
+            element._deleted = False
+            if element._category is not None:
+                self._by_category.setdefault(
+                    element._category, {})[element._id] = element
+        self._elements = dict(sorted(self._elements.items()))
+        for category, elements_by_id in list(self._by_category.items()):
+            self._by_category[category] = dict(sorted(elements_by_id.items()))
+
+    # transactions
+
+    @property
+    def IsModifiable(self):
+        return self._transaction is not None
+
+    def _check_modifiable(self):
+        if self._transaction is None:
+            raise ModificationOutsideTransactionException(
+                'Attempt to modify the model outside of transaction.')
+
+    def _record(self, undo, *args):
+        """Journal how to undo a change made in the open transaction"""
+        if self._transaction is not None:
+            self._journal.append((undo, args))
+
+    def _undo(self, mark):
+        while len(self._journal) > mark:
+            undo, args = self._journal.pop()
+            undo(*args)
+
+    def _trim_journal(self):
+        if self._transaction is None and not self._groups:
+            del self._journal[:]
+
+    # document data
+
+    @property
+    def Phases(self):
+        return PhaseArray(self._phases)
+
+    @property
+    def IsValidObject(self):
+        return self._valid
+
+    def GetUnits(self):
+        return self._units
+
+    def SetUnits(self, units):
+        self._units = units
+
+    def GetHashCode(self):
+        return id(self)
+
+    def Equals(self, other):
+        return self is other
+
+    def Regenerate(self):
+        pass
+
+    @property
+    def element_count(self):
+        return len(self._elements)
+
+    def elements(self):
+        """Get all elements in id order"""
+        return list(self._elements.values())
+
+
+class DocumentValidation(object):
+    @staticmethod
+    def CanDeleteElement(doc, element_id):
+        element = doc.GetElement(element_id)
+        return element is not None and element is not doc.ActiveView
+
+
+# working with updaters
+
+class ChangeType(object):
+    def __init__(self, kind, parameter_key=None):
+        self.kind = kind
+        self.parameter_key = parameter_key
+
+
+class UpdaterId(object):
+    def __init__(self, addin_id, guid):
+        self.AddInId = addin_id
+        self.UpdaterGuid = guid
+
+    def __eq__(self, other):
+        return isinstance(other, UpdaterId) and \
+            self.UpdaterGuid == other.UpdaterGuid
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(str(self.UpdaterGuid))
+
+
+class IUpdater(object):
+    pass
+
+
+class UpdaterRegistry(object):
+    """Updaters are registered, the stand-in never triggers them"""
+    _updaters = {}
+    _triggers = {}
+
+    @staticmethod
+    def RegisterUpdater(updater, is_optional=False):
+        UpdaterRegistry._updaters[updater.GetUpdaterId()] = updater
+
+    @staticmethod
+    def UnregisterUpdater(updater_id):
+        UpdaterRegistry._updaters.pop(updater_id, None)
+        UpdaterRegistry._triggers.pop(updater_id, None)
+
+    @staticmethod
+    def IsUpdaterRegistered(updater_id):
+        return updater_id in UpdaterRegistry._updaters
+
+    @staticmethod
+    def AddTrigger(updater_id, element_filter, change_type):
+        UpdaterRegistry._triggers.setdefault(updater_id, []).append(
+            (element_filter, change_type))
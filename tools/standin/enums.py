@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""Enumerations of the Revit API stand-in, behaving like .NET enums"""
+
+
+class EnumValue(object):
+    """
+    A member of a .NET enum: compares and hashes as its integer value,
+    prints as its name and is an instance of its enum class.
+    """
+    def __init__(self, name, value):
+        self._name = name
+        self.value__ = value
+
+    def __int__(self):
+        return self.value__
+
+    __index__ = __int__
+
+    def __bool__(self):
+        return self.value__ != 0
+
+    __nonzero__ = __bool__
+
+    def __eq__(self, other):
+        if isinstance(other, EnumValue):
+            return type(self) is type(other) and self.value__ == other.value__
+        if isinstance(other, int):
+            return self.value__ == other
+        return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __lt__(self, other):
+        return int(self) < int(other)
+
+    def __hash__(self):
+        return hash(self.value__)
+
+    def __str__(self):
+        return self._name
+
+    def ToString(self):
+        return self._name
+
+    def __repr__(self):
+        return '{}.{}'.format(type(self).__name__, self._name)
+
+    @staticmethod
+    def GetValues(enum_type):
+        return enum_type._members
+
+    @staticmethod
+    def GetNames(enum_type):
+        return [str(member) for member in enum_type._members]
+
+
+def enum(name, members, start=0):
+    """
+    Create an enum class.
+    members - names numbered from start, or (name, value) pairs
+    """
+    cls = type(name, (EnumValue,), {})
+    cls._members = []
+    for index, member in enumerate(members):
+        member_name, value = member if isinstance(member, tuple) \
+            else (member, start + index)
+        instance = cls(member_name, value)
+        setattr(cls, member_name, instance)
+        cls._members.append(instance)
+    return cls
+
+
+# categories with the English names Revit shows in the UI
+CATEGORY_NAMES = (
+    ('OST_Doors', 'Doors'),
+    ('OST_Windows', 'Windows'),
+    ('OST_Rooms', 'Rooms'),
+    ('OST_Walls', 'Walls'),
+    ('OST_Floors', 'Floors'),
+    ('OST_Ceilings', 'Ceilings'),
+    ('OST_Roofs', 'Roofs'),
+    ('OST_Stairs', 'Stairs'),
+    ('OST_Railings', 'Railings'),
+    ('OST_Levels', 'Levels'),
+    ('OST_Furniture', 'Furniture'),
+    ('OST_FurnitureSystems', 'Furniture Systems'),
+    ('OST_Lights', 'Lights'),
+    ('OST_StructuralColumns', 'Structural Columns'),
+    ('OST_StructuralFraming', 'Structural Framing'),
+    ('OST_StructuralFoundation', 'Structural Foundations'),
+    ('OST_CurtainWallPanels', 'Curtain Panels'),
+    ('OST_CurtainWallMullions', 'Curtain Wall Mullions'),
+    ('OST_GenericModel', 'Generic Models'),
+    ('OST_TitleBlocks', 'Title Blocks'),
+    ('OST_Views', 'Views'),
+    ('OST_Sheets', 'Sheets'),
+    ('OST_Materials', 'Materials'),
+    ('OST_Lines', 'Lines'),
+    ('OST_RvtLinks', 'RVT Links'),
+    ('OST_RoomSeparationLines', '<Room Separation>'),
+)
+
+BuiltInCategory = enum(
+    'BuiltInCategory',
+    [('INVALID', -1)] + [(name, -2000001 - index)
+                         for index, (name, _) in enumerate(CATEGORY_NAMES)])
+
+BuiltInParameter = enum('BuiltInParameter', [('INVALID', -1)] + [
+    (name, -1001001 - index) for index, name in enumerate((
+        'ALL_MODEL_INSTANCE_COMMENTS', 'ALL_MODEL_TYPE_NAME',
+        'ALL_MODEL_MARK', 'ELEM_TYPE_PARAM', 'ELEM_FAMILY_PARAM',
+        'ELEM_FAMILY_AND_TYPE_PARAM', 'PHASE_CREATED', 'PHASE_DEMOLISHED',
+        'ROOM_NAME', 'ROOM_NUMBER', 'ROOM_AREA', 'ROOM_PHASE',
+        'ROOM_LEVEL_ID', 'ROOM_UPPER_OFFSET', 'ROOM_HEIGHT',
+        'FUNCTION_PARAM', 'INSTANCE_SILL_HEIGHT_PARAM', 'WINDOW_WIDTH',
+        'WINDOW_HEIGHT', 'DOOR_WIDTH', 'DOOR_HEIGHT', 'FURNITURE_WIDTH',
+        'FLOOR_ATTR_THICKNESS_PARAM', 'FLOOR_HEIGHTABOVELEVEL_PARAM',
+        'STRUCTURAL_ELEVATION_AT_TOP', 'LEVEL_PARAM',
+        'CEILING_HEIGHTABOVELEVEL_PARAM', 'LEVEL_ELEV',
+        'LEVEL_IS_BUILDING_STORY', 'FAMILY_LEVEL_PARAM',
+        'WALL_BASE_CONSTRAINT', 'WALL_USER_HEIGHT_PARAM',
+        'SCHEDULE_LEVEL_PARAM', 'STAIRS_BASE_LEVEL_PARAM',
+        'FAMILY_BASE_LEVEL_PARAM', 'STAIRS_RAILING_BASE_LEVEL_PARAM',
+        'RECT_MULLION_THICK', 'CIRC_MULLION_RADIUS', 'MATERIAL_ID_PARAM',
+        'HOST_AREA_COMPUTED', 'HOST_VOLUME_COMPUTED', 'VIEW_NAME',
+    ))])
+
+StorageType = enum('StorageType',
+                   ['None', 'Integer', 'Double', 'String', 'ElementId'])
+WallKind = enum('WallKind', ['Unknown', 'Basic', 'Curtain', 'Stacked'])
+ViewType = enum('ViewType', [
+    'Undefined', 'FloorPlan', 'EngineeringPlan', 'AreaPlan', 'CeilingPlan',
+    'Elevation', 'Section', 'Detail', 'ThreeD', 'Schedule', 'DraftingView',
+    'DrawingSheet', 'Legend', 'Report', 'ProjectBrowser', 'SystemBrowser',
+    'CostReport', 'LoadsReport', 'PresureLossReport', 'ColumnSchedule',
+    'PanelSchedule', 'Walkthrough', 'Rendering', 'Internal'])
+ViewFamily = enum('ViewFamily', [
+    'Invalid', 'ThreeDimensional', 'Walkthrough', 'ImageView',
+    'CostReport', 'LoadsReport', 'PressureLossReport', 'Legend',
+    'Schedule', 'GraphicalColumnSchedule', 'StructuralPlan', 'Elevation',
+    'Section', 'Detail', 'FloorPlan', 'CeilingPlan', 'AreaPlan', 'Sheet',
+    'Drafting'])
+TransactionStatus = enum('TransactionStatus', [
+    'Uninitialized', 'Started', 'RolledBack', 'Committed', 'Pending',
+    'Error', 'Proceed'])
+FailureProcessingResult = enum('FailureProcessingResult', [
+    'Continue', 'ProceedWithRollBack', 'ProceedWithCommit',
+    'WaitForUserInput'])
+FailureSeverity = enum('FailureSeverity', [
+    'None', 'Warning', 'Error', 'DocumentCorruption'])
+ElementOnPhaseStatus = enum('ElementOnPhaseStatus', [
+    'None', 'Past', 'Existing', 'Demolished', 'New', 'Temporary', 'Future'])
+SpatialElementBoundaryLocation = enum('SpatialElementBoundaryLocation', [
+    'Finish', 'Center', 'CoreBoundary', 'CoreCenter'])
+SpatialElementType = enum('SpatialElementType', [
+    'Room', 'Area', 'Space', 'EnergyAnalysisSpace'])
+ScheduleFieldType = enum('ScheduleFieldType', [
+    'Instance', 'ElementType', 'Count', 'ViewBased', 'Formula',
+    'Percentage', 'Room', 'FromRoom', 'ToRoom', 'ProjectInfo'])
+ScheduleFilterType = enum('ScheduleFilterType', [
+    'Equal', 'NotEqual', 'GreaterThan', 'GreaterThanOrEqual', 'LessThan',
+    'LessThanOrEqual', 'Contains', 'NotContains', 'BeginsWith',
+    'NotBeginsWith', 'EndsWith', 'NotEndsWith', 'HasParameter',
+    'HasValue', 'HasNoValue'])
+GraphicsStyleType = enum('GraphicsStyleType', ['Projection', 'Cut'])
+BuiltInParameterGroup = enum('BuiltInParameterGroup', [('INVALID', -1)])
+LinkedFileStatus = enum('LinkedFileStatus', [
+    'Invalid', 'Loaded', 'Unloaded', 'NotFound', 'InClosedWorkset',
+    'LocallyUnloaded', 'NotAddedToSession'])
+ChangePriority = enum('ChangePriority', [
+    'GridsLevelsReferencePlanes', 'Annotations', 'Views',
+    'FloorsRoofsStructuralWalls', 'DoorsOpeningsWindows',
+    'FreeStandingComponents', 'Structure', 'MEPAccessoriesFittingsSegments',
+    'MEPFixtures', 'MEPSystems', 'RoomsSpacesZones', 'Connections',
+    'MassingAndSite', 'Rebar'])
+BooleanOperationsType = enum('BooleanOperationsType',
+                             ['Union', 'Difference', 'Intersect'])
\ No newline at end of file
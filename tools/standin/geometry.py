@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""Points, curves and boxes of the Revit API stand-in, in feet"""
+import math
+
+
+class XYZ(object):
+    __slots__ = ('X', 'Y', 'Z')
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __add__(self, other):
+        return XYZ(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
+
+    def __sub__(self, other):
+        return XYZ(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
+
+    def __mul__(self, factor):
+        return XYZ(self.X * factor, self.Y * factor, self.Z * factor)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor):
+        return XYZ(self.X / divisor, self.Y / divisor, self.Z / divisor)
+
+    __div__ = __truediv__
+
+    def __neg__(self):
+        return XYZ(-self.X, -self.Y, -self.Z)
+
+    def Add(self, other):
+        return self + other
+
+    def Subtract(self, other):
+        return self - other
+
+    def Multiply(self, factor):
+        return self * factor
+
+    def Negate(self):
+        return -self
+
+    def GetLength(self):
+        return math.sqrt(self.X ** 2 + self.Y ** 2 + self.Z ** 2)
+
+    def Normalize(self):
+        length = self.GetLength()
+        return self / length if length else XYZ()
+
+    def DotProduct(self, other):
+        return self.X * other.X + self.Y * other.Y + self.Z * other.Z
+
+    def CrossProduct(self, other):
+        return XYZ(self.Y * other.Z - self.Z * other.Y,
+                   self.Z * other.X - self.X * other.Z,
+                   self.X * other.Y - self.Y * other.X)
+
+    def DistanceTo(self, other):
+        return (self - other).GetLength()
+
+    def IsAlmostEqualTo(self, other, tolerance=1e-9):
+        return self.DistanceTo(other) <= tolerance
+
+    def __repr__(self):
+        return '({:.9f}, {:.9f}, {:.9f})'.format(self.X, self.Y, self.Z)
+
+
+XYZ.Zero = XYZ(0, 0, 0)
+XYZ.BasisX = XYZ(1, 0, 0)
+XYZ.BasisY = XYZ(0, 1, 0)
+XYZ.BasisZ = XYZ(0, 0, 1)
+
+
+class IntersectionResult(object):
+    def __init__(self, point, distance, parameter):
+        self.XYZPoint = point
+        self.Distance = distance
+        self.Parameter = parameter
+
+
+class Curve(object):
+    pass
+
+
+class Line(Curve):
+    """Bound line, its raw parameter runs from 0 to the length"""
+    def __init__(self, start, end):
+        self._start = start
+        self._end = end
+        self.Length = start.DistanceTo(end)
+        self.IsBound = True
+
+    @staticmethod
+    def CreateBound(start, end):
+        return Line(start, end)
+
+    @property
+    def Direction(self):
+        return (self._end - self._start).Normalize()
+
+    def GetEndPoint(self, index):
+        return self._start if index == 0 else self._end
+
+    def GetEndParameter(self, index):
+        return 0.0 if index == 0 else self.Length
+
+    def Evaluate(self, parameter, normalized):
+        if normalized:
+            parameter *= self.Length
+        return self._start + self.Direction * parameter
+
+    def ComputeNormalizedParameter(self, parameter):
+        return parameter / self.Length if self.Length else 0.0
+
+    def ComputeRawParameter(self, parameter):
+        return parameter * self.Length
+
+    def Project(self, point):
+        direction = self._end - self._start
+        length_squared = direction.DotProduct(direction)
+        if not length_squared:
+            return IntersectionResult(
+                self._start, point.DistanceTo(self._start), 0.0)
+        share = max(0.0, min(1.0, (point - self._start).DotProduct(
+            direction) / length_squared))
+        closest = self._start + direction * share
+        return IntersectionResult(
+            closest, point.DistanceTo(closest), share * self.Length)
+
+    def Distance(self, point):
+        return self.Project(point).Distance
+
+    def CreateReversed(self):
+        return Line(self._end, self._start)
+
+
+class CurveLoop(list):
+    @staticmethod
+    def Create(curves):
+        return CurveLoop(curves)
+
+    def GetExactLength(self):
+        return sum(curve.Length for curve in self)
+
+    def IsOpen(self):
+        return not self or not self[0].GetEndPoint(0).IsAlmostEqualTo(
+            self[-1].GetEndPoint(1))
+
+
+class Transform(object):
+    def __init__(self, origin=None, basis_x=None, basis_y=None):
+        self.Origin = origin or XYZ()
+        self.BasisX = basis_x or XYZ.BasisX
+        self.BasisY = basis_y or XYZ.BasisY
+        self.BasisZ = XYZ.BasisZ
+
+    Identity = None
+
+    def OfPoint(self, point):
+        return self.Origin + self.BasisX * point.X + \
+            self.BasisY * point.Y + self.BasisZ * point.Z
+
+
+Transform.Identity = Transform()
+
+
+class BoundingBoxXYZ(object):
+    def __init__(self, minimum=None, maximum=None):
+        self.Min = minimum or XYZ()
+        self.Max = maximum or XYZ()
+        self.Enabled = True
+        self.Transform = Transform.Identity
+
+
+class Outline(object):
+    def __init__(self, minimum, maximum):
+        self.MinimumPoint = minimum
+        self.MaximumPoint = maximum
+
+    @property
+    def IsEmpty(self):
+        return self.MinimumPoint.X > self.MaximumPoint.X or \
+            self.MinimumPoint.Y > self.MaximumPoint.Y or \
+            self.MinimumPoint.Z > self.MaximumPoint.Z
+
+    def Intersects(self, other, tolerance):
+        low, high = self.MinimumPoint, self.MaximumPoint
+        other_low, other_high = other.MinimumPoint, other.MaximumPoint
+        return low.X <= other_high.X + tolerance and \
+            other_low.X <= high.X + tolerance and \
+            low.Y <= other_high.Y + tolerance and \
+            other_low.Y <= high.Y + tolerance and \
+            low.Z <= other_high.Z + tolerance and \
+            other_low.Z <= high.Z + tolerance
+
+    def Contains(self, point, tolerance):
+        low, high = self.MinimumPoint, self.MaximumPoint
+        return low.X - tolerance <= point.X <= high.X + tolerance and \
+            low.Y - tolerance <= point.Y <= high.Y + tolerance and \
+            low.Z - tolerance <= point.Z <= high.Z + tolerance
+
+    def AddPoint(self, point):
+        self.MinimumPoint = XYZ(min(self.MinimumPoint.X, point.X),
+                                min(self.MinimumPoint.Y, point.Y),
+                                min(self.MinimumPoint.Z, point.Z))
+        self.MaximumPoint = XYZ(max(self.MaximumPoint.X, point.X),
+                                max(self.MaximumPoint.Y, point.Y),
+                                max(self.MaximumPoint.Z, point.Z))
+
+
+class Location(object):
+    pass
+
+
+class LocationPoint(Location):
+    def __init__(self, point, rotation=0.0):
+        self.Point = point
+        self.Rotation = rotation
+
+
+class LocationCurve(Location):
+    def __init__(self, curve):
+        self.Curve = curve
+
+
+class GeometryObject(object):
+    pass
+
+
+class Face(GeometryObject):
+    def __init__(self, host_id):
+        self._host_id = host_id
+
+
+class Solid(GeometryObject):
+    def __init__(self, faces=(), volume=0.0):
+        self.Faces = list(faces)
+        self.Volume = volume
+
+
+class GeometryInstance(GeometryObject):
+    def GetInstanceGeometry(self):
+        return []
+
+
+class GeometryElement(list, GeometryObject):
+    pass
+
+
+class Options(object):
+    def __init__(self):
+        self.ComputeReferences = False
+        self.IncludeNonVisibleObjects = False
+        self.DetailLevel = None
+        self.View = None
\ No newline at end of file
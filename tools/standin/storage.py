@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Autodesk.Revit.DB.ExtensibleStorage of the stand-in"""
+from standin.db import Element
+from standin.enums import enum
+
+AccessLevel = enum('AccessLevel', ['Public', 'Vendor', 'Application'])
+
+
+class Field(object):
+    def __init__(self, name, value_type):
+        self.FieldName = name
+        self.ValueType = value_type
+
+
+class Schema(object):
+    """Schemas live in the session like in Revit, not in a document"""
+    _schemas = {}
+
+    def __init__(self, guid, name, fields):
+        self.GUID = guid
+        self.SchemaName = name
+        self._fields = dict((field.FieldName, field) for field in fields)
+
+    @staticmethod
+    def Lookup(guid):
+        return Schema._schemas.get(guid)
+
+    def GetField(self, name):
+        return self._fields.get(name)
+
+    def ListFields(self):
+        return list(self._fields.values())
+
+
+class SchemaBuilder(object):
+    def __init__(self, guid):
+        self._guid = guid
+        self._name = None
+        self._fields = []
+
+    def SetSchemaName(self, name):
+        self._name = name
+
+    def SetDocumentation(self, text):
+        pass
+
+    def SetReadAccessLevel(self, access_level):
+        pass
+
+    def SetWriteAccessLevel(self, access_level):
+        pass
+
+    def SetVendorId(self, vendor_id):
+        pass
+
+    def AddSimpleField(self, name, value_type):
+        field = Field(name, value_type)
+        self._fields.append(field)
+        return field
+
+    def Finish(self):
+        schema = Schema(self._guid, self._name, self._fields)
+        Schema._schemas[self._guid] = schema
+        return schema
+
+
+class _Accessor(object):
+    """entity.Get[T](field) and entity.Set[T](field, value)"""
+    def __init__(self, function):
+        self._function = function
+
+    def __getitem__(self, value_type):
+        return self._function
+
+
+class Entity(object):
+    def __init__(self, schema=None, values=None):
+        self.Schema = schema
+        self._values = dict(values or {})
+
+    def IsValid(self):
+        return self.Schema is not None
+
+    def _field_name(self, field):
+        return field if isinstance(field, str) else field.FieldName
+
+    @property
+    def Get(self):
+        return _Accessor(lambda field: self._values.get(
+            self._field_name(field)))
+
+    @property
+    def Set(self):
+        def set_value(field, value):
+            self._values[self._field_name(field)] = value
+        return _Accessor(set_value)
+
+    def copy(self):
+        return Entity(self.Schema, self._values)
+
+
+class DataStorage(Element):
+    @staticmethod
+    def Create(doc):
+        doc._check_modifiable()
+        storage = DataStorage(doc)
+        doc._record(doc._remove, storage)
+        return storage
\ No newline at end of file
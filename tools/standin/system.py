@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Stand-ins for clr, System and System.Collections.Generic"""
+import types
+import uuid
+
+
+# working with clr
+
+def AddReference(name):
+    pass
+
+
+def ImportExtensions(namespace):
+    pass
+
+
+def make_clr_module():
+    module = types.ModuleType('clr')
+    module.AddReference = AddReference
+    module.ImportExtensions = ImportExtensions
+    return module
+
+
+# working with System
+
+class Guid(object):
+    def __init__(self, value=None):
+        self._value = uuid.UUID(str(value)) if value else uuid.uuid4()
+
+    @staticmethod
+    def NewGuid():
+        return Guid()
+
+    def ToString(self):
+        return str(self._value)
+
+    def __str__(self):
+        return str(self._value)
+
+    def __eq__(self, other):
+        return isinstance(other, Guid) and self._value == other._value
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._value)
+
+
+String = str
+Int32 = int
+Double = float
+Boolean = bool
+
+
+# IronPython catches every exception as System.Exception
+Exception = Exception
+
+
+class ArgumentException(Exception):
+    pass
+
+
+class InvalidOperationException(Exception):
+    pass
+
+
+class EventHandler(object):
+    """EventHandler[T](function), the type argument is ignored"""
+    def __class_getitem__(cls, event_type):
+        return cls
+
+    def __init__(self, function):
+        self.function = function
+
+    def __call__(self, sender, args):
+        return self.function(sender, args)
+
+
+class Event(object):
+    """.NET event, handlers are added with += and removed with -="""
+    def __init__(self):
+        self.handlers = []
+
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+
+    def __isub__(self, handler):
+        if handler in self.handlers:
+            self.handlers.remove(handler)
+        return self
+
+    def raise_event(self, sender, args):
+        for handler in list(self.handlers):
+            handler(sender, args)
+
+
+# working with System.Collections.Generic
+
+class _List(list):
+    item_type = object
+
+    def Add(self, item):
+        self.append(item)
+
+    def AddRange(self, items):
+        self.extend(items)
+
+    def Contains(self, item):
+        return item in self
+
+    def Remove(self, item):
+        if item in self:
+            self.remove(item)
+            return True
+        return False
+
+    def Clear(self):
+        del self[:]
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+class _GenericList(object):
+    """List[T] returns one list class per item type"""
+    def __init__(self):
+        self._types = {}
+
+    def __getitem__(self, item_type):
+        if item_type not in self._types:
+            self._types[item_type] = type(
+                'List[{}]'.format(getattr(item_type, '__name__', item_type)),
+                (_List,), {'item_type': item_type})
+        return self._types[item_type]
+
+    def __call__(self, items=()):
+        return _List(items)
+
+
+List = _GenericList()
+
+
+class Color(object):
+    def __init__(self, red=0, green=0, blue=0):
+        self.R = red
+        self.G = green
+        self.B = blue
+
+    @staticmethod
+    def FromArgb(*values):
+        return Color(*values[-3:])
+
+
+class ColorTranslator(object):
+    @staticmethod
+    def FromHtml(text):
+        text = text.lstrip('#')
+        return Color(int(text[0:2], 16), int(text[2:4], 16),
+                     int(text[4:6], 16))
+
+
+def make_system_modules():
+    """Get System, System.Collections.Generic and System.Drawing"""
+    system = types.ModuleType('System')
+    for name in ('Guid', 'String', 'Int32', 'Double', 'Boolean', 'Exception',
+                 'ArgumentException', 'InvalidOperationException',
+                 'EventHandler'):
+        setattr(system, name, globals()[name])
+    collections = types.ModuleType('System.Collections')
+    generic = types.ModuleType('System.Collections.Generic')
+    generic.List = List
+    drawing = types.ModuleType('System.Drawing')
+    drawing.Color = Color
+    drawing.ColorTranslator = ColorTranslator
+    return {
+        'System': system,
+        'System.Collections': collections,
+        'System.Collections.Generic': generic,
+        'System.Drawing': drawing,
+    }
\ No newline at end of file
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Autodesk.Revit.UI of the stand-in: the application the scripts get"""
+import types
+
+from standin.db import ElementId, _key
+from standin.enums import enum
+from standin.system import Event, Guid, List
+
+ObjectType = enum('ObjectType', [
+    'Nothing', 'Element', 'PointOnElement', 'Edge', 'Face', 'LinkedElement',
+    'Subelement'])
+TaskDialogResult = enum('TaskDialogResult', [
+    'None', 'Ok', 'Cancel', 'Retry', 'Yes', 'No', 'Close'])
+
+
+class ISelectionFilter(object):
+    def AllowElement(self, element):
+        return True
+
+    def AllowReference(self, reference, point):
+        return True
+
+
+class Selection(object):
+    def __init__(self, doc):
+        self._doc = doc
+        self._ids = []
+
+    def GetElementIds(self):
+        return List[ElementId](ElementId(key) for key in self._ids
+                               if self._doc.GetElement(key) is not None)
+
+    def SetElementIds(self, element_ids):
+        self._ids = [_key(element_id) for element_id in element_ids]
+
+
+class IdlingEventArgs(object):
+    def __init__(self):
+        self.raise_without_delay = False
+
+    def SetRaiseWithoutDelay(self):
+        self.raise_without_delay = True
+
+
+class UIDocument(object):
+    def __init__(self, doc):
+        self.Document = doc
+        self.Selection = Selection(doc)
+
+    @property
+    def ActiveView(self):
+        return self.Document.ActiveView
+
+    def RefreshActiveView(self):
+        pass
+
+
+class AddInId(object):
+    def __init__(self, guid):
+        self.GUID = guid
+
+    def GetGUID(self):
+        return self.GUID
+
+
+class UIApplication(object):
+    """
+    __revit__ of the scripts. The Idling event is raised by idle(),
+    which stands for Revit having nothing else to do.
+    """
+    def __init__(self, doc, addin_id=None):
+        self.ActiveUIDocument = UIDocument(doc)
+        self.Application = doc.Application
+        self.ActiveAddInId = addin_id or AddInId(Guid())
+        self.Idling = Event()
+
+    def idle(self, max_events=None):
+        """
+        Raise the Idling event until no handler asks to be raised again
+        without delay. Returns the number of events raised.
+        """
+        raised = 0
+        while self.Idling.handlers and \
+                (max_events is None or raised < max_events):
+            args = IdlingEventArgs()
+            self.Idling.raise_event(self, args)
+            raised += 1
+            if not args.raise_without_delay:
+                break
+        return raised
+
+
+class TaskDialog(object):
+    messages = []
+
+    @staticmethod
+    def Show(title, message, *args):
+        TaskDialog.messages.append((title, message))
+        print('{}: {}'.format(title, message))
+        return TaskDialogResult.Ok
+
+
+def make_ui_modules():
+    """Get Autodesk.Revit.UI with its Selection and Events namespaces"""
+    ui = types.ModuleType('Autodesk.Revit.UI')
+    for name in ('UIApplication', 'UIDocument', 'TaskDialog',
+                 'TaskDialogResult'):
+        setattr(ui, name, globals()[name])
+    selection = types.ModuleType('Autodesk.Revit.UI.Selection')
+    selection.ISelectionFilter = ISelectionFilter
+    selection.ObjectType = ObjectType
+    selection.Selection = Selection
+    events = types.ModuleType('Autodesk.Revit.UI.Events')
+    events.IdlingEventArgs = IdlingEventArgs
+    return {
+        'Autodesk.Revit.UI': ui,
+        'Autodesk.Revit.UI.Selection': selection,
+        'Autodesk.Revit.UI.Events': events,
+    }
\ No newline at end of file